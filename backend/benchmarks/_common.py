@@ -0,0 +1,47 @@
+"""Helpers shared by the benchmark scripts."""
+import contextlib
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def point_services_at(stub_url):
+    """
+    Configure the services to talk to a local stub and make the backend importable.
+
+    Must be called before importing anything from `services` or `main`.
+    """
+    os.environ["MODEL_ENDPOINT"] = stub_url
+    os.environ["SARVAM_TTS_URL"] = f"{stub_url}/text-to-speech"
+    os.environ.setdefault("GITHUB_TOKEN", "stub-token")
+    os.environ.setdefault("api-subscription-key", "stub-key")
+    for path in (BACKEND_DIR, os.path.join(BACKEND_DIR, "fastapi")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+@contextlib.contextmanager
+def serve_app(app):
+    """
+    Run an ASGI app under uvicorn in a background thread and yield its base URL.
+
+    Needed where responses must really stream; httpx's ASGITransport buffers them.
+    """
+    import socket
+    import threading
+    import time
+
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
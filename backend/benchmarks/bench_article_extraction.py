@@ -0,0 +1,52 @@
+"""
+Benchmark article extraction over the saved pages in benchmarks/fixtures:
+parse time per engine against the old <p>-tag scraper, and the tokens each
+approach would pass on to the summarizer.
+
+Usage: python benchmarks/bench_article_extraction.py [--iterations 50]
+"""
+import argparse
+import glob
+import os
+import time
+
+from _common import point_services_at
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def legacy_extract(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    return "\n".join([p.get_text() for p in soup.find_all('p')])
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - start) / iterations * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    point_services_at("http://127.0.0.1:9")
+    from services.article_scraper import available_engines, decode_html, extract_article
+    from services.map_reduce import count_tokens
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        raw = open(path, "rb").read()
+        html = decode_html(raw)
+        print(f"{os.path.basename(path)} ({len(raw)} bytes)")
+        ms, text = timed(lambda: legacy_extract(html), args.iterations)
+        legacy_tokens = count_tokens(text)
+        print(f"  {'legacy <p> scrape':<20} {ms:7.2f} ms  {legacy_tokens:>6} tokens")
+        for engine in available_engines():
+            ms, article = timed(lambda: extract_article(raw, engine=engine), args.iterations)
+            tokens = count_tokens(article.as_text())
+            print(f"  {engine:<20} {ms:7.2f} ms  {tokens:>6} tokens "
+                  f"({100 * (1 - tokens / max(legacy_tokens, 1)):.0f}% fewer)  title={article.title!r}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark: per-call client construction (the old pattern) versus the
+shared client registry, for sequential requests to the same host.
+
+Against the local stub this shows client construction and TCP connect cost;
+pass --url with an HTTPS endpoint to include the TLS handshake as well.
+
+Usage: python benchmarks/bench_client_reuse.py [--requests 50] [--url https://example.com/]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import point_services_at
+from stubs import StubServer
+
+async def run(url, count):
+    import httpx
+    from services.clients import get_clients
+
+    start = time.perf_counter()
+    for _ in range(count):
+        async with httpx.AsyncClient() as client:
+            (await client.get(url)).raise_for_status()
+    fresh = (time.perf_counter() - start) / count
+
+    client = get_clients().http
+    (await client.get(url)).raise_for_status()  # Warm the pool
+    start = time.perf_counter()
+    for _ in range(count):
+        (await client.get(url)).raise_for_status()
+    shared = (time.perf_counter() - start) / count
+
+    print(f"per-call client: {fresh * 1000:7.2f} ms/request")
+    print(f"shared client:   {shared * 1000:7.2f} ms/request ({fresh / shared:.1f}x faster)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--url", help="endpoint to fetch; defaults to a local stub")
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=0, tts_latency=0) as stub:
+        point_services_at(stub.url)
+        url = args.url or f"{stub.url}/health"
+        stub.extra_routes = {"/health": {"ok": True}}
+        asyncio.run(run(url, args.requests))
+
+if __name__ == "__main__":
+    main()
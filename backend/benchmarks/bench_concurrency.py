@@ -0,0 +1,50 @@
+"""
+Fire concurrent /summarize requests at the app, backed by stub upstreams,
+and compare the wall-clock time to what a serial pipeline would take.
+
+Usage: python benchmarks/bench_concurrency.py [--requests 20] [--llm-latency 0.5] [--tts-latency 0.3]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import point_services_at
+from stubs import StubServer
+
+async def run(args, stub):
+    import httpx
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=120) as client:
+        async def one(i):
+            start = time.perf_counter()
+            response = await client.post("/summarize", json={"text": f"Document number {i}. " * 50, "language": "en"})
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(i) for i in range(args.requests)))
+        wall = time.perf_counter() - start
+
+    per_request = args.llm_latency + stub.calls["tts"] / max(stub.calls["llm"], 1) * args.tts_latency
+    print(f"requests:            {args.requests}")
+    print(f"upstream calls:      llm={stub.calls['llm']} tts={stub.calls['tts']}")
+    print(f"slowest request:     {max(latencies):.2f}s")
+    print(f"wall clock:          {wall:.2f}s")
+    print(f"serial estimate:     {per_request * args.requests:.2f}s")
+    print(f"overlap factor:      {per_request * args.requests / wall:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=args.llm_latency, tts_latency=args.tts_latency) as stub:
+        point_services_at(stub.url)
+        asyncio.run(run(args, stub))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the data URL sent to the vision model for raw images versus
+preprocessed ones (EXIF-rotated, downscaled to the model's effective
+resolution and re-encoded), and the time taken to build it, cold and cached.
+
+Inputs are the sample photo in backend/assets/, a synthetic 12 MP phone photo
+with an EXIF rotation, and a synthetic PNG screenshot.
+
+Usage: python benchmarks/bench_image_preprocess.py [--repeat 5]
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFilter
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services import summarizer
+
+def phone_photo(sample):
+    """A 4000x3000 photo stored sideways with EXIF orientation 6, like most phone cameras write."""
+    image = sample.resize((3000, 4000), Image.Resampling.BICUBIC).rotate(90, expand=True)
+    noise = Image.effect_noise(image.size, 24).convert("RGB")
+    image = Image.blend(image, noise, 0.15)
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=92, exif=exif)
+    return buffer.getvalue()
+
+def screenshot():
+    """A 2560x1600 PNG with lines of text."""
+    image = Image.new("RGB", (2560, 1600), "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(60):
+        draw.text((40, 20 + line * 26), f"Line {line}: the quick brown fox jumps over the lazy dog " * 3, fill="black")
+    image = image.filter(ImageFilter.SMOOTH)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sample_bytes = (BACKEND_DIR / "assets" / "IMG-20250404-WA0008.jpg").read_bytes()
+    sample = Image.open(io.BytesIO(sample_bytes))
+    inputs = [
+        ("sample photo", sample_bytes, "jpeg"),
+        ("12 MP photo", phone_photo(sample), "jpeg"),
+        ("screenshot", screenshot(), "png"),
+    ]
+
+    print(f"{'input':<14} {'size':>11} {'raw URL':>10} {'prep URL':>10} {'saved':>6} "
+          f"{'raw ms':>7} {'cold ms':>8} {'cached ms':>9}  resolution")
+    for name, data, image_format in inputs:
+        raw_url, raw_ms = timed(lambda: summarizer.image_bytes_to_data_url(data, image_format), args.repeat)
+        # Cold: preprocessing only, without the cache
+        (prepared, prepared_format), cold_ms = timed(lambda: summarizer.preprocess_image(data, image_format), args.repeat)
+        summarizer.prepare_image_data_url(data, image_format)
+        prepared_url, cached_ms = timed(lambda: summarizer.prepare_image_data_url(data, image_format), args.repeat)
+        before = Image.open(io.BytesIO(data)).size
+        after = Image.open(io.BytesIO(prepared)).size
+        print(f"{name:<14} {f'{before[0]}x{before[1]}':>11} {len(raw_url) / 1024:>8.0f}KB {len(prepared_url) / 1024:>8.0f}KB "
+              f"{1 - len(prepared_url) / len(raw_url):>6.0%} {raw_ms:>7.1f} {cold_ms:>8.1f} {cached_ms:>9.3f}  "
+              f"{after[0]}x{after[1]} {prepared_format}")
+
+if __name__ == "__main__":
+    main()
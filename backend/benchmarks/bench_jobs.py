@@ -0,0 +1,158 @@
+"""
+Check the background job queue against the stub upstreams, with the API in
+its own process so it can be killed and restarted.
+
+Checks:
+  accept    submitting a job answers at once, while /upload_and_summarize
+            holds the request for the whole pipeline (times for the PDF in assets/)
+  retry     with TTS failing, a job fails at the audio stage with its text and
+            summary checkpointed; retried once TTS is back, it finishes
+            without another model call
+  restart   the server is killed (SIGKILL) while a URL job is in TTS; after a
+            restart the job is taken over once its lease expires and finishes
+            without fetching the page or calling the model again
+  events    /jobs/{id}/events streams status changes and ends with `done`
+
+Usage: python benchmarks/bench_jobs.py [--jobs 8]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from load_test import HTML_FILE, PDF_FILE, start_server
+from stubs import StubServer
+
+failures = []
+
+def check(condition, message):
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+def wait_for(client, job_id, statuses=("done", "failed"), timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(f"Job {job_id} did not reach {statuses} within {timeout}s")
+
+def accept(base_url, jobs):
+    pdf = PDF_FILE.read_bytes()
+    with httpx.Client(base_url=base_url, timeout=120) as client:
+        start = time.perf_counter()
+        response = client.post("/upload_and_summarize", files={"file": ("doc.pdf", pdf)}, data={"use_cache": "false"})
+        sync = time.perf_counter() - start
+        check(response.status_code == 200, f"synchronous upload held the request for {sync * 1000:.0f}ms")
+
+        submits, job_ids = [], []
+        for i in range(jobs):
+            start = time.perf_counter()
+            # Bytes after %%EOF are ignored by PDF readers but make each upload distinct
+            response = client.post("/jobs/upload", files={"file": ("doc.pdf", pdf + b"\n%" + str(i).encode())},
+                                   data={"use_cache": "false"})
+            submits.append(time.perf_counter() - start)
+            job_ids.append(response.json()["job_id"])
+        start = time.perf_counter()
+        done = [wait_for(client, job_id) for job_id in job_ids]
+        check(all(job["status"] == "done" and job["audio_url"] for job in done),
+              f"{jobs} upload jobs accepted in {max(submits) * 1000:.0f}ms at most, "
+              f"all done {time.perf_counter() - start:.2f}s later")
+
+def retry(base_url, stub):
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        stub.tts_error_rate = 1.0
+        stub.calls["llm"] = 0
+        job_id = client.post("/jobs", json={"text": "Retry test. " * 40, "language": "en", "use_cache": False}).json()["job_id"]
+        job = wait_for(client, job_id)
+        check(job["status"] == "failed" and job["stage"] == "audio" and job["checkpoints"] == ["extract", "summary"],
+              f"failed at the {job['stage']} stage after {job['attempts']} attempts, checkpoints {job['checkpoints']}")
+        stub.tts_error_rate = 0.0
+        check(client.post(f"/jobs/{job_id}/retry").status_code == 200, "retry accepted")
+        job = wait_for(client, job_id)
+        check(job["status"] == "done" and stub.calls["llm"] == 1,
+              f"{job['status']} after the retry, {stub.calls['llm']} model call in all")
+        check(client.post(f"/jobs/{job_id}/retry").status_code == 409, "a finished job cannot be retried")
+
+def restart(stub_url, stub, env):
+    stub.calls["llm"] = stub.calls["get"] = 0
+    stub.tts_latency = 3.0
+    process, base_url = start_server(stub_url, env)
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            body = {"url": f"{stub_url}/articles/jobs", "language": "en", "use_cache": False}
+            job_id = client.post("/jobs", json=body).json()["job_id"]
+            job = wait_for(client, job_id, statuses=("running",))
+            while job["stage"] != "audio":
+                time.sleep(0.05)
+                job = client.get(f"/jobs/{job_id}").json()
+    finally:
+        process.kill()
+        process.wait(timeout=60)
+    stub.tts_latency = 0.05
+    start = time.perf_counter()
+    process, base_url = start_server(stub_url, env)
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            job = wait_for(client, job_id)
+            check(job["status"] == "done" and stub.calls["get"] == 1 and stub.calls["llm"] == 1,
+                  f"{job['status']} {time.perf_counter() - start:.1f}s after the restart; "
+                  f"page fetched {stub.calls['get']}x, model called {stub.calls['llm']}x")
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+def events(base_url):
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        job_id = client.post("/jobs", json={"text": "Events test. " * 40, "language": "en", "use_cache": False}).json()["job_id"]
+        names = []
+        with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            for line in stream.iter_lines():
+                if line.startswith("event: "):
+                    names.append(line[len("event: "):])
+                elif line.startswith("data: ") and names[-1] == "done":
+                    done = json.loads(line[len("data: "):])
+        check(names[-1] == "done" and names.count("status") >= 1 and done.get("audio_url"),
+              f"events: {' '.join(names)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=8)
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=0.3, tts_latency=0.05) as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.extra_routes = {"/articles/jobs": ("text/html; charset=utf-8", HTML_FILE.read_bytes())}
+        env = {
+            "JOB_DB_PATH": os.path.join(tmp, "jobs.sqlite3"),
+            "JOB_WORKERS": "4",
+            "JOB_MAX_ATTEMPTS": "2",
+            "JOB_RETRY_BACKOFF": "0.1",
+            "JOB_LEASE": "2",
+            "JOB_POLL_INTERVAL": "0.2",
+            "TTS_MAX_RETRIES": "1",
+            "TTS_RETRY_BACKOFF": "0.05",
+            "STARTUP_WARMUP": "off",
+        }
+        process, base_url = start_server(stub.url, env)
+        try:
+            print("accept")
+            accept(base_url, args.jobs)
+            print("retry")
+            retry(base_url, stub)
+            print("events")
+            events(base_url)
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+        print("restart")
+        restart(stub.url, stub, env)
+
+    raise SystemExit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
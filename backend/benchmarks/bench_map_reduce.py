@@ -0,0 +1,54 @@
+"""
+Tune map-reduce chunk size against latency: condense a long synthetic document
+with several chunk sizes against a stub model and report per-chunk stats.
+
+Usage: python benchmarks/bench_map_reduce.py [--pages 300] [--llm-latency 0.5] [--concurrency 4]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import point_services_at
+from stubs import StubServer
+
+PARAGRAPH = (
+    "The committee reviewed the quarterly figures and noted that revenue grew in every region. "
+    "Costs rose more slowly than expected, mostly because of lower logistics spending. "
+    "Several members asked for a breakdown of the new hiring plan before the next meeting."
+)
+
+async def run(args):
+    from services import map_reduce, summarizer
+    from services.clients import get_clients
+
+    # Roughly 3000 characters per page of a dense PDF
+    text = "\n\n".join([PARAGRAPH] * (args.pages * 12))
+    print(f"document: {len(text)} chars, ~{map_reduce.count_tokens(text)} tokens")
+
+    client = get_clients().openai
+    for chunk_tokens in (1000, 2000, 4000):
+        start = time.perf_counter()
+        condensed, stats = await map_reduce.condense_async(
+            client, summarizer.MODEL_NAME, text,
+            chunk_tokens=chunk_tokens,
+            max_concurrency=args.concurrency,
+            limiter=map_reduce.CallRateLimiter(calls_per_minute=0),
+        )
+        elapsed = time.perf_counter() - start
+        slowest = max(s["seconds"] for s in stats)
+        print(f"chunk_tokens={chunk_tokens:<5} calls={len(stats):<4} wall={elapsed:6.2f}s "
+              f"slowest_call={slowest:.2f}s condensed_tokens={map_reduce.count_tokens(condensed)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=args.llm_latency) as stub:
+        point_services_at(stub.url)
+        asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Measure the per-call cost of the stage() timer, with and without a request
+timing list active, to confirm instrumentation is cheap enough to leave on.
+
+Usage: python benchmarks/bench_metrics_overhead.py [--iterations 200000]
+"""
+import argparse
+import time
+
+from _common import point_services_at
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    point_services_at("http://127.0.0.1:9")
+    from services.metrics import stage, start_request_timings
+
+    def loop(instrumented):
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            if instrumented:
+                with stage("bench"):
+                    pass
+        return time.perf_counter() - start
+
+    baseline = loop(False)
+    outside = loop(True)
+    start_request_timings()
+    inside = loop(True)
+    for label, elapsed in (("outside a request", outside), ("inside a request", inside)):
+        print(f"stage() {label:<18} {(elapsed - baseline) / args.iterations * 1e6:.2f} us/call")
+
+if __name__ == "__main__":
+    main()
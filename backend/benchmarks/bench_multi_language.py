@@ -0,0 +1,74 @@
+"""
+Compare summarizing one document in several languages with one /summarize
+call per language against a single call with "languages", which reads and
+condenses the source once and translates the summary for the rest.
+
+Reports wall time, model calls and the characters sent to the model, for a
+short document and for a long one that needs map-reduce.
+
+Usage: python benchmarks/bench_multi_language.py [--languages te,hi,en] [--pages 40] [--llm-latency 0.5]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from _common import point_services_at
+from stubs import StubServer
+
+PARAGRAPH = (
+    "The committee reviewed the quarterly figures and noted that revenue grew in every region. "
+    "Costs rose more slowly than expected, mostly because of lower logistics spending. "
+    "Several members asked for a breakdown of the new hiring plan before the next meeting."
+)
+
+async def separate(client, text, languages):
+    responses = await asyncio.gather(*(
+        client.post("/summarize", json={"text": text, "language": language, "use_cache": False})
+        for language in languages
+    ))
+    return {language: response.json() for language, response in zip(languages, responses)}
+
+async def fan_out(client, text, languages):
+    response = await client.post("/summarize", json={"text": text, "languages": languages, "use_cache": False})
+    return response.json()["results"]
+
+async def run(app, text, languages, stub):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=300) as client:
+        for name, func in (("separate", separate), ("languages", fan_out)):
+            for key in stub.calls:
+                stub.calls[key] = 0
+            start = time.perf_counter()
+            results = await func(client, text, languages)
+            elapsed = time.perf_counter() - start
+            complete = all(results[language].get("audio_url") for language in languages)
+            print(f"  {name:<10} wall={elapsed:5.2f}s llm calls={stub.calls['llm']:<3} "
+                  f"model input={stub.calls['llm_input_chars'] / 1000:7.1f}K chars tts calls={stub.calls['tts']:<3} "
+                  f"all languages={'yes' if complete else 'NO'}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--languages", default="te,hi,en")
+    parser.add_argument("--pages", type=int, default=40, help="length of the long document, ~3000 chars per page")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+    languages = args.languages.split(",")
+
+    with StubServer(llm_latency=args.llm_latency, tts_latency=0.2) as stub:
+        point_services_at(stub.url)
+        os.environ.setdefault("MAP_REDUCE_MAX_CALLS_PER_MINUTE", "0")
+        import main
+
+        documents = [
+            ("short", "\n\n".join([PARAGRAPH] * 10)),
+            ("long", "\n\n".join([PARAGRAPH] * (args.pages * 12))),
+        ]
+        for name, text in documents:
+            print(f"{name} document ({len(text)} chars), languages {', '.join(languages)}")
+            asyncio.run(run(main.app, text, languages, stub))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark PDF text extraction on synthetic multi-hundred-page documents:
+the old quadratic loop versus the streaming extractor, serial and
+page-parallel, with and without a character budget. --image-kb embeds an
+incompressible image in every page, for documents the size of scans.
+
+Usage: python benchmarks/bench_pdf_extraction.py [--pages 200 600] [--image-kb 0]
+"""
+import argparse
+import os
+import time
+
+from _common import point_services_at
+
+LINE = "Quarterly revenue grew in every region while logistics costs declined steadily. "
+
+def make_pdf(pages, image_kb=0):
+    import fitz
+
+    doc = fitz.open()
+    side = int((image_kb * 1024 / 3) ** 0.5)
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 555, 800), f"Page {number + 1}\n" + LINE * 40, fontsize=9)
+        if side:
+            noise = fitz.Pixmap(fitz.csRGB, side, side, os.urandom(side * side * 3), False)
+            page.insert_image(fitz.Rect(40, 600, 240, 800), pixmap=noise)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def legacy_extract(data):
+    import fitz
+
+    text = ""
+    doc = fitz.open(stream=data, filetype="pdf")
+    for page in doc:
+        text += page.get_text()
+    return text
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    text = func(*args, **kwargs)
+    print(f"  {label:<28} {time.perf_counter() - start:7.3f}s  {len(text):>9} chars")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[200, 600])
+    parser.add_argument("--image-kb", type=int, default=0)
+    args = parser.parse_args()
+
+    point_services_at("http://127.0.0.1:9")
+    from services import pdf_extraction
+
+    try:
+        # Start the worker processes before timing anything
+        pdf_extraction.extract_text_from_pdf(make_pdf(8), parallel=True)
+        for pages in args.pages:
+            data = make_pdf(pages, args.image_kb)
+            print(f"{pages} pages, {len(data) / 1e6:.1f} MB")
+            timed("legacy += loop", legacy_extract, data)
+            timed("streaming, serial", pdf_extraction.extract_text_from_pdf, data, max_chars=None, parallel=False)
+            timed("streaming, page-parallel", pdf_extraction.extract_text_from_pdf, data, max_chars=None, parallel=True)
+            timed("serial, 100k char budget", pdf_extraction.extract_text_from_pdf, data, max_chars=100_000, parallel=False)
+            timed("first 50 pages", pdf_extraction.extract_text_from_pdf, data, page_range=(0, 50))
+    finally:
+        pdf_extraction.shutdown_pdf_workers()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Send a burst of /summarize requests at the app while the stub model endpoint
+enforces a request quota, and show how admission control handles it.
+
+Scenarios:
+  reactive  no configured quota; 429s pause every caller for the Retry-After
+  paced     LLM_REQUESTS_PER_MINUTE matches the stub's quota, so few or no 429s
+  deadline  paced, but with a short REQUEST_DEADLINE: requests that cannot be
+            served in time fail fast with 503 and a Retry-After header
+
+Usage: python benchmarks/bench_rate_limits.py [--requests 30] [--quota 5] [--window 1.0] [--deadline 2]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from _common import point_services_at
+from stubs import StubServer
+
+async def burst(app, requests):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=120) as client:
+        async def one(i):
+            start = time.perf_counter()
+            response = await client.post("/summarize", json={"text": f"Document {i} of the burst. " * 30, "language": "en"})
+            return response.status_code, time.perf_counter() - start, response.headers.get("retry-after")
+
+        return await asyncio.gather(*(one(i) for i in range(requests)))
+
+def report(name, results, stub):
+    by_status = {}
+    for status, seconds, retry_after in results:
+        by_status.setdefault(status, []).append((seconds, retry_after))
+    summary = ", ".join(f"{status}: {len(items)}" for status, items in sorted(by_status.items()))
+    print(f"{name:<9} {summary:<18} upstream 429s={stub.calls['llm_429']:<4}", end="")
+    ok = sorted(seconds for seconds, _ in by_status.get(200, []))
+    if ok:
+        print(f" ok p50={statistics.median(ok):.2f}s max={ok[-1]:.2f}s", end="")
+    shed = by_status.get(503, [])
+    if shed:
+        print(f" 503 max={max(seconds for seconds, _ in shed):.3f}s retry-after={sorted({r for _, r in shed})}", end="")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--quota", type=int, default=5, help="model calls the stub allows per window")
+    parser.add_argument("--window", type=float, default=1.0, help="quota window in seconds")
+    parser.add_argument("--deadline", type=float, default=2.0, help="REQUEST_DEADLINE for the last scenario")
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=0.1, tts_latency=0.02, llm_quota=(args.quota, args.window)) as stub:
+        point_services_at(stub.url)
+        import main
+        from services import cache, rate_limit
+
+        per_minute = int(args.quota * 60 / args.window)
+        scenarios = [("reactive", 0, 60.0), ("paced", per_minute, 60.0), ("deadline", per_minute, args.deadline)]
+        for name, requests_per_minute, deadline in scenarios:
+            rate_limit.LLM_REQUESTS_PER_MINUTE = requests_per_minute
+            rate_limit.REQUEST_DEADLINE = deadline
+            rate_limit.UPSTREAM_BURST_SECONDS = args.window / 2
+            rate_limit._limiters.clear()
+            cache.get_summary_cache().memory.clear()
+            stub.calls["llm_429"] = 0
+            time.sleep(args.window)  # Let the stub's quota window drain between scenarios
+            report(name, asyncio.run(burst(main.app, args.requests)), stub)
+
+if __name__ == "__main__":
+    main()
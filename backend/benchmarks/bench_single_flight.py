@@ -0,0 +1,130 @@
+"""
+Fire N identical /summarize requests for the same URL at once and count the
+upstream calls they cause, with and without in-flight coalescing.
+
+Checks that, with coalescing:
+  - N identical requests (and variants differing only in host case, fragment
+    or tracking parameters) fetch the page once and make exactly one LLM call
+  - a failing fetch is reported to every waiter, from a single attempt
+  - cancelling some waiters leaves the others their result, and cancelling
+    all of them cancels the shared work
+
+Usage: python benchmarks/bench_single_flight.py [--requests 50]
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from _common import point_services_at
+from stubs import StubServer
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "news_article.html"
+
+class NoCoalescing:
+    """Stand-in for SingleFlight that runs every call separately (the baseline)."""
+
+    async def do(self, key, func):
+        return await func()
+
+async def burst(app, bodies):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=120) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/summarize", json=body) for body in bodies))
+        return responses, time.perf_counter() - start
+
+def reset(stub):
+    from services import cache
+
+    cache.get_summary_cache().memory.clear()
+    for key in stub.calls:
+        stub.calls[key] = 0
+
+def check(condition, message):
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+async def cancellation():
+    """Exercise SingleFlight directly: partial and total cancellation of waiters."""
+    from services.single_flight import SingleFlight
+
+    flights = SingleFlight()
+    runs = {"started": 0, "cancelled": 0}
+
+    async def work():
+        runs["started"] += 1
+        try:
+            await asyncio.sleep(0.2)
+            return "result"
+        except asyncio.CancelledError:
+            runs["cancelled"] += 1
+            raise
+
+    waiters = [asyncio.ensure_future(flights.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    for waiter in waiters[:3]:
+        waiter.cancel()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    check(all(isinstance(r, asyncio.CancelledError) for r in results[:3]) and results[3:] == ["result", "result"],
+          "cancelled waiters stop waiting; the rest still get the result")
+    check(runs == {"started": 1, "cancelled": 0}, "the shared work ran once and was not cancelled")
+
+    waiters = [asyncio.ensure_future(flights.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+    check(runs == {"started": 2, "cancelled": 1} and flights.in_flight() == 0,
+          "cancelling every waiter cancels the shared work")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=0.5, tts_latency=0.1) as stub:
+        point_services_at(stub.url)
+        stub.get_latency = 0.1
+        stub.extra_routes = {"/news/viral-story": ("text/html; charset=utf-8", FIXTURE.read_bytes())}
+        import main
+
+        url = f"{stub.url}/news/viral-story"
+        host, port = stub.url.split("//")[1].split(":")
+        variants = [url, f"{url}?utm_source=chat", f"http://{host.upper()}:{port}/news/viral-story#top"]
+        identical = [{"url": url, "language": "en"}] * args.requests
+        mixed = [{"url": variants[i % len(variants)], "language": "en"} for i in range(args.requests)]
+
+        flights = main.summary_flights
+        for name, coalescing in (("baseline", NoCoalescing()), ("coalesced", flights)):
+            main.summary_flights = coalescing
+            reset(stub)
+            responses, seconds = asyncio.run(burst(main.app, identical))
+            statuses = {r.status_code for r in responses}
+            print(f"{name:<10} {args.requests} identical requests in {seconds:.2f}s, statuses {sorted(statuses)}: "
+                  f"page fetches={stub.calls['get']} llm calls={stub.calls['llm']} tts calls={stub.calls['tts']}")
+        main.summary_flights = flights
+
+        print("checks")
+        check(stub.calls["llm"] == 1 and stub.calls["get"] == 1, f"{args.requests} identical requests -> one fetch, one LLM call")
+        check(len({r.json()["audio_url"] for r in responses}) == 1, "every caller gets the same summary audio")
+
+        reset(stub)
+        responses, _ = asyncio.run(burst(main.app, mixed))
+        check(stub.calls["llm"] == 1 and stub.calls["get"] == 1,
+              "URL variants (tracking params, host case, fragment) share the computation")
+
+        reset(stub)
+        missing = [{"url": f"{stub.url}/news/missing", "language": "en"}] * args.requests
+        responses, _ = asyncio.run(burst(main.app, missing))
+        bodies = {r.text for r in responses}
+        check(len(bodies) == 1 and stub.calls["llm"] == 0, f"a failing fetch reaches all {args.requests} waiters: {bodies.pop()[:80]}")
+
+        asyncio.run(cancellation())
+
+if __name__ == "__main__":
+    main()
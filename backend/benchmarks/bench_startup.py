@@ -0,0 +1,143 @@
+"""
+Measure how long the API takes to start, and check it has not regressed.
+
+  import   `python -X importtime -c "import main"`, repeated: total import time
+           of main, the slowest direct imports (cumulative) and the slowest
+           single modules (self time)
+  serve    the server started with each STARTUP_WARMUP mode against the stub
+           upstreams: seconds until it answers, then the latency of the first
+           text and URL requests
+
+Checks (exit status 1 if one fails):
+  - no module listed in --forbid is imported by `import main`; these are the
+    heavy libraries the services load on first use
+  - the median import time of main is under --max-import-ms
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 12] [--max-import-ms 800]
+                                          [--forbid openai,fitz,...] [--skip-serve]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from _common import BACKEND_DIR
+from load_test import HTML_FILE, PARAGRAPH, start_server
+from stubs import StubServer
+
+# Libraries that must stay out of `import main`
+HEAVY_MODULES = "openai,fitz,bs4,lxml,selectolax,pytesseract,PIL,requests,tiktoken,uvicorn"
+
+def import_times():
+    """
+    Import main once under -X importtime.
+
+    :return: List of (depth, self ms, cumulative ms, module) in the order Python reports them.
+    """
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=os.path.join(BACKEND_DIR, "fastapi"), env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, int(self_us) / 1000, int(cumulative_us) / 1000, name.strip()))
+    return rows
+
+def under_main(rows):
+    """The rows imported (directly or not) by main: those reported before it at a deeper level."""
+    end = next(i for i, row in enumerate(rows) if row[3] == "main" and row[0] == 0)
+    start = end
+    while start > 0 and rows[start - 1][0] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+def report_imports(runs, top):
+    totals = []
+    cumulative = {}
+    self_times = {}
+    loaded = set()
+    for _ in range(runs):
+        rows = under_main(import_times())
+        totals.append(rows[-1][2])
+        for depth, self_ms, cumulative_ms, name in rows:
+            loaded.add(name)
+            self_times.setdefault(name, []).append(self_ms)
+            if depth == 1:
+                cumulative.setdefault(name, []).append(cumulative_ms)
+    total = statistics.median(totals)
+    print(f"import main: median {total:.0f}ms over {runs} runs (min {min(totals):.0f}ms, max {max(totals):.0f}ms)")
+    print(f"\nslowest direct imports (cumulative ms)")
+    for name, times in sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))[:top]:
+        print(f"  {statistics.median(times):8.1f}  {name}")
+    print(f"\nslowest modules (self ms)")
+    for name, times in sorted(self_times.items(), key=lambda item: -statistics.median(item[1]))[:top]:
+        print(f"  {statistics.median(times):8.1f}  {name}")
+    return total, loaded
+
+async def first_requests(base_url, stub):
+    import httpx
+
+    timings = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        for name, body in (
+            ("text", {"text": PARAGRAPH * 4, "language": "en", "use_cache": False}),
+            ("url", {"url": f"{stub.url}/articles/startup", "language": "en", "use_cache": False}),
+        ):
+            start = time.perf_counter()
+            response = await client.post("/summarize", json=body)
+            response.raise_for_status()
+            timings[name] = time.perf_counter() - start
+    return timings
+
+def report_serving():
+    print(f"\n{'STARTUP_WARMUP':<15} {'ready (s)':>10} {'first text (ms)':>16} {'first url (ms)':>15}")
+    with StubServer(llm_latency=0.05, tts_latency=0.02) as stub:
+        stub.extra_routes = {"/articles/startup": ("text/html; charset=utf-8", HTML_FILE.read_bytes())}
+        for mode in ("off", "background", "blocking"):
+            start = time.perf_counter()
+            process, base_url = start_server(stub.url, {"STARTUP_WARMUP": mode})
+            ready = time.perf_counter() - start
+            try:
+                timings = asyncio.run(first_requests(base_url, stub))
+            finally:
+                process.terminate()
+                process.wait(timeout=60)
+            print(f"{mode:<15} {ready:>10.2f} {timings['text'] * 1000:>16.0f} {timings['url'] * 1000:>15.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--max-import-ms", type=float, default=800)
+    parser.add_argument("--forbid", default=HEAVY_MODULES, help="comma-separated modules main must not import")
+    parser.add_argument("--skip-serve", action="store_true", help="only measure and check the import")
+    args = parser.parse_args()
+
+    total, loaded = report_imports(args.runs, args.top)
+    if not args.skip_serve:
+        report_serving()
+
+    failures = []
+    forbidden = [name for name in args.forbid.split(",") if name]
+    eager = sorted(name for name in forbidden if name in loaded)
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if total > args.max_import_ms:
+        failures.append(f"import main took {total:.0f}ms, over the {args.max_import_ms:.0f}ms budget")
+    print()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print(f"OK   none of {', '.join(forbidden)} imported; {total:.0f}ms <= {args.max_import_ms:.0f}ms")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare time to first audio between /summarize and /summarize/stream,
+with stub upstreams standing in for the model and TTS APIs.
+
+Usage: python benchmarks/bench_streaming.py [--llm-latency 3] [--tts-latency 0.5]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import point_services_at, serve_app
+from stubs import StubServer
+
+async def run(base_url):
+    import httpx
+
+    payload = {"text": "Some article text to summarize. " * 100, "language": "en", "use_cache": False}
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        start = time.perf_counter()
+        response = await client.post("/summarize", json=payload)
+        response.raise_for_status()
+        print(f"/summarize         first audio after {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        first_token = first_audio = None
+        async with client.stream("POST", "/summarize/stream", json=payload) as response:
+            async for line in response.aiter_lines():
+                if line == "event: token" and first_token is None:
+                    first_token = time.perf_counter() - start
+                elif line == "event: audio" and first_audio is None:
+                    first_audio = time.perf_counter() - start
+        total = time.perf_counter() - start
+        print(f"/summarize/stream  first token after {first_token:.2f}s, "
+              f"first audio after {first_audio:.2f}s, done after {total:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm-latency", type=float, default=3.0, help="seconds for the full completion")
+    parser.add_argument("--tts-latency", type=float, default=0.5, help="seconds per TTS batch")
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=args.llm_latency, tts_latency=args.tts_latency) as stub:
+        point_services_at(stub.url)
+        import main
+
+        with serve_app(main.app) as base_url:
+            asyncio.run(run(base_url))
+
+if __name__ == "__main__":
+    main()
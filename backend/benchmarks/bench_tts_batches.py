@@ -0,0 +1,39 @@
+"""
+Measure TTS wall-clock time for a long summary with batches sent serially
+versus concurrently, against a stub TTS server with injected latency.
+
+Usage: python benchmarks/bench_tts_batches.py [--chars 4500] [--latency 0.4] [--error-rate 0.1]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import point_services_at
+from stubs import StubServer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=4500, help="length of the text to synthesize")
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds per TTS batch")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of batches failing with 503")
+    args = parser.parse_args()
+
+    with StubServer(tts_latency=args.latency, tts_error_rate=args.error_rate) as stub:
+        point_services_at(stub.url)
+        from services import tts_service
+        tts_service.RETRY_BACKOFF = 0.05
+
+        text = ("ఇది ఒక పరీక్ష వాక్యం. " * 400)[:args.chars]
+        batches = len(tts_service._prepare_batches(text, "te"))
+        print(f"{batches} batches of up to {tts_service.BATCH_SIZE} chunks, {args.latency:.2f}s each")
+
+        for parallel in (1, tts_service.MAX_PARALLEL_BATCHES, batches):
+            tts_service.MAX_PARALLEL_BATCHES = parallel
+            start = time.perf_counter()
+            audios = asyncio.run(tts_service.text_to_speech_telugu_async(text, language="te"))
+            elapsed = time.perf_counter() - start
+            print(f"parallel={parallel:<3} chunks={len(audios):<3} wall={elapsed:.2f}s")
+        print(f"injected failures retried: {stub.calls['tts_errors']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Check the TTS chunker's invariants on randomly generated text and compare its
+API call count with fixed 500-character slicing.
+
+For every generated text it asserts that no chunk exceeds the limit, that no
+grapheme cluster is split across chunks, that no word is split unless it is
+longer than a chunk, and that joining the chunks gives back the text. It then
+reports chunks and batches per summary for both strategies, and the time per
+character at growing input sizes to show the chunker runs in linear time.
+
+Usage: python benchmarks/bench_tts_chunker.py [--cases 500] [--seed 0]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.tts_chunker import chunk_text, batch_chunks, split_graphemes
+from services.tts_service import MAX_CHUNK_CHARS, BATCH_SIZE
+
+# Syllables with vowel signs, nuktas and virama conjuncts, which must never be split
+SYLLABLES = {
+    "te": ["ఇ", "ది", "ఒ", "క", "ప", "రీ", "క్ష", "వా", "క్యం", "స్థ", "ల్లో", "ప్ర", "జ", "లు", "శ్రీ"],
+    "hi": ["यह", "एक", "प", "री", "क्ष", "ण", "वा", "क्य", "है", "स्त्री", "क्ष", "र्", "ज़", "म"],
+    "en": ["the", "sum", "ma", "ry", "of", "re", "port", "in", "dia", "café"],
+}
+TERMINATORS = {"te": ["."], "hi": ["।", "?"], "en": [".", "!", "?", ".\""]}
+
+def random_text(rng):
+    """A random paragraph: sentences of random words, with the odd very long word or sentence."""
+    language = rng.choice(list(SYLLABLES))
+    sentences = []
+    for _ in range(rng.randint(1, 40)):
+        words = []
+        for _ in range(rng.choice([rng.randint(1, 25), rng.randint(100, 250)])):
+            syllables = rng.randint(1, 400) if rng.random() < 0.01 else rng.randint(1, 5)
+            words.append("".join(rng.choice(SYLLABLES[language]) for _ in range(syllables)))
+        sentences.append(" ".join(words) + rng.choice(TERMINATORS[language]))
+    return " ".join(sentences)
+
+def slice_chunks(text):
+    """The previous strategy: fixed slices regardless of boundaries."""
+    return [text[i:i + MAX_CHUNK_CHARS] for i in range(0, len(text), MAX_CHUNK_CHARS)]
+
+def check_invariants(text, chunks):
+    assert all(0 < len(chunk) <= MAX_CHUNK_CHARS for chunk in chunks), "chunk over the limit"
+    # Chunks are joined by a space at word boundaries, or directly inside an over-long word
+    rebuilt = ""
+    for chunk in chunks:
+        if rebuilt and text[len(rebuilt)] == " ":
+            rebuilt += " "
+        rebuilt += chunk
+    assert rebuilt == text, "chunks do not reassemble the text"
+
+    boundaries = set()
+    position = 0
+    for grapheme in split_graphemes(text):
+        position += len(grapheme)
+        boundaries.add(position)
+    position = 0
+    long_word_spans = []
+    for word in text.split(" "):
+        if len(word) > MAX_CHUNK_CHARS:
+            long_word_spans.append((position, position + len(word)))
+        position += len(word) + 1
+    position = 0
+    for chunk in chunks[:-1]:
+        position = text.index(chunk, position) + len(chunk)
+        assert position in boundaries, "grapheme cluster split"
+        if text[position] != " ":
+            assert any(start < position < end for start, end in long_word_spans), "word split"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=500, help="random texts to check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    totals = {"sliced": [0, 0], "packed": [0, 0]}
+    split_words = 0
+    for _ in range(args.cases):
+        text = random_text(rng)
+        chunks = chunk_text(text, MAX_CHUNK_CHARS)
+        check_invariants(text, chunks)
+        sliced = slice_chunks(text)
+        split_words += sum(1 for i in range(1, len(sliced)) if text[i * MAX_CHUNK_CHARS - 1] != " " and text[i * MAX_CHUNK_CHARS] != " ")
+        for name, result in (("sliced", sliced), ("packed", chunks)):
+            totals[name][0] += len(result)
+            totals[name][1] += len(batch_chunks(result, BATCH_SIZE))
+    print(f"{args.cases} random texts: all invariants hold")
+    print(f"fixed slicing cut through {split_words} words")
+    for name, (chunks, batches) in totals.items():
+        print(f"{name:<7} chunks={chunks:<7} batches (API calls)={batches}")
+
+    print("size       ms     ns/char")
+    for size in (10_000, 100_000, 1_000_000):
+        text = (random_text(random.Random(1)) + " ") * (size // 1000)
+        text = text[:size].strip()
+        start = time.perf_counter()
+        chunk_text(text, MAX_CHUNK_CHARS)
+        elapsed = time.perf_counter() - start
+        print(f"{size:<10} {elapsed * 1000:<6.1f} {elapsed / size * 1e9:.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Run the API with several uvicorn workers and check what they share, with the
+in-process state backend and with the SQLite one.
+
+For each backend:
+  batch      a batch job polled on fresh connections -> share of polls answered
+  audio      the batch results' audio_url fetched on fresh connections -> share served
+  dedup      N identical concurrent URL requests -> model calls made
+  cache      the same burst again -> further model calls (the summary cache)
+  quota      a burst of distinct requests with LLM_REQUESTS_PER_MINUTE set to the
+             stub's quota -> 429s the stub returned (buckets shared or per worker)
+
+Usage: python benchmarks/bench_workers.py [--workers 4] [--requests 24]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+
+from load_test import HTML_FILE, start_server
+from stubs import StubServer
+
+async def fresh_get(base_url, path):
+    """GET on a new connection, so requests spread over the workers."""
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        return await client.get(path)
+
+async def scenario(base_url, stub, requests):
+    import httpx
+
+    limits = httpx.Limits(max_connections=requests)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        # First, while only the worker running the batch has published its items' audio
+        items = [{"id": str(i), "text": f"Batch item {i}. " * 40} for i in range(4)]
+        urls = []
+        async with client.stream("POST", "/summarize/batch", json={"items": items, "language": "en"}) as stream:
+            lines = stream.aiter_lines()
+            job_id = json.loads(await lines.__anext__())["job_id"]
+            polls = await asyncio.gather(*(fresh_get(base_url, f"/summarize/batch/{job_id}") for _ in range(16)))
+            async for line in lines:
+                urls.append(json.loads(line).get("audio_url"))
+        batch = sum(p.status_code == 200 for p in polls) / len(polls)
+
+        fetches = await asyncio.gather(*(fresh_get(base_url, url) for url in set(urls) if url for _ in range(8)))
+        audio = sum(f.status_code == 200 for f in fetches) / max(len(fetches), 1)
+
+        body = {"url": f"{stub.url}/articles/news", "language": "en"}
+        stub.calls["llm"] = 0
+        await asyncio.gather(*(client.post("/summarize", json=body) for _ in range(requests)))
+        dedup = stub.calls["llm"]
+        await asyncio.gather(*(client.post("/summarize", json=body) for _ in range(requests)))
+        cache = stub.calls["llm"] - dedup
+
+        stub.calls["llm_429"] = 0
+        await asyncio.gather(*(
+            client.post("/summarize", json={"text": f"Quota test {i}. " * 30, "language": "en", "use_cache": False})
+            for i in range(requests)
+        ))
+        quota = stub.calls["llm_429"]
+    return {"batch": batch, "audio": audio, "dedup": dedup, "cache": cache, "quota": quota}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=24)
+    parser.add_argument("--quota", type=int, default=4, help="model calls per second the stub allows")
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=0.3, tts_latency=0.05, llm_quota=(args.quota, 1.0)) as stub:
+        stub.extra_routes = {"/articles/news": ("text/html; charset=utf-8", HTML_FILE.read_bytes())}
+        print(f"{args.workers} workers, {args.requests} requests per burst")
+        print(f"{'backend':<8} {'batch polls ok':>15} {'audio served':>13} "
+              f"{'dedup llm calls':>16} {'cache llm calls':>16} {'upstream 429s':>14}")
+        with tempfile.TemporaryDirectory() as tmp:
+            for backend in ("memory", "sqlite"):
+                env = {
+                    "STATE_BACKEND": backend,
+                    "STATE_DB_PATH": os.path.join(tmp, "state.sqlite3"),
+                    "LLM_REQUESTS_PER_MINUTE": str(args.quota * 60),
+                    "UPSTREAM_BURST_SECONDS": "0.5",
+                }
+                process, base_url = start_server(stub.url, env, args.workers)
+                try:
+                    result = asyncio.run(scenario(base_url, stub, args.requests))
+                finally:
+                    process.terminate()
+                    process.wait(timeout=60)
+                print(f"{backend:<8} {result['batch']:>15.0%} {result['audio']:>13.0%} "
+                      f"{result['dedup']:>16} {result['cache']:>16} {result['quota']:>14}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Load test: run fixed workloads through the API server against local stub
+upstreams and record latency percentiles, throughput, memory and per-stage
+time, so runs can be compared across changes.
+
+The app runs under uvicorn in its own process, pointed at the stub model and
+TTS servers (with configurable latency and jitter) started by this script.
+Workloads:
+  text   /summarize with direct text
+  pdf    /upload_and_summarize with the PDF in backend/assets/
+  url    /summarize with a URL to the local HTML fixture, served by the stub
+  image  /upload_and_summarize with the photo in backend/assets/
+
+Every request is made unique and skips the summary cache, so each one runs
+the whole pipeline. Per-stage times come from the Server-Timing header; RSS
+is sampled from the server process and its children (workers, PDF and OCR
+pools) while each workload runs.
+
+Usage:
+  python benchmarks/load_test.py [--workloads text,pdf,url,image] [--requests 40] [--concurrency 8]
+                                 [--llm-latency 0.5] [--tts-latency 0.3] [--jitter 0.1]
+                                 [--workers 1] [--output results.json] [--compare previous.json] [--env NAME=VALUE ...]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+from _common import BACKEND_DIR
+from stubs import StubServer
+
+ASSETS_DIR = Path(BACKEND_DIR) / "assets"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+PDF_FILE = ASSETS_DIR / "Pavan_Resume.pdf"
+IMAGE_FILE = ASSETS_DIR / "IMG-20250404-WA0008.jpg"
+HTML_FILE = FIXTURES_DIR / "news_article.html"
+
+PARAGRAPH = (
+    "The city council approved the new transport plan after a long debate on Tuesday evening. "
+    "The plan adds three bus routes, extends metro hours on weekends and funds safer cycle lanes. "
+    "Opposition members argued that the budget underestimates maintenance costs over the next decade. "
+)
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+def parse_server_timing(header):
+    """Map stage name to milliseconds from a Server-Timing header value."""
+    stages = {}
+    for entry in filter(None, (part.strip() for part in (header or "").split(","))):
+        name, *params = entry.split(";")
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                stages[name.strip()] = float(value)
+    return stages
+
+def read_rss(pid):
+    """Resident set size of a process in bytes, from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def read_tree_rss(pid):
+    """RSS of a process and all its descendants, in bytes."""
+    total = read_rss(pid)
+    if total is None:
+        return None
+    try:
+        children = [int(child) for task in os.listdir(f"/proc/{pid}/task")
+                    for child in open(f"/proc/{pid}/task/{task}/children").read().split()]
+    except OSError:
+        children = []
+    return total + sum(read_tree_rss(child) or 0 for child in children)
+
+class RssSampler:
+    """Samples a process's RSS in a background thread, keeping the peak."""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = read_tree_rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(stub_url, extra_env, workers=1):
+    """Start the API under uvicorn in a subprocess pointed at the stubs; return (process, base URL)."""
+    port = free_port()
+    env = dict(
+        os.environ,
+        MODEL_ENDPOINT=stub_url,
+        SARVAM_TTS_URL=f"{stub_url}/text-to-speech",
+        SERVER_TIMING="true",
+        PYTHONPATH=os.pathsep.join([BACKEND_DIR, os.path.join(BACKEND_DIR, "fastapi")]),
+    )
+    env.setdefault("GITHUB_TOKEN", "stub-token")
+    env.setdefault("api-subscription-key", "stub-key")
+    env.update(extra_env)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+         "--workers", str(workers)],
+        cwd=os.path.join(BACKEND_DIR, "fastapi"), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The API server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/cache/stats", timeout=1):
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("The API server did not start within 60s")
+
+def build_workloads(stub_url):
+    """Each workload maps a request number to the arguments of one unique request."""
+    pdf = PDF_FILE.read_bytes()
+    image = IMAGE_FILE.read_bytes()
+
+    def text(i):
+        return dict(url="/summarize", json={"text": f"Report {i}. " + PARAGRAPH * 12, "language": "en", "use_cache": False})
+
+    def pdf_upload(i):
+        # Bytes after %%EOF are ignored by PDF readers but make each upload distinct
+        return dict(url="/upload_and_summarize", files={"file": ("resume.pdf", pdf + f"\n% {i}\n".encode(), "application/pdf")},
+                    data={"language": "en", "use_cache": "false"})
+
+    def url(i):
+        return dict(url="/summarize", json={"url": f"{stub_url}/articles/news?n={i}", "language": "en", "use_cache": False})
+
+    def image_upload(i):
+        # Bytes after the JPEG end marker are ignored by decoders but make each upload distinct
+        return dict(url="/upload_and_summarize", files={"file": ("photo.jpg", image + i.to_bytes(4, "big", signed=True), "image/jpeg")},
+                    data={"language": "en", "use_cache": "false"})
+
+    return {"text": text, "pdf": pdf_upload, "url": url, "image": image_upload}
+
+async def run_workload(base_url, make_request, requests, concurrency, timeout):
+    import httpx
+
+    results = []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(**make_request(i))
+                    ok = response.status_code == 200 and "error" not in response.json()
+                    status, stages = response.status_code, parse_server_timing(response.headers.get("server-timing"))
+                except httpx.HTTPError as e:
+                    ok, status, stages = False, type(e).__name__, {}
+                results.append({"seconds": time.perf_counter() - start, "ok": ok, "status": status, "stages": stages})
+
+        # One warm-up request so imports and connection pools are not measured
+        await one(-1)
+        results.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        wall = time.perf_counter() - start
+    return results, wall
+
+def summarize_results(results, wall):
+    latencies = [r["seconds"] for r in results if r["ok"]]
+    statuses = {}
+    for r in results:
+        statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    stage_names = sorted({name for r in results for name in r["stages"]})
+    stages = {}
+    for name in stage_names:
+        values = [r["stages"][name] for r in results if name in r["stages"]]
+        stages[name] = {"mean_ms": statistics.fmean(values), "p95_ms": percentile(values, 95), "requests": len(values)}
+    summary = {
+        "requests": len(results),
+        "ok": len(latencies),
+        "statuses": statuses,
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "stages": stages,
+    }
+    if latencies:
+        summary.update({
+            "p50_seconds": percentile(latencies, 50),
+            "p95_seconds": percentile(latencies, 95),
+            "p99_seconds": percentile(latencies, 99),
+            "max_seconds": max(latencies),
+        })
+    return summary
+
+def print_summary(name, summary, previous=None):
+    def delta(key):
+        if not previous or key not in previous or key not in summary or not previous[key]:
+            return ""
+        return f" ({(summary[key] / previous[key] - 1):+.0%})"
+
+    rss = summary.get("peak_rss_bytes")
+    print(f"{name}: {summary['ok']}/{summary['requests']} ok, statuses {summary['statuses']}")
+    if "p50_seconds" in summary:
+        print(f"  latency   p50 {summary['p50_seconds']:.3f}s{delta('p50_seconds')}  "
+              f"p95 {summary['p95_seconds']:.3f}s{delta('p95_seconds')}  p99 {summary['p99_seconds']:.3f}s{delta('p99_seconds')}")
+    print(f"  throughput {summary['throughput_rps']:.2f} req/s{delta('throughput_rps')}  "
+          f"peak RSS {rss / 2**20:.0f} MiB{delta('peak_rss_bytes')}" if rss else
+          f"  throughput {summary['throughput_rps']:.2f} req/s{delta('throughput_rps')}")
+    for stage, stats in summary["stages"].items():
+        print(f"    {stage:<16} mean {stats['mean_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  ({stats['requests']} requests)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", default="text,pdf,url,image")
+    parser.add_argument("--requests", type=int, default=40, help="requests per workload")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1, help="extra random latency, up to this many seconds")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", help="JSON file to write results to (default: benchmarks/results/load-<time>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to show changes against")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="environment variable for the API server, e.g. --env OCR_ENABLED=false")
+    args = parser.parse_args()
+
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    previous = json.loads(Path(args.compare).read_text())["workloads"] if args.compare else {}
+
+    stub = StubServer(llm_latency=args.llm_latency, tts_latency=args.tts_latency, jitter=args.jitter)
+    stub.extra_routes = {"/articles/news": ("text/html; charset=utf-8", HTML_FILE.read_bytes())}
+    with stub:
+        process, base_url = start_server(stub.url, extra_env, args.workers)
+        try:
+            workloads = build_workloads(stub.url)
+            report = {
+                "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "config": {
+                    "requests": args.requests, "concurrency": args.concurrency, "llm_latency": args.llm_latency,
+                    "tts_latency": args.tts_latency, "jitter": args.jitter, "env": extra_env, "workers": args.workers,
+                    "python": platform.python_version(), "platform": platform.platform(),
+                },
+                "idle_rss_bytes": read_tree_rss(process.pid),
+                "workloads": {},
+            }
+            for name in args.workloads.split(","):
+                calls_before = dict(stub.calls)
+                with RssSampler(process.pid) as sampler:
+                    results, wall = asyncio.run(run_workload(base_url, workloads[name], args.requests, args.concurrency, args.timeout))
+                summary = summarize_results(results, wall)
+                summary["peak_rss_bytes"] = sampler.peak
+                summary["upstream_calls"] = {key: stub.calls[key] - calls_before.get(key, 0) for key in stub.calls}
+                report["workloads"][name] = summary
+                print_summary(name, summary, previous.get(name))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Local stand-ins for the upstream model and Sarvam TTS APIs.
+
+The stubs speak just enough of each protocol for the services in this repo
+and sleep for a configurable latency, so benchmarks measure our own overhead
+and concurrency behaviour instead of the network.
+"""
+import base64
+import io
+import json
+import math
+import random
+import threading
+import time
+import wave
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def silent_wav(duration_s=0.1, sample_rate=22050):
+    """Return the bytes of a mono 16-bit silent WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * int(duration_s * sample_rate))
+    return buffer.getvalue()
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # Don't let the listen backlog throttle load tests
+
+class StubServer:
+    """
+    A threaded HTTP server serving a fake OpenAI-compatible chat endpoint
+    (`/chat/completions`) and a fake Sarvam TTS endpoint (`/text-to-speech`).
+
+    :param llm_latency: Seconds each chat completion takes.
+    :param tts_latency: Seconds each TTS batch takes.
+    :param jitter: Extra uniformly random latency added to every call.
+    :param tts_error_rate: Fraction of TTS calls answered with a 503.
+    :param summary: Text returned as the model's summary.
+    :param llm_quota: Optional (requests, seconds) quota for chat completions; calls over it get 429 with Retry-After.
+    :param tts_quota: Optional (requests, seconds) quota for TTS batches.
+    """
+
+    def __init__(self, llm_latency=0.5, tts_latency=0.3, jitter=0.0, summary=None, tts_error_rate=0.0,
+                 llm_quota=None, tts_quota=None):
+        self.llm_latency = llm_latency
+        self.tts_latency = tts_latency
+        self.jitter = jitter
+        self.tts_error_rate = tts_error_rate
+        self.summary = summary or ("This is a stub summary sentence. " * 20).strip()
+        self.audio_b64 = base64.b64encode(silent_wav()).decode("ascii")
+        self.calls = {"llm": 0, "tts": 0, "tts_errors": 0, "llm_429": 0, "tts_429": 0, "get": 0,
+                      "llm_input_chars": 0}
+        self.quotas = {"llm": llm_quota, "tts": tts_quota}
+        self._windows = {"llm": deque(), "tts": deque()}
+        self.extra_routes = {}  # GET path -> JSON body, or (content type, bytes)
+        self.get_latency = 0.0  # Seconds each extra route takes
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _sleep(self, base):
+        time.sleep(base + random.uniform(0, self.jitter))
+
+    def _count(self, key):
+        with self._lock:
+            self.calls[key] += 1
+
+    def _admit(self, key):
+        """Count a call against its quota; return None if allowed, else the seconds until it would be."""
+        quota = self.quotas[key]
+        if quota is None:
+            return None
+        limit, seconds = quota
+        window = self._windows[key]
+        with self._lock:
+            now = time.monotonic()
+            while window and window[0] <= now - seconds:
+                window.popleft()
+            if len(window) < limit:
+                window.append(now)
+                return None
+            self.calls[f"{key}_429"] += 1
+            return window[0] + seconds - now
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, body, headers=None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream_completion(self, body):
+                # Spread the configured latency evenly over the streamed words
+                words = stub.summary.split(" ")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for i, word in enumerate(words):
+                    stub._sleep(stub.llm_latency / len(words))
+                    chunk = {
+                        "id": "stub",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": body.get("model", "stub"),
+                        "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+            def _send_raw(self, content_type, data):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                # The query string is ignored, so callers can make each URL unique
+                route = stub.extra_routes.get(self.path.split("?", 1)[0])
+                if route is not None:
+                    stub._count("get")
+                    stub._sleep(stub.get_latency)
+                    if isinstance(route, tuple):
+                        self._send_raw(*route)
+                    else:
+                        self._send_json(200, route)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                key = "llm" if self.path.endswith("/chat/completions") else "tts"
+                retry_after = stub._admit(key)
+                if retry_after is not None:
+                    self._send_json(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+                                    {"Retry-After": str(math.ceil(retry_after)),
+                                     "retry-after-ms": str(int(retry_after * 1000))})
+                    return
+                if key == "llm":
+                    with stub._lock:
+                        stub.calls["llm_input_chars"] += len(json.dumps(body.get("messages", []), ensure_ascii=False))
+                if self.path.endswith("/chat/completions") and body.get("stream"):
+                    stub._count("llm")
+                    self._stream_completion(body)
+                elif self.path.endswith("/chat/completions"):
+                    stub._count("llm")
+                    stub._sleep(stub.llm_latency)
+                    self._send_json(200, {
+                        "id": "stub",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", "stub"),
+                        "choices": [{
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": stub.summary},
+                        }],
+                        "usage": {"prompt_tokens": 100, "completion_tokens": 100, "total_tokens": 200},
+                    })
+                elif self.path.endswith("/text-to-speech"):
+                    stub._count("tts")
+                    stub._sleep(stub.tts_latency)
+                    if random.random() < stub.tts_error_rate:
+                        stub._count("tts_errors")
+                        self._send_json(503, {"error": "injected failure"})
+                        return
+                    self._send_json(200, {"audios": [stub.audio_b64 for _ in body.get("inputs", [])]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
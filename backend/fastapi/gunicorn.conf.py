@@ -0,0 +1,19 @@
+# Gunicorn settings for running the API with several uvicorn workers and a preloaded app:
+#   gunicorn -c gunicorn.conf.py main:app
+# Needs `pip install gunicorn`. Set STATE_BACKEND=sqlite so workers share caches, audio,
+# request deduplication, rate limits and batch job status.
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get("WEB_WORKERS", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master and fork workers from it: faster starts and shared
+# read-only memory. Safe because clients, pools and state files are opened lazily per worker.
+preload_app = os.environ.get("PRELOAD_APP", "true").lower() in ("1", "true", "yes")
+
+# Seconds workers get to finish in-flight requests on shutdown or reload
+graceful_timeout = float(os.environ.get("GRACEFUL_SHUTDOWN_TIMEOUT", 30))
+
+# Model calls can be slow; only restart workers that are stuck far beyond a request's deadline
+timeout = int(os.environ.get("WORKER_TIMEOUT", 120))
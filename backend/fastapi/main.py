@@ -1,7 +1,12 @@
 # File: backend/fastapi/main.py
 from dotenv import load_dotenv
+import asyncio
+import hashlib
+import json
+import math
 import os
-import shutil
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Load environment variables from the .env file in the backend directory
@@ -9,9 +14,9 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-import uvicorn
+from typing import List, Optional
 import logging
 
 # Set up logging
@@ -19,11 +24,187 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import our service functions
-from services.pdf_extraction import extract_text_from_pdf
-from services.article_scraper import extract_text_from_url
-from services.summarizer import azure_chatgpt_summarization, extract_and_summarize_image
+from services.pdf_extraction import extract_text_from_pdf, shutdown_pdf_workers
+from services.ocr import shutdown_ocr_workers
+from services.article_scraper import ArticleFetchError, extract_text_from_url_async
+from services.summarizer import (
+    azure_chatgpt_summarization_async,
+    extract_and_summarize_image_async,
+    extract_and_summarize_image_bytes_async,
+    stream_summarization_async,
+    stream_image_summary_async,
+    normalize_image_format,
+    read_image,
+    summarize_image_languages_async,
+    summarize_languages_async,
+    LANGUAGE_NAMES,
+)
+from services.batch import BatchPipeline, get_batch_jobs
+from services.executor import purge_periodically, run_blocking, shutdown_executor
+from services.cache import get_summary_cache
+from services.audio import AUDIO_STORE_TTL, get_audio, parse_byte_range, publish_audio_url
+from services.clients import get_clients, close_clients
+from services.metrics import stage, render_metrics, start_request_timings, server_timing_header
+from services.rate_limit import UpstreamBusy, start_request_deadline
+from services.single_flight import SingleFlight, flight_key, normalize_text, normalize_url
+from services.shared_state import STATE_BACKEND
+from services.warmup import STARTUP_WARMUP, warm_up
+from services.jobs import JOB_WORKERS, JobWorkers, get_job_store
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared connection pools once for the application's lifetime
+    await get_clients().start()
+    warmup = None
+    if STARTUP_WARMUP == "blocking":
+        await warm_up()
+    elif STARTUP_WARMUP == "background":
+        warmup = asyncio.create_task(warm_up())
+    elif STARTUP_WARMUP != "off":
+        logger.warning(f"Unknown STARTUP_WARMUP {STARTUP_WARMUP!r}; skipping warm-up")
+    # Pick up queued jobs, including those a previous run left unfinished
+    await job_workers.start(JOB_WORKERS)
+    purges = [
+        asyncio.create_task(purge_periodically(name, purge, PURGE_INTERVAL)) for name, purge in (
+            ("summary cache rows", lambda: get_summary_cache().purge()),
+            ("jobs", lambda: get_job_store().purge_expired()),
+            ("batch jobs", lambda: get_batch_jobs().purge_expired()),
+        )
+    ]
+    yield
+    for purge in purges:
+        purge.cancel()
+    if warmup is not None:
+        warmup.cancel()
+    # Jobs still running go back to the queue and resume from their last checkpoint
+    await job_workers.stop()
+    await close_clients()
+    # Let in-flight blocking work finish before the process exits
+    shutdown_executor()
+    shutdown_pdf_workers()
+    shutdown_ocr_workers()
+
+app = FastAPI(title="Summarization API", lifespan=lifespan)
+
+# Largest accepted upload, in bytes
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 25 * 1024 * 1024))
+
+# Keep a content-addressed copy of each upload in the assets directory
+PERSIST_UPLOADS = os.environ.get("PERSIST_UPLOADS", "false").lower() in ("1", "true", "yes")
+
+# Seconds between sweeps of expired summary cache rows, jobs and batch job results
+PURGE_INTERVAL = float(os.environ.get("PURGE_INTERVAL", 600))
+
+# Seconds between checks for progress on a job's event stream
+JOB_EVENTS_INTERVAL = float(os.environ.get("JOB_EVENTS_INTERVAL", 0.5))
+
+# Summaries being computed, shared by identical requests that arrive meanwhile
+summary_flights = SingleFlight()
+
+class UploadTooLarge(Exception):
+    pass
+
+class BodySizeLimitMiddleware:
+    """
+    Reject upload bodies larger than max_bytes with 413.
+    
+    Requests that declare a larger Content-Length are rejected before any of
+    the body is read; chunked bodies are counted as they stream in and cut
+    off as soon as they cross the limit.
+    """
+
+    def __init__(self, app, max_bytes, paths):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and int(content_length) > self.max_bytes:
+            return await self._reject(scope, receive, send)
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                # The framework may turn the aborted body read into its own error response
+                if exceeded:
+                    response_started = True
+                    return await self._reject(scope, receive, send)
+                response_started = True
+            elif exceeded:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not response_started:
+                await self._reject(scope, receive, send)
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload exceeds the {self.max_bytes} byte limit"},
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
+
+# Add a Server-Timing header with the per-stage breakdown of each request
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+class ServerTimingMiddleware:
+    """Collect per-stage timings for each request and report them in a Server-Timing header"""
+
+    def __init__(self, app, enabled=SERVER_TIMING):
+        self.app = app
+        self.enabled = enabled
 
-app = FastAPI(title="Summarization API")
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timings = start_request_timings()
+
+        async def send_with_timings(message):
+            if self.enabled and message["type"] == "http.response.start" and timings:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing_header(timings).encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_timings)
+
+class DeadlineMiddleware:
+    """Give each request REQUEST_DEADLINE seconds, after which waiting for upstream capacity is shed with 503"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            start_request_deadline()
+        await self.app(scope, receive, send)
+
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=UPLOAD_MAX_BYTES, paths={"/upload_and_summarize", "/jobs/upload"})
 
 # Add CORS middleware to allow requests from the frontend
 app.add_middleware(
@@ -32,8 +213,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Job-Id", "Content-Range", "Accept-Ranges"],
 )
 
+@app.exception_handler(UpstreamBusy)
+async def upstream_busy_handler(request: Request, exc: UpstreamBusy):
+    """Tell clients to come back later instead of failing when an upstream quota is exhausted"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "upstream": exc.upstream, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+@app.exception_handler(ArticleFetchError)
+async def article_fetch_error_handler(request: Request, exc: ArticleFetchError):
+    """The URL the client sent could not be turned into text to summarize"""
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
 # Create assets directory if it doesn't exist
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')
 os.makedirs(ASSETS_DIR, exist_ok=True)
@@ -45,6 +241,18 @@ class SummarizationRequest(BaseModel):
     text: Optional[str] = None       # Direct text input
     file_path: Optional[str] = None  # Path to uploaded file (if applicable)
     language: Optional[str] = "te"   # Language code, default to English
+    use_cache: Optional[bool] = True # Set to false to bypass the summary cache
+    inline_audio: Optional[bool] = False # Also return the raw base64 TTS chunks in the response
+    languages: Optional[List[str]] = None # Summarize in several languages at once; overrides language
+
+class BatchItem(SummarizationRequest):
+    id: Optional[str] = None         # Caller's identifier, echoed back in the result
+    language: Optional[str] = None   # Overrides the batch language for this item
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    language: Optional[str] = "te"
+    use_cache: Optional[bool] = True
 
 def detect_file_type(filename):
     """Detect file type based on extension"""
@@ -57,48 +265,109 @@ def detect_file_type(filename):
         return 'text'
     return ''
 
+async def read_upload(upload_file: UploadFile, max_bytes=UPLOAD_MAX_BYTES, chunk_size=64 * 1024):
+    """Read an upload into memory in chunks, rejecting it as soon as it exceeds max_bytes"""
+    chunks = []
+    total = 0
+    while chunk := await upload_file.read(chunk_size):
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def persist_upload(data, filename):
+    """Store an upload in the assets directory under its content hash (blocking; run on the executor)"""
+    extension = os.path.splitext(filename)[1].lower()
+    file_path = os.path.join(ASSETS_DIR, hashlib.sha256(data).hexdigest() + extension)
+    if not os.path.exists(file_path):
+        # Write to a temporary name first so concurrent identical uploads never see a partial file
+        temp_path = f"{file_path}.{os.getpid()}.{id(data)}.tmp"
+        with open(temp_path, "wb") as buffer:
+            buffer.write(data)
+        os.replace(temp_path, file_path)
+    return file_path
+
+def decode_text(data):
+    """Decode text bytes, falling back to latin-1 if they are not valid UTF-8"""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        # Try again with a different encoding if UTF-8 fails
+        return data.decode('latin-1')
+
+def read_text_file(file_path):
+    """Read a text file, falling back to latin-1 if it is not valid UTF-8"""
+    with open(file_path, 'rb') as f:
+        return decode_text(f.read())
+
 @app.post("/upload_and_summarize")
 async def upload_and_summarize(
     file: UploadFile = File(...), 
     file_type: Optional[str] = Form(None),
-    language: Optional[str] = Form("te")
+    language: Optional[str] = Form("te"),
+    use_cache: bool = Form(True),
+    inline_audio: bool = Form(False),
+    languages: Optional[str] = Form(None)
 ):
     try:
         logger.info(f"Received file upload for immediate summarization: {file.filename} (language: {language})")
-        # Save the file
+        # Keep the upload in memory; it only touches disk if persistence is enabled
         safe_filename = Path(file.filename).name
-        file_path = os.path.join(ASSETS_DIR, safe_filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        logger.info(f"Saved file to: {file_path}")
+        data = await read_upload(file)
+        file_path = None
+        if PERSIST_UPLOADS:
+            file_path = await run_blocking(persist_upload, data, safe_filename)
+            logger.info(f"Saved file to: {file_path}")
 
         # Determine file type if not provided
         if not file_type:
             file_type = detect_file_type(safe_filename)
 
-        # Process based on file type
-        if file_type.lower() in ["image", "jpg", "jpeg", "png", "gif"]:
-            # For images, use the combined extract and summarize function
-            result = extract_and_summarize_image(file_path, language)
-            logger.info(f"Generated summary from image: {result['summary'][:50]}...")
-        else:
-            # Extract text from other file types
-            extracted_text = await extract_text_from_file(file_path, file_type)
-            # Generate summary
-            result = azure_chatgpt_summarization(extracted_text, language)
-            logger.info(f"Generated summary: {result['summary'][:50]}...")
-        
+        # Comma-separated language codes, e.g. "te,hi,en"
+        wanted = parse_languages(languages.split(",")) if languages else None
+        image_format = normalize_image_format(os.path.splitext(safe_filename)[1] or file_type) if is_image_type(file_type) else None
+        key = flight_key("upload", hashlib.sha256(data).digest(), file_type, image_format, language, wanted, use_cache)
+        result = await summary_flights.do(key, lambda: summarize_upload(data, file_type, image_format, language, wanted, use_cache))
+
         return {
-            "summary": result['summary'], 
-            "audio": result['audio'],
+            **await summary_response(result, inline_audio),
             "file_path": file_path, 
             "filename": safe_filename, 
             "content_type": file.content_type
         }
+    except (HTTPException, UpstreamBusy):
+        raise
     except Exception as e:
         logger.error(f"Error in upload_and_summarize: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Upload and summarization failed: {str(e)}")
 
+async def summarize_upload(data, file_type, image_format, language, languages, use_cache):
+    """Summarize an uploaded file's contents"""
+    # Process based on file type
+    if image_format and languages:
+        return {"results": await summarize_image_languages_async(data, image_format, languages, use_cache=use_cache)}
+    elif image_format:
+        # For images, use the combined extract and summarize function
+        result = await extract_and_summarize_image_bytes_async(data, image_format, language, use_cache=use_cache)
+        logger.info(f"Generated summary from image: {result['summary'][:50]}...")
+    else:
+        # Extract text from other file types
+        extracted_text = await extract_text_from_bytes(data, file_type)
+        if languages:
+            return {"results": await summarize_languages_async(extracted_text, languages, use_cache=use_cache)}
+        # Generate summary
+        result = await azure_chatgpt_summarization_async(extracted_text, language, use_cache=use_cache)
+        logger.info(f"Generated summary: {result['summary'][:50]}...")
+    return result
+
+async def extract_text_from_bytes(data, file_type):
+    """Extract text from an in-memory file based on its type"""
+    with stage("extract"):
+        if file_type and file_type.lower() == "pdf":
+            return await run_blocking(extract_text_from_pdf, data)
+        return await run_blocking(decode_text, data)
+
 async def extract_text_from_file(file_path, file_type=None):
     """Extract text from a file based on its type"""
     try:
@@ -110,76 +379,399 @@ async def extract_text_from_file(file_path, file_type=None):
         
         # Extract text based on file type
         if file_type.lower() == "pdf":
-            return extract_text_from_pdf(file_path)
+            return await run_blocking(extract_text_from_pdf, file_path)
         elif file_type.lower() in ["image", "jpg", "jpeg", "png", "gif"]:
             # We use the combined function for images
             logger.info("Using combined extract_and_summarize_image function")
-            result = extract_and_summarize_image(file_path)
+            result = await extract_and_summarize_image_async(file_path)
             return result['summary']
         else:  # Default to text file
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                # Try again with a different encoding if UTF-8 fails
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    return f.read()
+            return await run_blocking(read_text_file, file_path)
+    except UpstreamBusy:
+        raise
     except Exception as e:
         logger.error(f"Error extracting text from file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error extracting text from file: {str(e)}")
 
+async def summary_response(result, inline_audio=False):
+    """Response body for a summary: the text and a link to its merged audio, per language for multi-language results"""
+    if "results" in result:
+        responses = await asyncio.gather(*(summary_response(r, inline_audio) for r in result["results"].values()))
+        return {"results": dict(zip(result["results"], responses))}
+    response = {
+        "summary": result['summary'],
+        "audio_url": await publish_audio_url(result['audio']),
+    }
+    # Audio that could not be merged is still playable as its chunks
+    if inline_audio or response["audio_url"] is None:
+        response["audio"] = result['audio']
+    return response
+
+def parse_languages(languages):
+    """Validate and deduplicate a list of language codes, keeping their order"""
+    languages = [language.strip() for language in languages if language.strip()]
+    unknown = [language for language in languages if language not in LANGUAGE_NAMES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported language codes: {', '.join(unknown)}. "
+                                                    f"Supported: {', '.join(LANGUAGE_NAMES)}.")
+    if not languages:
+        raise HTTPException(status_code=400, detail="Please provide at least one language.")
+    return list(dict.fromkeys(languages))
+
+def is_image_type(file_type):
+    """Whether a file type refers to an image"""
+    return bool(file_type) and file_type.lower() in ["image", "jpg", "jpeg", "png", "gif"]
+
+async def extract_request_text(request: SummarizationRequest):
+    """Extract the text to summarize from a request's direct text, file path or URL"""
+    if request.text:
+        logger.info(f"Using direct text input: {request.text[:50]}...")
+        return request.text
+    elif request.file_path:
+        with stage("extract"):
+            return await extract_text_from_file(request.file_path, request.file_type)
+    elif request.url:
+        logger.info(f"Processing URL: {request.url}")
+        if request.file_type and request.file_type.lower() == "pdf":
+            with stage("extract"):
+                return await run_blocking(extract_text_from_pdf, request.url)
+        elif request.file_type and request.file_type.lower() in ["image", "jpg", "png"]:
+            # We would need to download the image first to use our combined function
+            return "Error: Direct image URL summarization not supported yet"
+        with stage("extract"):
+            return await extract_text_from_url_async(request.url)
+    error_msg = "Please provide either direct text, a file path, or a URL."
+    logger.error(error_msg)
+    raise HTTPException(status_code=400, detail=error_msg)
+
+def request_flight_key(request: SummarizationRequest):
+    """Identify a request's computation so identical concurrent requests can share it"""
+    if request.text:
+        source = ("text", normalize_text(request.text))
+    elif request.file_path:
+        source = ("file", request.file_path, request.file_type)
+    else:
+        source = ("url", normalize_url(request.url or ""), request.file_type)
+    return flight_key(*source, request.language, request.languages, request.use_cache)
+
+async def summarize_request(request: SummarizationRequest):
+    """Summarize a request's input, returning the summary result, {"results": {language: result}} or {"error": ...}"""
+    # Check if it's an image file
+    if request.file_path and not request.text and is_image_type(request.file_type) and request.languages:
+        image_data = await run_blocking(read_image, request.file_path)
+        image_format = normalize_image_format(os.path.splitext(request.file_path)[1] or request.file_type)
+        return {"results": await summarize_image_languages_async(image_data, image_format, request.languages, use_cache=request.use_cache)}
+    elif request.file_path and not request.text and is_image_type(request.file_type):
+        # Use the combined extract and summarize function for images
+        return await extract_and_summarize_image_async(request.file_path, request.language, use_cache=request.use_cache)
+
+    # Extract text based on input type
+    extracted_text = await extract_request_text(request)
+    logger.info(f"Extracted text length: {len(extracted_text)}")
+
+    # Only summarize if we haven't already (for images)
+    if extracted_text.startswith("Error"):
+        return {"error": extracted_text}
+    if request.languages:
+        # Extracted and condensed once, then derived per language
+        return {"results": await summarize_languages_async(extracted_text, request.languages, use_cache=request.use_cache)}
+    # Summarize and get TTS
+    result = await azure_chatgpt_summarization_async(extracted_text, request.language, use_cache=request.use_cache)
+    logger.info(f"Generated summary: {result['summary'][:50]}...")
+    return result
+
 @app.post("/summarize")
 async def summarize(request: SummarizationRequest):
     try:
         logger.info(f"Summarization request: {request}")
-        extracted_text = ""
-        
-        # Extract text based on input type
-        if request.text:
-            extracted_text = request.text
-            logger.info(f"Using direct text input: {request.text[:50]}...")
-        elif request.file_path:
-            # Check if it's an image file
-            if request.file_type and request.file_type.lower() in ["image", "jpg", "jpeg", "png", "gif"]:
-                # Use the combined extract and summarize function for images
-                result = extract_and_summarize_image(request.file_path, request.language)
-                return {
-                    "summary": result['summary'],
-                    "audio": result['audio']
-                }
-            else:
-                extracted_text = await extract_text_from_file(request.file_path, request.file_type)
-        elif request.url:
-            logger.info(f"Processing URL: {request.url}")
-            if request.file_type and request.file_type.lower() == "pdf":
-                extracted_text = extract_text_from_pdf(request.url)
-            elif request.file_type and request.file_type.lower() in ["image", "jpg", "png"]:
-                # We would need to download the image first to use our combined function
-                return {"error": "Direct image URL summarization not supported yet"}
-            else:
-                extracted_text = extract_text_from_url(request.url)
-        else:
-            error_msg = "Please provide either direct text, a file path, or a URL."
-            logger.error(error_msg)
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        logger.info(f"Extracted text length: {len(extracted_text)}")
-        
-        # Only summarize if we haven't already (for images)
-        if not extracted_text.startswith("Error"):
-            # Summarize and get TTS
-            result = azure_chatgpt_summarization(extracted_text, request.language)
-            logger.info(f"Generated summary: {result['summary'][:50]}...")
-            return {
-                "summary": result['summary'],
-                "audio": result['audio']
-            }
-        else:
-            return {"error": extracted_text}
-    
+        if request.languages is not None:
+            request.languages = parse_languages(request.languages)
+        # Concurrent identical requests (e.g. a link everyone is sharing) wait on one computation
+        result = await summary_flights.do(request_flight_key(request), lambda: summarize_request(request))
+        if "error" in result:
+            return result
+        return await summary_response(result, request.inline_audio)
+
+    except (HTTPException, UpstreamBusy, ArticleFetchError):
+        raise
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+def sse_event(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/summarize/stream")
+async def summarize_stream(request: SummarizationRequest):
+    """
+    Stream a summary as server-sent events.
+    
+    Emits `token` events with summary text as the model produces it, `audio`
+    events (in order) with base64 chunks for each finished group of sentences,
+    then a final `done` event carrying the `audio_url` of the merged audio,
+    or an `error` event if the pipeline fails. A group whose TTS fails sends
+    an `audio_error` event in place of its `audio` event, and `done` then
+    carries no `audio_url`.
+    """
+    logger.info(f"Streaming summarization request: {request}")
+    if request.languages:
+        raise HTTPException(status_code=400, detail="Streaming supports one language; use /summarize for several.")
+    if request.file_path and not request.text and is_image_type(request.file_type):
+        events = await stream_image_summary_async(request.file_path, request.language, use_cache=request.use_cache)
+    else:
+        extracted_text = await extract_request_text(request)
+        if extracted_text.startswith("Error"):
+            raise HTTPException(status_code=422, detail=extracted_text)
+        events = await stream_summarization_async(extracted_text, request.language, use_cache=request.use_cache)
+    
+    async def event_stream():
+        audio = []
+        audio_failed = False
+        try:
+            async for event, data in events:
+                if event == "audio":
+                    audio.extend(data["audio"])
+                elif event == "audio_error":
+                    audio_failed = True
+                elif event == "done":
+                    # Point at the merged audio so the client can replay it without the chunks
+                    data = dict(data, audio_url=None if audio_failed else await publish_audio_url(audio))
+                yield sse_event(event, data)
+        except UpstreamBusy as e:
+            yield sse_event("error", {"detail": str(e), "upstream": e.upstream, "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Error while streaming summary: {str(e)}", exc_info=True)
+            yield sse_event("error", {"detail": f"Server error: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def extract_batch_item(item: BatchItem):
+    """Extraction stage of the batch pipeline"""
+    if item.file_path and not item.text and is_image_type(item.file_type):
+        with stage("extract"):
+            data = await run_blocking(read_image, item.file_path)
+        return "image", data, normalize_image_format(os.path.splitext(item.file_path)[1])
+    extracted_text = await extract_request_text(item)
+    if extracted_text.startswith("Error"):
+        raise ValueError(extracted_text)
+    return "text", extracted_text
+
+batch_pipeline = BatchPipeline(extract_batch_item)
+
+@app.post("/summarize/batch")
+async def summarize_batch(request: BatchRequest):
+    """
+    Summarize many items in one request.
+    
+    Responds with NDJSON: a first line carrying the job ID, then one line per
+    item as it finishes (with `status` "ok" or "error"). The job keeps running
+    if the client disconnects and can be polled at /summarize/batch/{job_id}.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Please provide at least one item.")
+    if any(item.languages for item in request.items):
+        raise HTTPException(status_code=400, detail="Batch items take a single language; use /summarize for several.")
+    job = await get_batch_jobs().create(len(request.items))
+    job.task = asyncio.create_task(batch_pipeline.run(job, request.items, request.language, request.use_cache))
+    logger.info(f"Started batch job {job.id} with {job.total} items")
+    
+    async def ndjson():
+        yield json.dumps({"job_id": job.id, "total": job.total}) + "\n"
+        async for result in job.follow():
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", headers={"X-Job-Id": job.id})
+
+@app.get("/summarize/batch/{job_id}")
+async def batch_status(job_id: str, offset: int = 0):
+    """Status of a batch job and its results from `offset` onwards"""
+    snapshot = await get_batch_jobs().snapshot(job_id, offset)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch job: {job_id}")
+    return snapshot
+
+async def extract_job_input(request, payload):
+    """Extraction stage of a job: its uploaded file, or the text, file path or URL it names"""
+    if payload is None:
+        return await extract_batch_item(SummarizationRequest(**request))
+    if request.get("image_format"):
+        return "image", payload, request["image_format"]
+    return "text", await extract_text_from_bytes(payload, request.get("file_type"))
+
+job_workers = JobWorkers(extract_job_input)
+
+async def job_response(job, inline_audio=False):
+    """Status of a job, with its summary and a link to its audio once it is done"""
+    response = {key: value for key, value in job.items() if key != "run_after"}
+    if job["status"] == "queued" and job["attempts"]:
+        response["retry_in"] = max(0.0, round(job["run_after"] - time.time(), 1))
+    if job["status"] == "done":
+        saved = await run_blocking(get_job_store().checkpoints, job["job_id"])
+        # Audio is republished from the checkpoint, so the link works long after the audio store expired it
+        response.update(await summary_response({"summary": saved["summary"]["summary"], "audio": saved["audio"]}, inline_audio))
+    return response
+
+async def submit_job(request, payload=None):
+    job_id = await run_blocking(get_job_store().submit, request, payload)
+    job_workers.notify()
+    logger.info(f"Queued job {job_id}")
+    return JSONResponse(status_code=202, content={
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events",
+    })
+
+@app.post("/jobs")
+async def create_job(request: SummarizationRequest):
+    """
+    Summarize in the background.
+    
+    Responds at once with 202 and a job ID. The job is kept in a SQLite queue
+    and survives client disconnects and server restarts; poll /jobs/{job_id}
+    or subscribe to /jobs/{job_id}/events for its result.
+    """
+    if request.languages:
+        raise HTTPException(status_code=400, detail="Jobs take a single language; use /summarize for several.")
+    if not (request.text or request.url or request.file_path):
+        raise HTTPException(status_code=400, detail="Please provide either direct text, a file path, or a URL.")
+    return await submit_job(request.model_dump(include={"text", "url", "file_path", "file_type", "language", "use_cache"}))
+
+@app.post("/jobs/upload")
+async def create_upload_job(
+    file: UploadFile = File(...),
+    file_type: Optional[str] = Form(None),
+    language: Optional[str] = Form("te"),
+    use_cache: bool = Form(True)
+):
+    """Summarize an uploaded file in the background; see /jobs"""
+    safe_filename = Path(file.filename).name
+    data = await read_upload(file)
+    file_type = file_type or detect_file_type(safe_filename)
+    image_format = normalize_image_format(os.path.splitext(safe_filename)[1] or file_type) if is_image_type(file_type) else None
+    return await submit_job({
+        "filename": safe_filename,
+        "file_type": file_type,
+        "image_format": image_format,
+        "language": language,
+        "use_cache": use_cache,
+    }, data)
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str, inline_audio: bool = False):
+    """
+    Status of a job: `queued`, `running`, `done` or `failed`, the stage it is
+    at, its checkpoints and, once done, its `summary` and `audio_url`
+    """
+    job = await run_blocking(get_job_store().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return await job_response(job, inline_audio)
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Follow a job as server-sent events: a `status` event whenever its status
+    or stage changes, then a final `done` or `failed` event with the result.
+    """
+    store = get_job_store()
+    if await run_blocking(store.get, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    
+    async def event_stream():
+        last = None
+        while True:
+            job = await run_blocking(store.get, job_id)
+            if job is None:
+                yield sse_event("error", {"detail": f"Job {job_id} expired"})
+                return
+            if job["status"] in ("done", "failed"):
+                yield sse_event(job["status"], await job_response(job))
+                return
+            progress = (job["status"], job["stage"], job["attempts"])
+            if progress != last:
+                last = progress
+                yield sse_event("status", await job_response(job))
+            await asyncio.sleep(JOB_EVENTS_INTERVAL)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str):
+    """Queue a failed job again; it resumes from the stage that failed"""
+    store = get_job_store()
+    if not await run_blocking(store.retry, job_id):
+        job = await run_blocking(store.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}, not failed")
+    job_workers.notify()
+    return await job_response(await run_blocking(store.get, job_id))
+
+@app.api_route("/audio/{audio_id}", methods=["GET", "HEAD"])
+async def audio(audio_id: str, request: Request):
+    """
+    Merged audio of a summary, as one binary file.
+    
+    Supports single byte ranges (206/416) so players can seek, and is
+    cacheable forever since the ID is derived from the audio content.
+    """
+    stored = await get_audio(audio_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired audio: {audio_id}")
+    data, media_type = stored
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{audio_id}"',
+        "Cache-Control": f"public, max-age={int(AUDIO_STORE_TTL)}, immutable",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), len(data))
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{len(data)}"})
+    if byte_range is None:
+        return Response(content=data, media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+    return Response(content=data[start:end + 1], status_code=206, media_type=media_type, headers=headers)
+
+@app.get("/metrics")
+async def metrics():
+    """Pipeline metrics in the Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and size of the summary cache"""
+    return get_summary_cache().stats_dict()
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    import uvicorn
+
+    # Worker processes to serve with; each has its own event loop, thread pool and PDF/OCR workers
+    workers = int(os.environ.get("WEB_WORKERS", 1))
+    # Seconds in-flight requests get to finish on shutdown before they are cancelled
+    graceful_timeout = float(os.environ.get("GRACEFUL_SHUTDOWN_TIMEOUT", 30))
+    if workers > 1 and STATE_BACKEND != "sqlite":
+        logger.warning("WEB_WORKERS > 1 with STATE_BACKEND=memory: caches, audio, deduplication, "
+                       "rate limits and batch jobs will not be shared between workers")
+    uvicorn.run(
+        # Several workers each import the app themselves, so they need it by name
+        "main:app" if workers > 1 else app,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", 8000)),
+        workers=workers,
+        timeout_graceful_shutdown=graceful_timeout,
+    )
\ No newline at end of file
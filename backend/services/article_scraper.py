@@ -1,22 +1,355 @@
-# File: backend/services/article_scraper.py
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+from dataclasses import dataclass
+
+from .clients import get_clients, run_sync
+from .executor import run_blocking
+from .lazy_imports import optional_module
+
+# Optional faster HTML parsers, tried in order; BeautifulSoup's html.parser is the fallback.
+# All parsers are imported on first use.
+SELECTOLAX_MODULE = "selectolax.lexbor"
+LXML_MODULE = "lxml.html"
+
+# Stop downloading an article page after this many bytes
+ARTICLE_MAX_BYTES = int(os.environ.get("ARTICLE_MAX_BYTES", 5 * 1024 * 1024))
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "footer", "header", "aside", "form", "iframe", "svg", "button"]
+
+# class tokens and ids of containers holding navigation, comments, ads and the like; matched whole
+BOILERPLATE_HINTS = {"comment", "comments", "comments-area", "footer", "sidebar", "share", "sharing", "share-buttons",
+                     "social", "social-share", "related", "related-posts", "promo", "advert", "advertisement", "ads",
+                     "cookie", "cookie-banner", "cookie-notice", "newsletter", "subscribe", "breadcrumb", "breadcrumbs",
+                     "menu", "masthead"}
+
+# Containers never removed as boilerplate, whatever their class or id
+PROTECTED_TAGS = {"html", "body", "main", "article"}
+
+# A container holding more than this share of the page's text is never removed as boilerplate
+MAX_BOILERPLATE_SHARE = 0.5
+
+BLOCK_TAGS = ["p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "pre"]
+
+# Paragraphs shorter than this, or with more than MAX_LINK_DENSITY of their text in links, are treated as boilerplate
+MIN_BLOCK_CHARS = 25
+MAX_LINK_DENSITY = 0.5
+
+# Share of a paragraph's length credited to its parent, grandparent and great-grandparent
+ANCESTOR_WEIGHTS = (1.0, 0.7, 0.4)
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-:.]+)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+@dataclass
+class Article:
+    """Structured result of article extraction."""
+    title: str
+    text: str
+    html_bytes: int
+    text_bytes: int
+    parser: str
+
+    def as_text(self) -> str:
+        """Title and body as one string, ready for summarization."""
+        return f"{self.title}\n\n{self.text}" if self.title else self.text
+
+class ArticleFetchError(Exception):
+    """An article could not be downloaded, or held no text to summarize."""
+
+@dataclass
+class _Block:
+    text: str
+    link_chars: int
+    ancestors: tuple  # Keys of the enclosing elements, nearest first
+    heading: bool
+
+def decode_html(body: bytes, content_type: str = None) -> str:
+    """
+    Decode an HTML response using the charset from the Content-Type header,
+    a <meta charset> declaration, or UTF-8 with a cp1252 fallback.
+    
+    :param body: Raw response bytes.
+    :param content_type: Value of the Content-Type header, if any.
+    :return: Decoded HTML.
+    """
+    candidates = []
+    if content_type and "charset=" in content_type.lower():
+        candidates.append(content_type.lower().split("charset=")[-1].split(";")[0].strip(" \"'"))
+    match = _META_CHARSET.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    candidates.append("utf-8")
+    for charset in candidates:
+        try:
+            return body.decode(charset)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return body.decode("cp1252", errors="replace")
+
+def _subtree_text_chars(nodes, key, own_chars, children):
+    """
+    Length of the text under every node, each string stripped, computed bottom-up in one pass.
+
+    :param nodes: Every node of the tree in document order, so each comes before its descendants.
+    :param key: Function returning the key a node is stored under.
+    :param own_chars: Function returning the length of a node's own text, outside its child elements.
+    :param children: Function returning a node's child nodes.
+    :return: Dict of node key to text length.
+    """
+    chars = {}
+    for node in reversed(nodes):
+        chars[key(node)] = own_chars(node) + sum(chars[key(child)] for child in children(node))
+    return chars
+
+def _is_boilerplate_container(tag, classes, element_id, text_chars, page_chars):
+    """
+    Whether an element is navigation, comments, ads or the like, judged by its class tokens and id.
+
+    The page's root, <main> and <article> elements, and any element holding
+    most of the page's text, are always kept.
+    """
+    if tag in PROTECTED_TAGS or text_chars > page_chars * MAX_BOILERPLATE_SHARE:
+        return False
+    names = {token.lower() for token in (classes or "").split()}
+    if element_id:
+        names.add(element_id.strip().lower())
+    return not BOILERPLATE_HINTS.isdisjoint(names)
+
+def _blocks_selectolax(html, strip_containers=True):
+    tree = optional_module(SELECTOLAX_MODULE).LexborHTMLParser(html)
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
+    tree.strip_tags(BOILERPLATE_TAGS)
+    if strip_containers and tree.root is not None:
+        chars = _subtree_text_chars(
+            list(tree.root.traverse(include_text=True)), lambda node: node.mem_id,
+            lambda node: len((node.text_content or "").strip()) if node.tag == "-text" else 0,
+            lambda node: node.iter(include_text=True),
+        )
+        page_chars = chars[tree.root.mem_id]
+        matches = [
+            node for node in tree.css("[class], [id]")
+            if _is_boilerplate_container(node.tag, node.attributes.get("class"), node.attributes.get("id"),
+                                         chars[node.mem_id], page_chars)
+        ]
+        # Only decompose the outermost matches; nested ones are freed along with their ancestor
+        matched_ids = {node.mem_id for node in matches}
+        for node in matches:
+            parent = node.parent
+            while parent is not None and parent.mem_id not in matched_ids:
+                parent = parent.parent
+            if parent is None:
+                node.decompose()
+    blocks = []
+    for node in tree.css(", ".join(BLOCK_TAGS)):
+        if node.tag != "p" and node.css_first("p") is not None:
+            continue  # Its paragraphs are collected on their own
+        links = sum(len(a.text(strip=True)) for a in node.css("a"))
+        ancestors = []
+        parent = node.parent
+        while parent is not None:
+            ancestors.append(parent.mem_id)
+            parent = parent.parent
+        blocks.append(_Block(node.text(separator=" "), links, tuple(ancestors), node.tag[0] == "h"))
+    return title, blocks
+
+def _blocks_lxml(html, strip_containers=True):
+    if not html.strip():
+        return "", []
+    lxml_html = optional_module(LXML_MODULE)
+    # Parse bytes so documents carrying an XML encoding declaration are accepted
+    doc = lxml_html.document_fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+    title_node = doc.find(".//title")
+    title = title_node.text_content().strip() if title_node is not None else ""
+    for element in list(doc.iter(*BOILERPLATE_TAGS)):
+        element.drop_tree()
+    if strip_containers:
+        # Comments and processing instructions have no text of their own, only a tail
+        chars = _subtree_text_chars(
+            list(doc.iter()), lambda element: element,
+            lambda element: (len((element.text or "").strip()) if isinstance(element.tag, str) else 0)
+                            + sum(len((child.tail or "").strip()) for child in element),
+            lambda element: element,
+        )
+        page_chars = chars[doc]
+        matches = [
+            element for element in doc.xpath("//*[@class or @id]")
+            if _is_boilerplate_container(element.tag, element.get("class"), element.get("id"),
+                                         chars[element], page_chars)
+        ]
+        for element in matches:
+            if element.getparent() is not None:
+                element.drop_tree()
+    blocks = []
+    for element in doc.iter(*BLOCK_TAGS):
+        if element.tag != "p" and element.find(".//p") is not None:
+            continue
+        links = sum(len(a.text_content().strip()) for a in element.iter("a"))
+        # The elements themselves are the keys; they stay alive, and so keep their identity, while blocks exist
+        blocks.append(_Block(element.text_content(), links, tuple(element.iterancestors()), element.tag[0] == "h"))
+    return title, blocks
+
+def _blocks_bs4(html, strip_containers=True):
+    from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    for element in soup.find_all(BOILERPLATE_TAGS):
+        element.decompose()
+    if strip_containers:
+        # Like get_text(), count plain strings and CDATA but not comments
+        chars = _subtree_text_chars(
+            [soup, *soup.descendants], id,
+            lambda node: len(node.strip()) if type(node) in (NavigableString, CData) else 0,
+            lambda node: node.children if isinstance(node, Tag) else (),
+        )
+        page_chars = chars[id(soup)]
+        matches = [
+            element for element in soup.find_all(lambda tag: tag.has_attr("class") or tag.has_attr("id"))
+            if _is_boilerplate_container(element.name, " ".join(element.get_attribute_list("class")), element.get("id"),
+                                         chars[id(element)], page_chars)
+        ]
+        for element in matches:
+            if not element.decomposed:
+                element.decompose()
+    blocks = []
+    for element in soup.find_all(BLOCK_TAGS):
+        if element.name != "p" and element.find("p") is not None:
+            continue
+        links = sum(len(a.get_text(strip=True)) for a in element.find_all("a"))
+        blocks.append(_Block(element.get_text(" "), links, tuple(id(parent) for parent in element.parents), element.name[0] == "h"))
+    return title, blocks
+
+def _select_main_text(blocks):
+    """
+    Keep the dense, low-link paragraphs under the highest-scoring container.
+    
+    Each qualifying paragraph's length is credited to its parent, grandparent
+    and great-grandparent (see ANCESTOR_WEIGHTS), so an article whose
+    paragraphs each sit in their own wrapper still scores as one container.
+    Every qualifying block inside the best container is kept, in document order.
+    """
+    kept = []
+    scores = {}
+    for block in blocks:
+        text = _WHITESPACE.sub(" ", block.text).strip()
+        if not text:
+            continue
+        link_density = block.link_chars / len(text)
+        if link_density > MAX_LINK_DENSITY or (not block.heading and len(text) < MIN_BLOCK_CHARS):
+            continue
+        kept.append((block.ancestors, text))
+        if not block.heading:
+            for ancestor, weight in zip(block.ancestors, ANCESTOR_WEIGHTS):
+                scores[ancestor] = scores.get(ancestor, 0) + weight * len(text)
+    if not scores:
+        return "\n".join(text for _, text in kept)
+    best = max(scores, key=scores.get)
+    return "\n".join(text for ancestors, text in kept if best in ancestors)
+
+def _all_text(blocks):
+    """Every non-empty block, unfiltered, like a plain <p> scrape."""
+    texts = (_WHITESPACE.sub(" ", block.text).strip() for block in blocks)
+    return "\n".join(text for text in texts if text)
+
+def available_engines():
+    """Names of the usable HTML parsing engines, fastest first."""
+    engines = []
+    if optional_module(SELECTOLAX_MODULE) is not None:
+        engines.append("selectolax")
+    if optional_module(LXML_MODULE) is not None:
+        engines.append("lxml")
+    engines.append("html.parser")
+    return engines
+
+_ENGINES = {"selectolax": _blocks_selectolax, "lxml": _blocks_lxml, "html.parser": _blocks_bs4}
+
+def extract_article(html, content_type: str = None, engine: str = None) -> Article:
+    """
+    Extract the title and main text of an article, dropping navigation,
+    footers, comments and link-heavy blocks.
+    
+    :param html: Raw HTML as bytes or str.
+    :param content_type: Content-Type header used to pick the charset for bytes input.
+    :param engine: Parsing engine to use (see available_engines); defaults to the fastest installed.
+    :return: Article with title, text and byte counts.
+    """
+    html_bytes = len(html) if isinstance(html, bytes) else len(html.encode("utf-8"))
+    if isinstance(html, bytes):
+        html = decode_html(html, content_type)
+    parser = engine or available_engines()[0]
+    title, blocks = _ENGINES[parser](html)
+    text = _select_main_text(blocks)
+    if not text:
+        # Nothing looked like an article; fall back to all of the page's paragraphs
+        text = _all_text(_ENGINES[parser](html, strip_containers=False)[1])
+    return Article(
+        title=_WHITESPACE.sub(" ", title).strip(),
+        text=text,
+        html_bytes=html_bytes,
+        text_bytes=len(text.encode("utf-8")),
+        parser=parser,
+    )
+
+def parse_article_html(html: str) -> str:
+    """
+    Extract the main text from an article's HTML.
+    
+    :param html: Raw HTML of the article page.
+    :return: Extracted article text.
+    """
+    return extract_article(html).as_text()
+
+async def fetch_article_async(url: str) -> Article:
+    """
+    Download an article page (up to ARTICLE_MAX_BYTES) and extract it.
+    
+    The download runs on the event loop and the HTML parsing runs on the
+    shared blocking executor.
+    
+    :param url: URL of the article.
+    :return: Extracted Article.
+    :raises ArticleFetchError: If the page cannot be fetched.
+    """
+    body = bytearray()
+    async with get_clients().http.stream("GET", url) as response:
+        if response.status_code != 200:
+            raise ArticleFetchError(f"Error fetching the article: {response.status_code}")
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) >= ARTICLE_MAX_BYTES:
+                break
+        content_type = response.headers.get("Content-Type")
+    return await run_blocking(extract_article, bytes(body[:ARTICLE_MAX_BYTES]), content_type)
 
 def extract_text_from_url(url: str) -> str:
     """
     Fetch the content of a web article and extract the main text.
     
+    Runs extract_text_from_url_async on a new event loop, so it cannot be
+    called from a running one.
+    
     :param url: URL of the article.
-    :return: Extracted article text or an error message.
+    :return: Extracted article text.
+    :raises ArticleFetchError: If the page cannot be fetched or parsed, or holds no article text.
+    """
+    return run_sync(extract_text_from_url_async(url))
+
+async def extract_text_from_url_async(url: str) -> str:
+    """
+    Async variant of extract_text_from_url.
+    
+    :param url: URL of the article.
+    :return: Extracted article text.
+    :raises ArticleFetchError: If the page cannot be fetched or parsed, or holds no article text.
     """
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
-            return f"Error fetching the article: {response.status_code}"
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # Extract text from all <p> tags as a simple heuristic
-        paragraphs = soup.find_all('p')
-        article_text = "\n".join([p.get_text() for p in paragraphs])
-        return article_text
+        article = await fetch_article_async(url)
+    except ArticleFetchError:
+        raise
     except Exception as e:
-        return f"Error extracting text from URL: {e}"
+        raise ArticleFetchError(f"Error extracting text from URL: {e}") from e
+    if not article.text:
+        raise ArticleFetchError("Error: no article text found at the URL")
+    return article.as_text()
@@ -0,0 +1,233 @@
+# File: backend/services/audio.py
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import shutil
+import struct
+import subprocess
+
+from .cache import CACHE_TTL, MemoryCache
+from .executor import run_blocking
+from .metrics import stage
+from .shared_state import get_shared_state
+
+logger = logging.getLogger(__name__)
+
+# Delivery format of merged audio: "wav", or "mp3"/"opus" when ffmpeg is available
+AUDIO_FORMAT = os.environ.get("AUDIO_FORMAT", "wav").lower()
+
+# Target bitrate for compressed formats
+AUDIO_BITRATE = os.environ.get("AUDIO_BITRATE", "48k")
+
+# In-memory budget for merged audio served at /audio/<id>, in bytes
+AUDIO_STORE_MAX_BYTES = int(os.environ.get("AUDIO_STORE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Seconds merged audio stays available; by default as long as the cached summary it
+# belongs to, so a link handed out with a cached result keeps working
+AUDIO_STORE_TTL = float(os.environ.get("AUDIO_STORE_TTL", CACHE_TTL))
+
+MEDIA_TYPES = {"wav": "audio/wav", "mp3": "audio/mpeg", "opus": "audio/ogg"}
+
+FFMPEG_ARGS = {
+    "mp3": ["-c:a", "libmp3lame", "-f", "mp3"],
+    "opus": ["-c:a", "libopus", "-f", "ogg"],
+}
+
+def _read_wav(data):
+    """
+    Split a WAV file into its format chunk and PCM data.
+
+    :param data: Bytes of a RIFF/WAVE file.
+    :return: Tuple of (fmt chunk body, data chunk body).
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+    fmt = pcm = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, offset)
+        body = data[offset + 8:offset + 8 + size]
+        if chunk_id == b"fmt ":
+            fmt = body
+        elif chunk_id == b"data":
+            pcm = body
+        # Chunks are word aligned
+        offset += 8 + size + (size & 1)
+    if fmt is None or pcm is None:
+        raise ValueError("WAV file is missing its fmt or data chunk")
+    return fmt, pcm
+
+def merge_wav_chunks(chunks):
+    """
+    Concatenate WAV files into one, keeping a single header.
+
+    :param chunks: List of WAV file bytes, all in the same sample format.
+    :return: Bytes of the merged WAV file.
+    """
+    fmt = None
+    pcm_parts = []
+    for chunk in chunks:
+        chunk_fmt, pcm = _read_wav(chunk)
+        if fmt is None:
+            fmt = chunk_fmt
+        elif chunk_fmt != fmt:
+            raise ValueError("Cannot merge WAV chunks with different sample formats")
+        pcm_parts.append(pcm)
+    if fmt is None:
+        raise ValueError("No audio chunks to merge")
+    pcm = b"".join(pcm_parts)
+    fmt_chunk = struct.pack("<4sI", b"fmt ", len(fmt)) + fmt + (b"\0" if len(fmt) & 1 else b"")
+    data_chunk = struct.pack("<4sI", b"data", len(pcm)) + pcm + (b"\0" if len(pcm) & 1 else b"")
+    body = b"WAVE" + fmt_chunk + data_chunk
+    return struct.pack("<4sI", b"RIFF", len(body)) + body
+
+def encode_audio(wav, audio_format=AUDIO_FORMAT):
+    """
+    Re-encode a WAV file with ffmpeg.
+
+    Falls back to the WAV itself when the format is "wav", unknown, or ffmpeg is not installed.
+
+    :param wav: Bytes of a WAV file.
+    :param audio_format: Target format ("wav", "mp3" or "opus").
+    :return: Tuple of (audio bytes, media type).
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if audio_format not in FFMPEG_ARGS or ffmpeg is None:
+        if audio_format != "wav":
+            logger.warning(f"Cannot encode audio as {audio_format!r}; serving WAV instead")
+        return wav, MEDIA_TYPES["wav"]
+    completed = subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+         *FFMPEG_ARGS[audio_format], "-b:a", AUDIO_BITRATE, "pipe:1"],
+        input=wav, capture_output=True, check=True,
+    )
+    return completed.stdout, MEDIA_TYPES[audio_format]
+
+def render_audio(chunks_b64, audio_format=AUDIO_FORMAT):
+    """
+    Decode base64 TTS chunks into one audio file (blocking; run on the executor).
+
+    :param chunks_b64: List of base64-encoded WAV chunks, in playback order.
+    :param audio_format: Target format ("wav", "mp3" or "opus").
+    :return: Tuple of (audio bytes, media type).
+    """
+    wav = merge_wav_chunks([base64.b64decode(chunk) for chunk in chunks_b64])
+    return encode_audio(wav, audio_format)
+
+def audio_id(chunks_b64, audio_format=AUDIO_FORMAT):
+    """Content-addressed identifier of the audio rendered from chunks_b64."""
+    digest = hashlib.sha256(audio_format.encode("ascii"))
+    for chunk in chunks_b64:
+        digest.update(chunk.encode("ascii"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+class SharedAudioStore:
+    """
+    Merged audio kept in the shared state backend, so any worker can serve what another published.
+
+    :param state: Shared state backend.
+    :param ttl: Seconds audio stays available.
+    """
+
+    def __init__(self, state, ttl=AUDIO_STORE_TTL):
+        self.state = state
+        self.ttl = ttl
+
+    def get(self, key):
+        stored = self.state.get("audio", key)
+        if stored is None:
+            return None
+        media_type, _, data = stored.partition(b"\n")
+        return data, media_type.decode("ascii")
+
+    def set(self, key, value, size=None):
+        data, media_type = value
+        self.state.set("audio", key, media_type.encode("ascii") + b"\n" + data, ttl=self.ttl)
+
+_audio_store = None
+
+def get_audio_store():
+    """Return the store of merged audio: in memory, or shared when worker processes share state."""
+    global _audio_store
+    if _audio_store is None:
+        state = get_shared_state()
+        if state.shared:
+            _audio_store = SharedAudioStore(state)
+        else:
+            _audio_store = MemoryCache(max_bytes=AUDIO_STORE_MAX_BYTES, ttl=AUDIO_STORE_TTL)
+    return _audio_store
+
+def _store_audio(store, chunks_b64):
+    """Hash the chunks and, unless the store already has their audio, merge and store it (blocking)."""
+    key = audio_id(chunks_b64)
+    if store.get(key) is None:
+        with stage("audio_merge"):
+            data, media_type = render_audio(chunks_b64)
+        store.set(key, (data, media_type), size=len(data))
+    return key
+
+async def publish_audio(chunks_b64):
+    """
+    Merge TTS chunks into one file and keep it in the audio store.
+
+    :param chunks_b64: List of base64-encoded WAV chunks, in playback order.
+    :return: Identifier to fetch the audio with get_audio, or None if there is no audio
+        or it cannot be merged (e.g. the chunks are not WAV).
+    """
+    if not chunks_b64:
+        return None
+    try:
+        # Hashing megabytes of base64 blocks as much as merging it, so both run on the executor
+        return await run_blocking(_store_audio, get_audio_store(), chunks_b64)
+    except (ValueError, binascii.Error, OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not merge {len(chunks_b64)} audio chunks: {e}")
+        return None
+
+async def publish_audio_url(chunks_b64):
+    """Publish TTS chunks with publish_audio and return the path they are served at, or None."""
+    key = await publish_audio(chunks_b64)
+    return f"/audio/{key}" if key else None
+
+async def get_audio(key):
+    """
+    Look up merged audio.
+
+    :param key: Identifier returned by publish_audio.
+    :return: Tuple of (audio bytes, media type), or None if unknown or expired.
+    """
+    return await get_shared_state().run(get_audio_store().get, key)
+
+def parse_byte_range(header, size):
+    """
+    Parse a single-range HTTP Range header.
+
+    :param header: Value of the Range header, or None.
+    :param size: Size of the resource in bytes.
+    :return: Inclusive (start, end) tuple, or None to serve the whole resource.
+    :raises ValueError: If the range is valid but cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        # Missing, other units, or multiple ranges: ignore the header and send everything
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                # Invalid rather than unsatisfiable, so it is ignored too (RFC 7233 sections 2.1 and 3.1)
+                return None
+        else:
+            # Suffix range: the last N bytes
+            length = int(last)
+            # An empty suffix selects nothing and is unsatisfiable
+            start, end = (max(size - length, 0) if length else size), size - 1
+    except ValueError:
+        # Malformed ranges are ignored, as if no Range header had been sent
+        return None
+    if start >= size:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, min(end, size - 1)
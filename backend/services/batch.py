@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+from .audio import publish_audio_url
+from .rate_limit import set_deadline
+from .shared_state import get_shared_state
+from .summarizer import (
+    cache_lookup_async, cache_store_async, generate_audio_async, summarize_image_async, summarize_text_async,
+)
+
+logger = logging.getLogger(__name__)
+
+# Items allowed in each stage at the same time. Extraction is mostly network and
+# CPU bound, the model stage is bound by the upstream quota, and TTS by Sarvam's.
+BATCH_EXTRACT_CONCURRENCY = int(os.environ.get("BATCH_EXTRACT_CONCURRENCY", 8))
+BATCH_LLM_CONCURRENCY = int(os.environ.get("BATCH_LLM_CONCURRENCY", 4))
+BATCH_TTS_CONCURRENCY = int(os.environ.get("BATCH_TTS_CONCURRENCY", 4))
+
+# Seconds a finished batch job's results stay available for polling
+BATCH_JOB_TTL = float(os.environ.get("BATCH_JOB_TTL", 3600))
+
+class BatchJob:
+    """
+    Progress and results of one batch, shared by the streaming response and pollers.
+    
+    :param total: Number of items in the batch.
+    :param state: Shared state backend to publish progress to, so other workers can answer polls.
+    """
+
+    def __init__(self, total, state=None):
+        self.id = uuid.uuid4().hex
+        self.total = total
+        self.results = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self.task = None
+        self._changed = asyncio.Condition()
+        self._state = state if state is not None and state.shared else None
+
+    @property
+    def status(self):
+        return "done" if self.finished_at is not None else "running"
+
+    async def add_result(self, result):
+        async with self._changed:
+            self.results.append(result)
+            await self._publish(result)
+            self._changed.notify_all()
+
+    async def finish(self):
+        async with self._changed:
+            self.finished_at = time.time()
+            await self._publish()
+            self._changed.notify_all()
+
+    async def follow(self):
+        """Yield results in completion order as they arrive, until the job finishes."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.results) > sent or self.finished_at is not None)
+                new_results = self.results[sent:]
+                finished = self.finished_at is not None
+            for result in new_results:
+                yield result
+            sent += len(new_results)
+            if finished and sent == len(self.results):
+                return
+
+    async def _publish(self, result=None):
+        """Publish the job's status and, if given, its latest result to shared state."""
+        if self._state is not None:
+            await self._state.run(self._write, result, self._header())
+
+    def _write(self, result, header):
+        # Each result is written once under its own key; the status written after it
+        # says how many there are, so a reader never looks for one not yet written
+        if result is not None:
+            self._state.set("batch_result", f"{self.id}:{header['completed'] - 1}", result, ttl=BATCH_JOB_TTL)
+        self._state.set("batch_job", self.id, header, ttl=BATCH_JOB_TTL)
+
+    def _header(self):
+        return {"job_id": self.id, "status": self.status, "total": self.total, "completed": len(self.results)}
+
+    def snapshot(self, offset=0):
+        """Job status with the results from offset onwards, for polling."""
+        return dict(self._header(), results=self.results[offset:])
+
+class BatchJobStore:
+    """
+    Registry of the batch jobs running in this process; finished jobs expire after BATCH_JOB_TTL seconds.
+    
+    With a shared state backend, jobs also publish their progress there, so
+    any worker can report on a job another worker runs.
+    """
+
+    def __init__(self, ttl=BATCH_JOB_TTL, state=None):
+        self.ttl = ttl
+        self.state = state
+        self._jobs = {}
+
+    async def create(self, total):
+        job = BatchJob(total, self.state)
+        self._jobs[job.id] = job
+        await job._publish()
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    async def snapshot(self, job_id, offset=0):
+        """Status of a job run by this or, with shared state, any worker; None if unknown."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.snapshot(offset)
+        if self.state is None or not self.state.shared:
+            return None
+        return await self.state.run(self._published, job_id, offset)
+
+    def _published(self, job_id, offset):
+        """Snapshot of a job another worker runs, read from shared state."""
+        published = self.state.get("batch_job", job_id)
+        if published is None:
+            return None
+        results = (self.state.get("batch_result", f"{job_id}:{n}") for n in range(offset, published["completed"]))
+        published["results"] = [result for result in results if result is not None]
+        return published
+
+    def purge_expired(self):
+        """Forget jobs finished more than ttl seconds ago and return how many."""
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in list(self._jobs.items()) if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+        return len(expired)
+
+class BatchPipeline:
+    """
+    Runs extraction, the model call and TTS for many items, each stage with its own concurrency limit.
+    
+    :param extract: Async callable taking an item and returning ("text", text) or ("image", bytes, format).
+    """
+
+    def __init__(self, extract, extract_concurrency=BATCH_EXTRACT_CONCURRENCY,
+                 llm_concurrency=BATCH_LLM_CONCURRENCY, tts_concurrency=BATCH_TTS_CONCURRENCY):
+        self.extract = extract
+        self.extract_slots = asyncio.Semaphore(extract_concurrency)
+        self.llm_slots = asyncio.Semaphore(llm_concurrency)
+        self.tts_slots = asyncio.Semaphore(tts_concurrency)
+
+    async def process(self, index, item, language, use_cache):
+        """Run one item through every stage and return its result or error record."""
+        result = {"index": index, "id": getattr(item, "id", None)}
+        try:
+            async with self.extract_slots:
+                extracted = await self.extract(item)
+            kind, content = extracted[0], extracted[1]
+            
+            key, cached = await cache_lookup_async(content, language, kind, use_cache)
+            if cached is not None:
+                return dict(result, status="ok", summary=cached["summary"],
+                            audio_url=await publish_audio_url(cached["audio"]), cached=True)
+            
+            async with self.llm_slots:
+                if kind == "image":
+                    summary = await summarize_image_async(content, extracted[2], language)
+                else:
+                    summary, _ = await summarize_text_async(content, language)
+            async with self.tts_slots:
+                audio = await generate_audio_async(summary, language)
+            await cache_store_async(key, {"summary": summary, "audio": audio})
+            return dict(result, status="ok", summary=summary, audio_url=await publish_audio_url(audio), cached=False)
+        except Exception as e:
+            logger.error(f"Batch item {index} failed: {e}")
+            return dict(result, status="error", error=str(e))
+
+    async def run(self, job, items, language="te", use_cache=True):
+        """Process every item concurrently, recording results on the job as they finish."""
+        # Batch jobs outlive the request that started them, so they wait for upstream capacity without a deadline
+        set_deadline(None)
+        
+        async def run_item(index, item):
+            item_language = getattr(item, "language", None) or language
+            await job.add_result(await self.process(index, item, item_language, use_cache))
+        
+        try:
+            await asyncio.gather(*(run_item(index, item) for index, item in enumerate(items)))
+        finally:
+            await job.finish()
+
+_job_store = None
+
+def get_batch_jobs() -> BatchJobStore:
+    """Return the process-wide batch job store."""
+    global _job_store
+    if _job_store is None:
+        _job_store = BatchJobStore(state=get_shared_state())
+    return _job_store
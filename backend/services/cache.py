@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .shared_state import STATE_DB_PATH, get_shared_state
+
+# In-memory budget for cached results, in bytes of serialized JSON
+CACHE_MAX_BYTES = int(os.environ.get("SUMMARY_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Seconds a cached result stays valid
+CACHE_TTL = float(os.environ.get("SUMMARY_CACHE_TTL", 24 * 60 * 60))
+
+# Optional SQLite file for a second, persistent cache tier
+CACHE_DB_PATH = os.environ.get("SUMMARY_CACHE_DB")
+
+# Most rows kept in the SQLite tier; the oldest are evicted beyond it (0 for no cap)
+CACHE_DB_MAX_ROWS = int(os.environ.get("SUMMARY_CACHE_DB_MAX_ROWS", 50000))
+
+def make_cache_key(content, language, model, prompt_version, kind="text"):
+    """
+    Build a content-addressed cache key.
+    
+    :param content: Extracted text (str) or raw image bytes.
+    :param language: Language code of the summary.
+    :param model: Model name used for the summary.
+    :param prompt_version: Version of the prompt the summary was produced with.
+    :param kind: Kind of input ("text", "image", ...), so equal bytes of different kinds never collide.
+    :return: Hex digest identifying the result.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()
+    return hashlib.sha256(f"{kind}|{digest}|{language}|{model}|{prompt_version}".encode("utf-8")).hexdigest()
+
+class CacheStats:
+    """Thread-safe hit/miss counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def evicted(self, count=1):
+        with self._lock:
+            self.evictions += count
+
+    def as_dict(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+class MemoryCache:
+    """
+    In-process LRU cache bounded by the total size of its serialized values.
+    
+    :param max_bytes: Byte budget; least recently used entries are evicted beyond it.
+    :param ttl: Seconds an entry stays valid.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self.stats.record(entry is not None)
+        return entry[2] if entry is not None else None
+
+    def set(self, key, value, size=None, expires_at=None):
+        """
+        Store a value, evicting least recently used entries beyond the byte budget.
+        
+        :param size: Serialized size of the value; computed when omitted.
+        :param expires_at: Expiry time (epoch seconds); defaults to ttl seconds from now.
+        """
+        if size is None:
+            size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return  # Never let a single entry flush the whole cache
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at if expires_at is not None else time.time() + self.ttl, size, value)
+            self._size += size
+            evicted = 0
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+        if evicted:
+            self.stats.evicted(evicted)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+class SQLiteCache:
+    """
+    Persistent cache tier stored in a SQLite file.
+    
+    Expired rows and rows beyond max_rows are only removed by purge(), which
+    the application runs at startup and every PURGE_INTERVAL seconds.
+    
+    :param path: Path of the database file.
+    :param ttl: Seconds an entry stays valid.
+    :param max_rows: Most rows kept by purge(), oldest evicted first; 0 for no cap.
+    """
+
+    def __init__(self, path, ttl=CACHE_TTL, max_rows=CACHE_DB_MAX_ROWS):
+        self.path = path
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key):
+        """Return (value, expires_at) for a live row, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        self.stats.record(row is not None)
+        return (json.loads(row[0]), row[1]) if row is not None else None
+
+    def set(self, key, value, size=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl, json.dumps(value)),
+            )
+
+    def purge(self):
+        """Delete expired rows, then the oldest rows beyond max_rows, and return how many were removed."""
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),)).rowcount
+            if self.max_rows:
+                # Every row has the same TTL, so the earliest to expire are the oldest written
+                removed += self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                ).rowcount
+        self.stats.evicted(removed)
+        return removed
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+class TieredCache:
+    """
+    Memory cache in front of an optional persistent tier.
+    
+    Hits in the persistent tier are promoted to memory, keeping the expiry
+    of the row they came from.
+    """
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                value, expires_at = entry
+                self.memory.set(key, value, expires_at=expires_at)
+        self.stats.record(value is not None)
+        return value
+
+    def set(self, key, value):
+        size = len(json.dumps(value))
+        self.memory.set(key, value, size=size)
+        if self.disk is not None:
+            self.disk.set(key, value, size=size)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def purge(self):
+        """Sweep the persistent tier (the memory tier bounds itself) and return the rows removed."""
+        return self.disk.purge() if self.disk is not None else 0
+
+    def stats_dict(self):
+        stats = self.stats.as_dict()
+        stats["memory"] = dict(self.memory.stats.as_dict(), size_bytes=self.memory.size_bytes)
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats.as_dict()
+        return stats
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+def get_summary_cache():
+    """
+    Return the process-wide summary cache, configured from the environment.
+    
+    :return: A TieredCache with a memory tier and, if SUMMARY_CACHE_DB is set or worker
+        processes share state, a SQLite tier (in the shared state file by default).
+    """
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            db_path = CACHE_DB_PATH or (STATE_DB_PATH if get_shared_state().shared else None)
+            disk = SQLiteCache(db_path) if db_path else None
+            _summary_cache = TieredCache(MemoryCache(), disk)
+    return _summary_cache
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from .config import get_settings
+
+# The client libraries are slow to import, so they are loaded when the first client is created
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+async def _close_stale(http, openai):
+    # Closing the OpenAI client also closes the httpx client it was given
+    for client in (openai, http):
+        if client is None:
+            continue
+        try:
+            await (client.close() if client is openai else client.aclose())
+        except Exception as e:
+            logger.debug(f"Closing a client from a previous event loop failed: {e}")
+
+class ClientRegistry:
+    """
+    Application-lifetime HTTP and OpenAI clients with keep-alive connection pools.
+    
+    Clients are created on first use, so the registry also works outside the
+    FastAPI app (scripts, benchmarks). Async clients are bound to the event
+    loop they were created on and are recreated if a different loop asks for
+    them; the replaced clients are closed in the background.
+    
+    :param settings: Settings providing credentials, pool size, timeouts and HTTP/2 preference.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings or get_settings()
+        self._loop = None
+        self._http = None
+        self._openai = None
+        self._openai_http = None
+        self._closing = set()
+
+    def _httpx_options(self):
+        import httpx
+
+        pool_size = self.settings.http_pool_size
+        return dict(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(self.settings.read_timeout, connect=self.settings.connect_timeout),
+            http2=self.settings.http2,
+        )
+
+    def _token(self):
+        if not self.settings.github_token:
+            raise ValueError("GITHUB_TOKEN environment variable not set.")
+        return self.settings.github_token
+
+    def _ensure_async(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            import httpx
+
+            if self._http is not None or self._openai is not None:
+                self._schedule_close(loop, _close_stale(self._http, self._openai))
+            self._loop = loop
+            self._http = httpx.AsyncClient(follow_redirects=True, **self._httpx_options())
+            self._openai = self._openai_http = None
+
+    def _schedule_close(self, loop, closing):
+        old_loop = self._loop
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # Still serving another thread: its connections must be closed on that loop
+            asyncio.run_coroutine_threadsafe(closing, old_loop)
+        else:
+            task = loop.create_task(closing)
+            self._closing.add(task)  # Keeps the task referenced until it finishes
+            task.add_done_callback(self._closing.discard)
+
+    @property
+    def http(self) -> "httpx.AsyncClient":
+        """Shared async HTTP client (scraping, Sarvam TTS)."""
+        self._ensure_async()
+        return self._http
+
+    @property
+    def openai(self) -> "AsyncOpenAI":
+        """Shared async OpenAI client for the model endpoint."""
+        self._ensure_async()
+        if self._openai is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            self._openai_http = httpx.AsyncClient(**self._httpx_options())
+            self._openai = AsyncOpenAI(
+                base_url=self.settings.model_endpoint,
+                api_key=self._token(),
+                max_retries=0,  # Retried by services.rate_limit, which shares Retry-After pauses across callers
+                http_client=self._openai_http,
+            )
+        return self._openai
+
+    async def start(self):
+        """Open the async connection pools up front (called at application startup)."""
+        self._ensure_async()
+
+    async def preconnect(self):
+        """
+        Open a keep-alive connection to the model endpoint and the TTS host.
+        
+        The first real call then skips DNS, TCP and TLS setup. Any response
+        (even an error status) leaves the connection in the pool; failures
+        are returned rather than raised.
+        
+        :return: Dict of URL to None on success or the exception raised.
+        """
+        targets = {self.settings.sarvam_tts_url: self.http}
+        if self.settings.github_token:
+            self.openai  # Creates the client and its pool
+            targets[self.settings.model_endpoint] = self._openai_http
+        results = await asyncio.gather(*(client.head(url) for url, client in targets.items()), return_exceptions=True)
+        return {url: result if isinstance(result, Exception) else None for url, result in zip(targets, results)}
+
+    async def close(self):
+        """Close every client that was created."""
+        if self._openai is not None:
+            await self._openai.close()
+        if self._http is not None:
+            await self._http.aclose()
+        self._loop = self._http = self._openai = self._openai_http = None
+
+    async def close_for_loop(self):
+        """Close the clients if they belong to the running event loop."""
+        if self._loop is asyncio.get_running_loop():
+            await self.close()
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_clients() -> ClientRegistry:
+    """Return the process-wide client registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
+
+async def close_clients():
+    """Close the process-wide clients (called at application shutdown)."""
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry is not None:
+        await registry.close()
+
+def run_sync(coroutine):
+    """
+    Run a coroutine on a new event loop for a synchronous caller.
+    
+    The clients bound to that loop are closed before it ends, so no
+    connections are left open on a loop that no longer exists.
+    
+    :param coroutine: Coroutine to run.
+    :return: The coroutine's result.
+    """
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await get_clients().close_for_loop()
+
+    return asyncio.run(main())
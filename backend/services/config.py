@@ -0,0 +1,52 @@
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+@dataclass(frozen=True)
+class Settings:
+    """Configuration shared by the services, read from the environment once per process."""
+    github_token: Optional[str]
+    sarvam_api_key: Optional[str]
+    model_endpoint: str
+    sarvam_tts_url: str
+    http_pool_size: int
+    connect_timeout: float
+    read_timeout: float
+    http2: bool
+
+def _env_flag(name, default):
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
+
+def load_settings() -> Settings:
+    """
+    Load the .env file in the backend directory and build Settings from the environment.
+    
+    :return: A fresh Settings instance.
+    """
+    load_dotenv(dotenv_path=os.path.join(BACKEND_DIR, '.env'))
+    # h2 comes with httpx[http2]; a bare httpx install falls back to HTTP/1.1
+    http2_available = importlib.util.find_spec("h2") is not None
+    return Settings(
+        github_token=os.environ.get("GITHUB_TOKEN"),
+        sarvam_api_key=os.environ.get("api-subscription-key"),
+        model_endpoint=os.environ.get("MODEL_ENDPOINT", "https://models.inference.ai.azure.com"),
+        sarvam_tts_url=os.environ.get("SARVAM_TTS_URL", "https://api.sarvam.ai/text-to-speech"),
+        http_pool_size=int(os.environ.get("HTTP_POOL_SIZE", 20)),
+        connect_timeout=float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5.0)),
+        read_timeout=float(os.environ.get("HTTP_READ_TIMEOUT", 60.0)),
+        http2=_env_flag("HTTP2", "true") and http2_available,
+    )
+
+_settings = None
+
+def get_settings() -> Settings:
+    """Return the process-wide Settings, loading them on first use."""
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
@@ -0,0 +1,96 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on threads used for blocking work (PDF parsing, HTML parsing,
+# file I/O). Keeping it bounded stops a burst of uploads from spawning an
+# unbounded number of threads while the event loop keeps serving requests.
+MAX_BLOCKING_WORKERS = int(os.environ.get("BLOCKING_EXECUTOR_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+
+_executor = None
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared executor used for blocking work, creating it on first use.
+    
+    :return: The process-wide ThreadPoolExecutor.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_BLOCKING_WORKERS, thread_name_prefix="blocking")
+    return _executor
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function on the shared executor without stalling the event loop.
+    
+    :param func: The blocking callable.
+    :return: Whatever the callable returns.
+    """
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context (e.g. per-request timings) into the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+async def purge_periodically(name, purge, interval):
+    """
+    Run a blocking purge of expired entries on the executor now and every interval seconds, until cancelled.
+
+    A failed run is logged and does not stop later ones.
+
+    :param name: What is purged, for the log.
+    :param purge: Callable removing expired entries and returning how many it removed.
+    :param interval: Seconds between runs.
+    """
+    while True:
+        try:
+            removed = await run_blocking(purge)
+            if removed:
+                logger.info(f"Purged {removed} expired {name}")
+        except Exception as e:
+            logger.warning(f"Purging expired {name} failed: {e}")
+        await asyncio.sleep(interval)
+
+def shutdown_executor():
+    """Shut down the shared executor, waiting for running jobs to finish."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+class ProcessPool:
+    """
+    Worker processes for CPU-bound work, started on first use.
+
+    Workers are started with spawn, because forking a process that runs an
+    event loop and thread pools is not safe.
+
+    :param max_workers: Number of worker processes.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProcessPoolExecutor:
+        """Return the pool, starting it if needed."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self):
+        """Shut the workers down, if any were started, cancelling queued work."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,389 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from .executor import run_blocking
+from .metrics import Counter, register, stage
+from .rate_limit import UpstreamBusy, backoff_delay, set_deadline
+from .shared_state import SQLiteDatabase
+from .summarizer import (
+    cache_lookup_async, cache_store_async, clean_text_for_tts, summarize_image_async, summarize_text_async,
+)
+from .tts_service import text_to_speech_telugu_async
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding queued jobs and their checkpoints; point it at durable storage in production
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", os.path.join(tempfile.gettempdir(), "summarizer-jobs.sqlite3"))
+
+# Jobs each server process runs at the same time; 0 only accepts jobs and leaves them to other processes
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+
+# Attempts per stage before a job fails, and the base of the exponential backoff between them
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_BACKOFF = float(os.environ.get("JOB_RETRY_BACKOFF", 2.0))
+
+# Seconds a worker owns a job between heartbeats; a job whose worker died is taken over after this
+JOB_LEASE = float(os.environ.get("JOB_LEASE", 60))
+
+# Seconds idle workers wait before looking for jobs queued by other processes or due for a retry
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 1.0))
+
+# Seconds finished and failed jobs are kept
+JOB_TTL = float(os.environ.get("JOB_TTL", 7 * 24 * 60 * 60))
+
+# Stages in the order they run; each one's output is checkpointed before the next starts
+STAGES = ("extract", "summary", "audio")
+
+JOB_STAGES = register(Counter(
+    "job_stage_runs_total", "Job stages run, by stage and outcome (ok, error)", labels=("stage", "outcome")
+))
+
+class JobStore(SQLiteDatabase):
+    """
+    Jobs and their stage checkpoints in a SQLite file.
+
+    A job is queued, running (leased by one worker), done or failed. Every
+    finished stage's output is saved as a checkpoint, so a retried job skips
+    the stages it has already completed. Any process that opens the file can
+    submit, run and report on jobs; leases keep each job on one worker.
+    Methods block; async callers run them on the executor.
+
+    :param path: Path of the database file.
+    """
+
+    def __init__(self, path):
+        super().__init__(path, schema=[
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, request TEXT NOT NULL, "
+            "payload BLOB, stage TEXT, attempts INTEGER NOT NULL DEFAULT 0, error TEXT, created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL, run_after REAL NOT NULL, owner TEXT, lease_expires REAL)",
+            "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after)",
+            "CREATE TABLE IF NOT EXISTS checkpoints (job_id TEXT, stage TEXT, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, PRIMARY KEY (job_id, stage))",
+        ])
+
+    def submit(self, request, payload=None):
+        """
+        Queue a job.
+
+        :param request: JSON-serializable description of the input (text, url, file_type, language...).
+        :param payload: Uploaded file bytes, if any.
+        :return: The job ID.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, request, payload, stage, created_at, updated_at, run_after) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, json.dumps(request), payload, STAGES[0], now, now, now),
+            )
+        return job_id
+
+    def get(self, job_id):
+        """Status of a job, with the names of its checkpoints; None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, stage, attempts, error, created_at, updated_at, run_after FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            saved = {name for name, in self._conn.execute("SELECT stage FROM checkpoints WHERE job_id = ?", (job_id,))}
+        job = dict(zip(("job_id", "status", "stage", "attempts", "error", "created_at", "updated_at", "run_after"), row))
+        job["checkpoints"] = [name for name in STAGES if name in saved]
+        return job
+
+    def checkpoints(self, job_id):
+        """Saved outputs of a job's finished stages, by stage name."""
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, value FROM checkpoints WHERE job_id = ?", (job_id,)).fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def claim(self, owner, lease=JOB_LEASE, max_attempts=JOB_MAX_ATTEMPTS):
+        """
+        Lease the oldest job that is due: queued, or running on a worker whose lease expired.
+
+        Taking over from a lost worker counts as a failed attempt at the stage
+        it was running, so a job that keeps killing its worker stops eventually.
+
+        :return: Dict with the job's id, request, payload and stage, or None if nothing is due.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT id, status, request, payload, stage, attempts FROM jobs "
+                    "WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_expires < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, status, request, payload, job_stage, attempts = row
+                if status == "running":
+                    attempts += 1
+                    if attempts >= max_attempts:
+                        conn.execute(
+                            "UPDATE jobs SET status = 'failed', attempts = ?, error = ?, owner = NULL, updated_at = ? "
+                            "WHERE id = ?",
+                            (attempts, f"Worker lost during the {job_stage} stage", now, job_id),
+                        )
+                        continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = ?, owner = ?, lease_expires = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (attempts, owner, now + lease, now, job_id),
+                )
+                return {"id": job_id, "request": json.loads(request), "payload": payload, "stage": job_stage}
+
+    def renew(self, job_id, owner, lease=JOB_LEASE):
+        """Extend a lease; False if the worker no longer owns the job."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time() + lease, job_id, owner),
+            ).rowcount == 1
+
+    def save_checkpoint(self, job_id, owner, job_stage, value, next_stage, payload=None):
+        """
+        Record a finished stage's output and move the job on to next_stage.
+
+        :param payload: Replaces the job's payload when given (e.g. image bytes read from a file).
+        :return: False if the worker no longer owns the job (nothing is saved).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET stage = ?, attempts = 0, error = NULL, updated_at = ?, payload = COALESCE(?, payload) "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (next_stage, now, payload, job_id, owner),
+            ).rowcount == 1
+            if updated:
+                conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (job_id, stage, value, created_at) VALUES (?, ?, ?, ?)",
+                    (job_id, job_stage, json.dumps(value), now),
+                )
+            return updated
+
+    def finish(self, job_id, owner):
+        """Mark a job done once its last checkpoint is saved; its payload is no longer needed."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', stage = NULL, owner = NULL, payload = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ?",
+                (time.time(), job_id, owner),
+            )
+
+    def fail_stage(self, job_id, owner, error, retry_delay=None, max_attempts=JOB_MAX_ATTEMPTS):
+        """
+        Record a failed attempt at the job's current stage.
+
+        The job is queued again after retry_delay (or exponential backoff) until
+        the stage has failed max_attempts times; then the job fails.
+
+        :return: True if the job will be retried.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ? AND owner = ?", (job_id, owner)).fetchone()
+            if row is None:
+                return False
+            attempts = row[0] + 1
+            if attempts >= max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', attempts = ?, error = ?, owner = NULL, updated_at = ? WHERE id = ?",
+                    (attempts, error, now, job_id),
+                )
+                return False
+            delay = max(retry_delay or 0.0, backoff_delay(attempts - 1, JOB_RETRY_BACKOFF))
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = ?, error = ?, owner = NULL, run_after = ?, updated_at = ? "
+                "WHERE id = ?",
+                (attempts, error, now + delay, now, job_id),
+            )
+            return True
+
+    def release(self, job_id, owner):
+        """Give a job back to the queue without counting an attempt (e.g. on shutdown)."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, run_after = ?, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time(), time.time(), job_id, owner),
+            )
+
+    def retry(self, job_id):
+        """Queue a failed job again from the stage that failed; False if the job is not failed."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, run_after = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'failed'",
+                (time.time(), time.time(), job_id),
+            ).rowcount == 1
+
+    def purge_expired(self, ttl=JOB_TTL):
+        """Delete done and failed jobs, with their checkpoints, not updated for ttl seconds; return how many."""
+        cutoff = time.time() - ttl
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM checkpoints WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?)",
+                (cutoff,),
+            )
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (cutoff,)
+            ).rowcount
+
+class JobWorkers:
+    """
+    A pool of tasks in this process that claim jobs from a JobStore and run their stages.
+
+    Stages: extract (text, or image bytes), summary (the model call) and audio
+    (TTS). Each stage's output is checkpointed as it finishes, so when a stage
+    fails only that stage is retried, and a job resumed by another worker
+    continues where the last one stopped.
+
+    :param extract: Async callable taking (request dict, payload bytes or None) and returning
+        ("text", text) or ("image", bytes, format).
+    :param store: The JobStore to work from; the process's store (opened on start) by default.
+    """
+
+    def __init__(self, extract, store=None):
+        self.extract = extract
+        self.store = store
+        self.owner = None
+        self._tasks = []
+        self._wakeup = asyncio.Event()
+
+    async def start(self, count=JOB_WORKERS):
+        """Start count worker tasks on the running event loop."""
+        if self.store is None:
+            self.store = await run_blocking(get_job_store)
+        # Identifies this process's leases; set here rather than at import, which a preloading server forks after
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        for _ in range(count):
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    async def stop(self):
+        """Stop the workers; jobs they were running go back to the queue and resume from their checkpoints."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers, e.g. after a job was submitted in this process."""
+        self._wakeup.set()
+
+    async def _work(self):
+        # Jobs outlive the request that submitted them, so they wait for upstream capacity without a deadline
+        set_deadline(None)
+        while True:
+            try:
+                job = await run_blocking(self.store.claim, self.owner)
+            except Exception as e:
+                logger.error(f"Could not claim a job: {e}")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                await asyncio.shield(run_blocking(self.store.release, job["id"], self.owner))
+                raise
+            finally:
+                heartbeat.cancel()
+
+    async def _heartbeat(self, job_id):
+        while True:
+            await asyncio.sleep(JOB_LEASE / 3)
+            if not await run_blocking(self.store.renew, job_id, self.owner):
+                logger.warning(f"Lost the lease on job {job_id}")
+                return
+
+    async def _run(self, job):
+        """Run a claimed job's remaining stages, checkpointing each one."""
+        job_id, request, payload = job["id"], job["request"], job["payload"]
+        language, use_cache = request.get("language") or "te", request.get("use_cache", True)
+        saved = await run_blocking(self.store.checkpoints, job_id)
+        job_stage = "extract"
+        try:
+            if "extract" not in saved:
+                extracted = await self.extract(request, payload)
+                saved["extract"] = {"kind": extracted[0]}
+                if extracted[0] == "image":
+                    saved["extract"]["format"] = extracted[2]
+                    payload = extracted[1]
+                else:
+                    saved["extract"]["text"] = extracted[1]
+                if not await self._checkpoint(job_id, "extract", saved["extract"], payload):
+                    return
+            kind = saved["extract"]["kind"]
+            content = payload if kind == "image" else saved["extract"]["text"]
+            key, cached = await cache_lookup_async(content, language, kind, use_cache)
+
+            job_stage = "summary"
+            if "summary" not in saved:
+                if cached is not None:
+                    saved["summary"] = {"summary": cached["summary"]}
+                elif kind == "image":
+                    saved["summary"] = {"summary": await summarize_image_async(content, saved["extract"]["format"], language)}
+                else:
+                    summary, chunk_stats = await summarize_text_async(content, language)
+                    saved["summary"] = {"summary": summary, "chunk_stats": chunk_stats}
+                if not await self._checkpoint(job_id, "summary", saved["summary"]):
+                    return
+            summary = saved["summary"]["summary"]
+
+            job_stage = "audio"
+            if "audio" not in saved:
+                if cached is not None and cached["summary"] == summary:
+                    audio = cached["audio"]
+                else:
+                    with stage("clean_text"):
+                        cleaned = clean_text_for_tts(summary)
+                    audio = await text_to_speech_telugu_async(cleaned, language=language)
+                    if not audio:
+                        raise ValueError("TTS returned no audio")
+                if not await self._checkpoint(job_id, "audio", audio):
+                    return
+                await cache_store_async(key, {"summary": summary, "audio": audio})
+            await run_blocking(self.store.finish, job_id, self.owner)
+            logger.info(f"Job {job_id} done")
+        except Exception as e:
+            JOB_STAGES.inc(1, job_stage, "error")
+            retry_delay = e.retry_after if isinstance(e, UpstreamBusy) else None
+            retried = await run_blocking(self.store.fail_stage, job_id, self.owner, f"{job_stage}: {e}", retry_delay)
+            logger.error(f"Job {job_id} failed at the {job_stage} stage{', will retry' if retried else ''}: {e}")
+
+    async def _checkpoint(self, job_id, job_stage, value, payload=None):
+        next_stage = STAGES[STAGES.index(job_stage) + 1] if job_stage != STAGES[-1] else None
+        saved = await run_blocking(self.store.save_checkpoint, job_id, self.owner, job_stage, value, next_stage, payload)
+        if saved:
+            JOB_STAGES.inc(1, job_stage, "ok")
+        else:
+            logger.warning(f"Job {job_id} was taken over by another worker; dropping its {job_stage} result")
+        return saved
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+    """Return the process's job store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore(JOB_DB_PATH)
+    return _store
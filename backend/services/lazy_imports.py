@@ -0,0 +1,17 @@
+import functools
+import importlib
+
+@functools.cache
+def optional_module(name):
+    """
+    Import an optional dependency on first use instead of at startup.
+
+    Failed imports are remembered too, so a missing package is only looked for once.
+
+    :param name: Dotted module name, e.g. "lxml.html".
+    :return: The module, or None if it is not installed.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, asdict
+
+from .lazy_imports import optional_module
+from .metrics import record_llm_usage
+from .rate_limit import create_completion
+
+logger = logging.getLogger(__name__)
+
+# Input tokens the model endpoint accepts in one request (GitHub Models allows gpt-4o 8000)
+MODEL_MAX_INPUT_TOKENS = int(os.environ.get("MODEL_MAX_INPUT_TOKENS", 8000))
+
+# Tokens of a request taken by its instructions rather than the document
+PROMPT_OVERHEAD_TOKENS = 500
+
+# Inputs longer than this (in tokens) are condensed with map-reduce before the final summary.
+# Capped so the final prompt always fits the endpoint's input limit.
+MAP_REDUCE_THRESHOLD_TOKENS = min(int(os.environ.get("MAP_REDUCE_THRESHOLD_TOKENS", 6000)),
+                                  MODEL_MAX_INPUT_TOKENS - PROMPT_OVERHEAD_TOKENS)
+
+# Target size of each chunk sent to the model in the map step, capped like the threshold
+MAP_REDUCE_CHUNK_TOKENS = min(int(os.environ.get("MAP_REDUCE_CHUNK_TOKENS", 4000)),
+                              MODEL_MAX_INPUT_TOKENS - PROMPT_OVERHEAD_TOKENS)
+
+# Chunk summaries requested at the same time, and the overall call rate cap
+MAP_REDUCE_MAX_CONCURRENCY = int(os.environ.get("MAP_REDUCE_MAX_CONCURRENCY", 4))
+MAP_REDUCE_MAX_CALLS_PER_MINUTE = int(os.environ.get("MAP_REDUCE_MAX_CALLS_PER_MINUTE", 60))
+
+# Rough characters-per-token ratio used when tiktoken is not available
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?।॥])\s+')
+
+_encoding = None
+
+def count_tokens(text):
+    """
+    Count (or, without tiktoken, estimate) the tokens in a piece of text.
+    
+    :param text: Text to measure.
+    :return: Number of tokens.
+    """
+    global _encoding
+    if _encoding is None:
+        # Optional: exact token counts when tiktoken is installed
+        tiktoken = optional_module("tiktoken")
+        _encoding = tiktoken.get_encoding("o200k_base") if tiktoken is not None else False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # UTF-8 length keeps the estimate honest for Indic scripts, which use more tokens per character
+    return len(text.encode("utf-8")) // CHARS_PER_TOKEN + 1
+
+def _split_oversized(piece, max_tokens):
+    """Break a paragraph that is larger than a chunk into sentences, then hard slices."""
+    for sentence in _SENTENCE_SPLIT.split(piece):
+        if count_tokens(sentence) <= max_tokens:
+            yield sentence
+            continue
+        step = max(1, len(sentence) * max_tokens // count_tokens(sentence))
+        for i in range(0, len(sentence), step):
+            yield sentence[i:i + step]
+
+# Tokens the vision model charges for one image at its effective resolution (4 tiles of 170 plus 85)
+IMAGE_TOKENS = 765
+
+def estimate_request_tokens(request_args):
+    """
+    Estimate the tokens a chat completion uses, for rate limiting: its prompt plus max_tokens.
+    
+    :param request_args: Arguments for chat.completions.create.
+    :return: Estimated total tokens.
+    """
+    tokens = request_args.get("max_tokens") or 0
+    for message in request_args.get("messages", []):
+        content = message["content"]
+        if isinstance(content, str):
+            tokens += count_tokens(content)
+            continue
+        for part in content:
+            tokens += count_tokens(part["text"]) if part["type"] == "text" else IMAGE_TOKENS
+    return tokens
+
+def chunk_text(text, max_tokens=MAP_REDUCE_CHUNK_TOKENS):
+    """
+    Split text into chunks of at most max_tokens, preferring paragraph and sentence boundaries.
+    
+    :param text: Text to split.
+    :param max_tokens: Token budget per chunk.
+    :return: List of chunks.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        pieces = [paragraph] if count_tokens(paragraph) <= max_tokens else _split_oversized(paragraph, max_tokens)
+        for piece in pieces:
+            piece_tokens = count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+@dataclass
+class ChunkStats:
+    """Timing and token usage of one map-step call."""
+    index: int
+    input_tokens: int
+    output_tokens: int
+    seconds: float
+
+class CallRateLimiter:
+    """Spaces out calls so no more than calls_per_minute start in any minute."""
+
+    def __init__(self, calls_per_minute=MAP_REDUCE_MAX_CALLS_PER_MINUTE):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def _map_request(chunk, model, index, total):
+    """Build the chat completion arguments for summarizing one chunk."""
+    return dict(
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You condense one section of a longer document. "
+                    "Keep every key fact, name, number and conclusion; drop repetition and filler. "
+                    "Write plain sentences without markdown. Answer in the language of the section."
+                )
+            },
+            {
+                "role": "user",
+                "content": f"Section {index + 1} of {total}:\n\n{chunk}",
+            }
+        ],
+        temperature=0.3,
+        top_p=1.0,
+        max_tokens=600,
+        model=model
+    )
+
+def _chunk_result(response, chunk, index, elapsed):
+    """Summary and stats of one map-step call."""
+    record_llm_usage(response)
+    usage = getattr(response, "usage", None)
+    stats = ChunkStats(
+        index=index,
+        input_tokens=usage.prompt_tokens if usage else count_tokens(chunk),
+        output_tokens=usage.completion_tokens if usage else 0,
+        seconds=elapsed,
+    )
+    return response.choices[0].message.content, stats
+
+async def _summarize_chunk(client, model, chunk, index, total, semaphore, limiter):
+    async with semaphore:
+        await limiter.wait()
+        start = time.perf_counter()
+        request_args = _map_request(chunk, model, index, total)
+        response = await create_completion(client, request_args, estimate_request_tokens(request_args), stage_name="llm_map")
+        elapsed = time.perf_counter() - start
+    return _chunk_result(response, chunk, index, elapsed)
+
+def _reduce(text, chunks, results, all_stats, elapsed):
+    """
+    Join one map step's summaries and record their stats.
+
+    :return: Tuple of (condensed text, whether another map step could make progress).
+    """
+    logger.info(
+        f"Map step: {len(chunks)} chunks in {elapsed:.2f}s "
+        f"({sum(stats.input_tokens for _, stats in results)} input tokens)"
+    )
+    all_stats.extend(asdict(stats) for _, stats in results)
+    condensed = "\n\n".join(summary for summary, _ in results)
+    # Otherwise no further progress is possible; the final pass handles what is left
+    return condensed, len(chunks) > 1 and count_tokens(condensed) < count_tokens(text)
+
+async def condense_async(client, model, text, threshold_tokens=MAP_REDUCE_THRESHOLD_TOKENS,
+                         chunk_tokens=MAP_REDUCE_CHUNK_TOKENS, max_concurrency=MAP_REDUCE_MAX_CONCURRENCY,
+                         limiter=None):
+    """
+    Condense a long text into chunk summaries that fit in a single prompt.
+    
+    Text at or below threshold_tokens is returned unchanged. Otherwise it is
+    chunked, the chunks are summarized concurrently (bounded by max_concurrency
+    and the call rate limiter) and the joined summaries are condensed again
+    until they fit.
+    
+    :param client: AsyncOpenAI client.
+    :param model: Model name.
+    :param text: Text to condense.
+    :return: Tuple of (condensed text, list of per-chunk stats as dicts).
+    """
+    limiter = limiter or CallRateLimiter()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    all_stats = []
+    while count_tokens(text) > threshold_tokens:
+        chunks = chunk_text(text, chunk_tokens)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            _summarize_chunk(client, model, chunk, i, len(chunks), semaphore, limiter)
+            for i, chunk in enumerate(chunks)
+        ))
+        text, progressing = _reduce(text, chunks, results, all_stats, time.perf_counter() - start)
+        if not progressing:
+            break
+    return text, all_stats
@@ -0,0 +1,148 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from fast parsing steps to slow model calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Timings of the current request, as a list of (stage, seconds); None outside a request
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+class Counter:
+    """A monotonically increasing value, optionally split by labels."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style, optionally split by labels."""
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return series[-1] if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for label_values, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels + ("le",), label_values + (repr(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            base_labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{base_labels} {series[-2]}")
+            lines.append(f"{self.name}_count{base_labels} {series[-1]}")
+        return lines
+
+STAGE_SECONDS = Histogram("summarize_stage_seconds", "Time spent in each summarize pipeline stage.", labels=("stage",))
+LLM_TOKENS = Counter("summarize_llm_tokens_total", "Tokens used by model calls.", labels=("kind",))
+TTS_CHARACTERS = Counter("summarize_tts_characters_total", "Characters sent to text-to-speech.")
+
+_metrics = [STAGE_SECONDS, LLM_TOKENS, TTS_CHARACTERS]
+
+def register(metric):
+    """Add a metric to the /metrics output and return it."""
+    _metrics.append(metric)
+    return metric
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+@contextmanager
+def stage(name):
+    """
+    Time a block as a pipeline stage.
+    
+    Records the duration in the stage histogram and, inside a request, in the
+    request's timing breakdown.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+def record_llm_usage(response):
+    """Count the prompt and completion tokens reported by a chat completion."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        LLM_TOKENS.inc(usage.prompt_tokens or 0, "prompt")
+        LLM_TOKENS.inc(usage.completion_tokens or 0, "completion")
+
+def start_request_timings():
+    """Begin collecting stage timings for the current request; returns the list they are added to."""
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+def server_timing_header(timings):
+    """
+    Format collected timings as a Server-Timing header value.
+    
+    Repeated stages (e.g. several TTS batches) are summed into one entry with a count.
+    """
+    totals = {}
+    for name, seconds in timings:
+        total, count = totals.get(name, (0.0, 0))
+        totals[name] = (total + seconds, count + 1)
+    return ", ".join(
+        f'{name};dur={total * 1000:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+        for name, (total, count) in totals.items()
+    )
@@ -0,0 +1,187 @@
+import asyncio
+import io
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+
+from .executor import ProcessPool
+from .lazy_imports import optional_module
+from .metrics import Counter, Histogram, register, stage
+
+logger = logging.getLogger(__name__)
+
+# "auto" runs OCR when pytesseract and the tesseract binary are installed; "false" turns it off
+OCR_ENABLED = os.environ.get("OCR_ENABLED", "auto").lower()
+
+# Tesseract language packs to use, e.g. "eng+hin+tel"
+OCR_LANGUAGES = os.environ.get("OCR_LANGUAGES", "eng")
+
+# Images are summarized from their OCR text only when the mean word confidence (0-100)
+# reaches OCR_MIN_CONFIDENCE and at least OCR_MIN_WORDS words were recognised
+OCR_MIN_CONFIDENCE = float(os.environ.get("OCR_MIN_CONFIDENCE", 80))
+OCR_MIN_WORDS = int(os.environ.get("OCR_MIN_WORDS", 30))
+
+# Worker processes running tesseract, and the seconds one image may take
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", min(2, os.cpu_count() or 1)))
+OCR_TIMEOUT = float(os.environ.get("OCR_TIMEOUT", 20))
+
+OCR_ROUTES = register(Counter(
+    "summarize_image_route_total", "Images summarized from OCR text or by the vision model, by reason.",
+    labels=("route", "reason"),
+))
+OCR_CONFIDENCE = register(Histogram(
+    "summarize_ocr_confidence", "Mean word confidence of OCR results.",
+    buckets=(20, 40, 50, 60, 70, 80, 85, 90, 95, 100),
+))
+OCR_SECONDS_SAVED = register(Counter(
+    "summarize_ocr_seconds_saved_total",
+    "Estimated seconds saved by summarizing OCR text instead of calling the vision model.",
+))
+OCR_SECONDS_WASTED = register(Counter(
+    "summarize_ocr_seconds_wasted_total",
+    "Seconds spent on OCR for images that then went to the vision model anyway.",
+))
+
+@dataclass
+class OcrResult:
+    text: str
+    confidence: float  # Mean word confidence, weighted by word length (0-100)
+    words: int
+
+    @property
+    def confident(self):
+        return self.confidence >= OCR_MIN_CONFIDENCE and self.words >= OCR_MIN_WORDS
+
+def _run_ocr(image_data, languages, timeout):
+    """Recognise the text in an image (runs in a worker process)."""
+    import pytesseract
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_data)))
+    image = ImageOps.autocontrast(image.convert("L"))
+    data = pytesseract.image_to_data(image, lang=languages, timeout=timeout, output_type=pytesseract.Output.DICT)
+
+    lines = {}
+    weighted, characters, words = 0.0, 0, 0
+    for word, confidence, block, paragraph, line in zip(
+        data["text"], data["conf"], data["block_num"], data["par_num"], data["line_num"]
+    ):
+        word = word.strip()
+        confidence = float(confidence)
+        if not word or confidence < 0:
+            continue
+        lines.setdefault((block, paragraph, line), []).append(word)
+        weighted += confidence * len(word)
+        characters += len(word)
+        words += 1
+    text = "\n".join(" ".join(line_words) for line_words in lines.values())
+    return text, (weighted / characters if characters else 0.0), words
+
+_process_pool = ProcessPool(OCR_WORKERS)
+_available = None
+
+def ocr_available():
+    """Whether the OCR stage is enabled and tesseract can be run."""
+    global _available
+    if _available is None:
+        # pytesseract is optional, needs the tesseract binary as well, and is imported on first use
+        pytesseract = OCR_ENABLED not in ("0", "false", "no") and optional_module("pytesseract")
+        _available = bool(pytesseract) and shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+    return _available
+
+def shutdown_ocr_workers():
+    """Shut down the OCR worker processes, if any were started."""
+    _process_pool.shutdown()
+
+def _to_result(outcome):
+    text, confidence, words = outcome
+    OCR_CONFIDENCE.observe(confidence)
+    return OcrResult(text=text, confidence=confidence, words=words)
+
+def ocr_image(image_data):
+    """
+    Run OCR on an image in a worker process (blocking).
+
+    :param image_data: Raw bytes of the image.
+    :return: OcrResult, or None if OCR is unavailable or failed.
+    """
+    if not ocr_available():
+        return None
+    try:
+        with stage("ocr"):
+            outcome = _process_pool.get().submit(_run_ocr, image_data, OCR_LANGUAGES, OCR_TIMEOUT).result()
+        return _to_result(outcome)
+    except Exception as e:
+        logger.warning(f"OCR failed, using the vision model: {e}")
+        return None
+
+async def ocr_image_async(image_data):
+    """
+    Async variant of ocr_image; the event loop keeps running while tesseract works.
+
+    :param image_data: Raw bytes of the image.
+    :return: OcrResult, or None if OCR is unavailable or failed.
+    """
+    if not ocr_available():
+        return None
+    try:
+        with stage("ocr"):
+            outcome = await asyncio.get_running_loop().run_in_executor(
+                _process_pool.get(), _run_ocr, image_data, OCR_LANGUAGES, OCR_TIMEOUT
+            )
+        return _to_result(outcome)
+    except Exception as e:
+        logger.warning(f"OCR failed, using the vision model: {e}")
+        return None
+
+class RouteTimer:
+    """
+    Records which path an image took and estimates the time the text path saved.
+
+    The estimate compares each text-path summary, OCR included, against a
+    moving average of recent vision-model calls, OCR excluded. The OCR time
+    of images that went to the vision model is counted separately, as the
+    price of trying.
+    """
+
+    def __init__(self, smoothing=0.2):
+        self.smoothing = smoothing
+        self.vision_seconds = None
+        self._lock = threading.Lock()
+
+    def route(self, result):
+        """Count the routing decision for an OCR result and return True if the text path should be used."""
+        if result is None:
+            OCR_ROUTES.inc(1, "vision", "unavailable" if not ocr_available() else "error")
+            return False
+        if result.confident:
+            OCR_ROUTES.inc(1, "text", "confident")
+            return True
+        reason = "too_few_words" if result.words < OCR_MIN_WORDS else "low_confidence"
+        OCR_ROUTES.inc(1, "vision", reason)
+        return False
+
+    def vision_call(self, seconds, ocr_seconds=0.0):
+        """
+        Record an image summarized by the vision model.
+
+        :param seconds: Time from the start of OCR to the model's answer.
+        :param ocr_seconds: The part of it spent on OCR.
+        """
+        OCR_SECONDS_WASTED.inc(ocr_seconds)
+        seconds -= ocr_seconds
+        with self._lock:
+            if self.vision_seconds is None:
+                self.vision_seconds = seconds
+            else:
+                self.vision_seconds += self.smoothing * (seconds - self.vision_seconds)
+
+    def text_path(self, seconds):
+        with self._lock:
+            baseline = self.vision_seconds
+        if baseline is not None and baseline > seconds:
+            OCR_SECONDS_SAVED.inc(baseline - seconds)
+
+route_timer = RouteTimer()
@@ -1,18 +1,129 @@
-# File: backend/services/pdf_extraction.py
-import fitz  # PyMuPDF
+import contextlib
+import os
+import tempfile
+from pathlib import Path
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+from .executor import ProcessPool
+
+# Stop extracting once this many characters have been collected; the summarizer cannot use more
+PDF_MAX_CHARS = int(os.environ.get("PDF_MAX_CHARS", 400_000))
+
+# Documents with at least this many pages are split into page ranges across worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 64))
+
+# Worker processes used for page-parallel extraction
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Pages handled by one worker task
+PDF_PAGES_PER_TASK = int(os.environ.get("PDF_PAGES_PER_TASK", 32))
+
+_process_pool = ProcessPool(PDF_WORKERS)
+
+def shutdown_pdf_workers():
+    """Shut down the page extraction worker processes, if any were started."""
+    _process_pool.shutdown()
+
+def open_pdf(source):
+    """
+    Open a PDF from a path, bytes, or any object exposing the buffer protocol
+    (bytearray, memoryview, mmap).
+    
+    :param source: Path (str or Path) or in-memory PDF data.
+    :return: An open fitz.Document.
+    """
+    import fitz  # PyMuPDF, imported on first use to keep startup fast
+
+    if isinstance(source, (str, Path)):
+        return fitz.open(source)
+    if not isinstance(source, (bytes, bytearray)):
+        source = bytes(memoryview(source))
+    return fitz.open(stream=source, filetype="pdf")
+
+def iter_pdf_pages(source, start=0, end=None):
+    """
+    Lazily yield the text of each page in a page range.
+    
+    :param source: Path or in-memory PDF data (see open_pdf).
+    :param start: First page (zero-based, inclusive).
+    :param end: Last page (exclusive); defaults to the end of the document.
+    :return: Generator of page texts.
+    """
+    with open_pdf(source) as doc:
+        end = doc.page_count if end is None else min(end, doc.page_count)
+        yield from _iter_pages(doc, start, end)
+
+def _iter_pages(doc, start, end):
+    for page_number in range(start, end):
+        yield doc.load_page(page_number).get_text()
+
+def _collect(pages, max_chars):
+    """Join page texts, stopping once max_chars is reached."""
+    parts = []
+    total = 0
+    for text in pages:
+        parts.append(text)
+        total += len(text)
+        if max_chars is not None and total >= max_chars:
+            break
+    return "".join(parts)[:max_chars] if max_chars is not None else "".join(parts)
+
+def _extract_page_range(source, start, end, max_chars):
+    """Worker entry point: extract a page range in a separate process."""
+    return _collect(iter_pdf_pages(source, start, end), max_chars)
+
+@contextlib.contextmanager
+def _source_path(source):
+    """
+    A path the worker processes can open the PDF from.
+
+    In-memory data is written to a temporary file once, rather than pickled
+    and copied to the workers for every page range.
+    """
+    if isinstance(source, (str, Path)):
+        yield source
+        return
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(memoryview(source))
+        yield path
+    finally:
+        os.unlink(path)
+
+def _extract_parallel(source, start, end, max_chars):
+    """Extract page ranges across the process pool, consuming results in page order."""
+    pool = _process_pool.get()
+    with _source_path(source) as path:
+        futures = [
+            pool.submit(_extract_page_range, path, first, min(first + PDF_PAGES_PER_TASK, end), max_chars)
+            for first in range(start, end, PDF_PAGES_PER_TASK)
+        ]
+        try:
+            return _collect((future.result() for future in futures), max_chars)
+        finally:
+            # Ranges past the character budget are never needed
+            for future in futures:
+                future.cancel()
+
+def extract_text_from_pdf(pdf_source, max_chars=PDF_MAX_CHARS, page_range=None, parallel=None) -> str:
     """
     Extract text from a PDF file using PyMuPDF.
     
-    :param pdf_path: Path to the PDF file.
+    :param pdf_source: Path to the PDF file, or the PDF as bytes / memoryview / mmap.
+    :param max_chars: Stop once this many characters are extracted (None for no limit).
+    :param page_range: Optional (start, end) zero-based page range, end exclusive.
+    :param parallel: Force (True) or disable (False) page-parallel extraction;
+        by default large documents are extracted in parallel.
     :return: Extracted text or an error message.
     """
-    text = ""
     try:
-        doc = fitz.open(pdf_path)
-        for page in doc:
-            text += page.get_text()
-        return text
+        with open_pdf(pdf_source) as doc:
+            start, end = page_range or (0, doc.page_count)
+            end = min(end, doc.page_count)
+            if parallel is None:
+                parallel = end - start >= PDF_PARALLEL_MIN_PAGES and PDF_WORKERS > 1
+            if parallel:
+                return _extract_parallel(pdf_source, start, end, max_chars)
+            return _collect(_iter_pages(doc, start, end), max_chars)
     except Exception as e:
-        return f"Error extracting PDF text: {e}"
\ No newline at end of file
+        return f"Error extracting PDF text: {e}"
@@ -0,0 +1,330 @@
+import asyncio
+import contextlib
+import contextvars
+import email.utils
+import os
+import random
+import threading
+import time
+
+from .metrics import Counter, register, stage
+from .shared_state import get_shared_state
+
+# Requests and tokens per minute allowed to the model endpoint; 0 means no limit
+LLM_REQUESTS_PER_MINUTE = int(os.environ.get("LLM_REQUESTS_PER_MINUTE", 0))
+LLM_TOKENS_PER_MINUTE = int(os.environ.get("LLM_TOKENS_PER_MINUTE", 0))
+
+# Requests and characters per minute allowed to Sarvam TTS; 0 means no limit
+TTS_REQUESTS_PER_MINUTE = int(os.environ.get("TTS_REQUESTS_PER_MINUTE", 0))
+TTS_CHARACTERS_PER_MINUTE = int(os.environ.get("TTS_CHARACTERS_PER_MINUTE", 0))
+
+# Seconds' worth of quota that may be used in one burst. Kept well under a minute so
+# bursts cannot overrun upstreams that count their quota over a sliding minute.
+UPSTREAM_BURST_SECONDS = float(os.environ.get("UPSTREAM_BURST_SECONDS", 6))
+
+# Calls allowed to wait for each upstream at the same time; further calls are shed
+UPSTREAM_MAX_QUEUE = int(os.environ.get("UPSTREAM_MAX_QUEUE", 64))
+
+# Seconds a request may take before waiting for upstream capacity is pointless; 0 disables
+REQUEST_DEADLINE = float(os.environ.get("REQUEST_DEADLINE", 30))
+
+# Retries of model calls on 429/5xx, waiting for Retry-After or an exponential backoff
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 3))
+LLM_RETRY_BACKOFF = float(os.environ.get("LLM_RETRY_BACKOFF", 0.5))
+
+UPSTREAM_SHED = register(Counter(
+    "summarize_upstream_shed_total", "Calls rejected because the upstream had no capacity before the deadline.",
+    labels=("upstream",),
+))
+UPSTREAM_THROTTLED = register(Counter(
+    "summarize_upstream_throttled_total", "429 responses received from each upstream.", labels=("upstream",),
+))
+
+class UpstreamBusy(Exception):
+    """
+    An upstream has no capacity for a call before the request's deadline.
+
+    :param upstream: Name of the upstream ("llm" or "tts").
+    :param retry_after: Seconds after which a retry is likely to succeed.
+    :param status_code: HTTP status of the upstream's last error (e.g. a 503), if that is what
+        is being waited out rather than its rate limit.
+    """
+
+    def __init__(self, upstream, retry_after, status_code=None):
+        reason = f"is failing (HTTP {status_code})" if status_code else "is at its rate limit"
+        super().__init__(f"The {upstream} service {reason}; retry in {retry_after:.1f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+_deadline = contextvars.ContextVar("upstream_deadline", default=None)
+
+def set_deadline(seconds):
+    """Give the current request (context) seconds to finish; None or 0 removes the deadline."""
+    _deadline.set(time.monotonic() + seconds if seconds else None)
+
+def start_request_deadline():
+    """Start the REQUEST_DEADLINE countdown for the current request."""
+    set_deadline(REQUEST_DEADLINE)
+
+def get_deadline():
+    """Monotonic time by which the current request should finish, or None."""
+    return _deadline.get()
+
+def parse_retry_after(headers):
+    """
+    Read how long an upstream asked us to wait.
+
+    :param headers: Response headers (case-insensitive mapping).
+    :return: Seconds from Retry-After (delta or HTTP date) or retry-after-ms, or None.
+    """
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return max(0.0, float(milliseconds) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, base):
+    """Exponential backoff with jitter for the given (zero-based) retry attempt."""
+    return base * (2 ** attempt) * (1 + random.random() * 0.25)
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at per_minute / 60 per second, holding burst_seconds' worth.
+
+    Not thread-safe on its own; UpstreamLimiter serializes access.
+    """
+
+    def __init__(self, per_minute, burst_seconds=None):
+        self.rate = per_minute / 60.0
+        burst_seconds = UPSTREAM_BURST_SECONDS if burst_seconds is None else burst_seconds
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount, now):
+        """Take amount, going into debt if needed, and return the seconds until the debt is repaid."""
+        if self.rate <= 0:
+            return 0.0
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+        # A single call larger than the bucket could otherwise never be admitted
+        self._level -= min(amount, self.capacity)
+        return max(0.0, -self._level / self.rate)
+
+    def refund(self, amount):
+        if self.rate > 0:
+            self._level = min(self.capacity, self._level + min(amount, self.capacity))
+
+    def dump(self):
+        return [self._level, self._updated]
+
+    def load(self, saved):
+        if saved is not None:
+            self._level, self._updated = saved
+
+class UpstreamLimiter:
+    """
+    Shared admission control for one upstream API.
+
+    Each call reserves one request and its units (tokens or characters) from
+    two token buckets and waits until both are available. Calls that would
+    have to wait past their request's deadline, or that find max_queue
+    calls already waiting, are rejected at once with UpstreamBusy so the
+    client can retry later instead of hanging. A 429 pauses every caller
+    for the upstream's Retry-After.
+
+    With a shared state backend the buckets and pause are shared by every
+    worker process on the host (time.monotonic() is system-wide there), so
+    the quota holds across workers; max_queue applies to each worker.
+
+    :param name: Name of the upstream, used in metrics and errors.
+    :param requests_per_minute: Request quota; 0 for none.
+    :param units_per_minute: Token or character quota; 0 for none.
+    :param max_queue: Most calls allowed to wait at once.
+    :param state: Shared state backend to keep the buckets in, or None for this process only.
+    """
+
+    def __init__(self, name, requests_per_minute=0, units_per_minute=0, max_queue=UPSTREAM_MAX_QUEUE, state=None):
+        self.name = name
+        self.max_queue = max_queue
+        self.requests = TokenBucket(requests_per_minute)
+        self.units = TokenBucket(units_per_minute)
+        self._paused_until = 0.0
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self._state = state if state is not None and state.shared else None
+
+    @contextlib.contextmanager
+    def _buckets(self):
+        """Hold the limiter's lock, with the buckets loaded from and saved back to shared state."""
+        with self._lock:
+            if self._state is None:
+                yield
+                return
+            with self._state.record("limiter", self.name) as record:
+                self.requests.load(record.get("requests"))
+                self.units.load(record.get("units"))
+                self._paused_until = record.get("paused_until", 0.0)
+                yield
+                record.update(requests=self.requests.dump(), units=self.units.dump(), paused_until=self._paused_until)
+
+    def _reserve(self, units):
+        deadline = get_deadline()
+        with self._buckets():
+            now = time.monotonic()
+            wait = max(self.requests.reserve(1, now), self.units.reserve(units, now), self._paused_until - now)
+            if wait > 0:
+                if self._waiting >= self.max_queue or (deadline is not None and now + wait > deadline):
+                    self.requests.refund(1)
+                    self.units.refund(units)
+                    UPSTREAM_SHED.inc(1, self.name)
+                    raise UpstreamBusy(self.name, wait)
+                self._waiting += 1
+        return wait
+
+    def _done_waiting(self):
+        with self._lock:
+            self._waiting -= 1
+
+    async def run(self, func, *args):
+        """
+        Call func, a function using the buckets (e.g. settle), from async code.
+
+        With shared buckets every access is a read-modify-write of the state
+        backend, so it runs where the backend says rather than on the loop.
+        """
+        if self._state is None:
+            return func(*args)
+        return await self._state.run(func, *args)
+
+    async def acquire(self, units=0):
+        """Wait for capacity for one call using units, or raise UpstreamBusy."""
+        wait = await self.run(self._reserve, units)
+        if wait > 0:
+            try:
+                with stage(f"{self.name}_wait"):
+                    await asyncio.sleep(wait)
+            finally:
+                self._done_waiting()
+
+    def settle(self, reserved, used):
+        """Correct the unit bucket once a call's real usage is known."""
+        with self._buckets():
+            self.units.refund(reserved - used)
+
+    def throttled(self, retry_after):
+        """Record a 429 and hold back every caller for retry_after seconds."""
+        UPSTREAM_THROTTLED.inc(1, self.name)
+        with self._buckets():
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def check_deadline(self, delay, status_code=None):
+        """
+        Raise UpstreamBusy if waiting delay seconds would overrun the request's deadline.
+
+        :param status_code: HTTP status of the error being waited out, reported in the exception.
+        """
+        deadline = get_deadline()
+        if deadline is not None and time.monotonic() + delay > deadline:
+            UPSTREAM_SHED.inc(1, self.name)
+            raise UpstreamBusy(self.name, delay, status_code)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name) -> UpstreamLimiter:
+    """Return the process-wide limiter for "llm" or "tts", configured from the environment."""
+    with _limiters_lock:
+        if name not in _limiters:
+            if name == "llm":
+                _limiters[name] = UpstreamLimiter(name, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE,
+                                                  state=get_shared_state())
+            elif name == "tts":
+                _limiters[name] = UpstreamLimiter(name, TTS_REQUESTS_PER_MINUTE, TTS_CHARACTERS_PER_MINUTE,
+                                                  state=get_shared_state())
+            else:
+                raise ValueError(f"Unknown upstream: {name}")
+        return _limiters[name]
+
+def _used_tokens(response):
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+def is_retryable(status_code):
+    """Rate limiting and server errors are worth retrying; other errors are not."""
+    return status_code == 429 or status_code >= 500
+
+def retry_delay(limiter, status_code, headers, attempt, max_retries, backoff):
+    """
+    Decide whether and when to retry a call to an upstream that failed.
+
+    :param limiter: The upstream's limiter; a 429 pauses every caller through it.
+    :param status_code: HTTP status of the failed call.
+    :param headers: Its response headers, for Retry-After.
+    :param attempt: Zero-based number of the attempt that failed.
+    :param max_retries: Retries allowed after the first attempt.
+    :param backoff: Base of the exponential backoff when the upstream gives no Retry-After.
+    :return: Seconds to wait before retrying, or None if the call should not be retried.
+    :raises UpstreamBusy: If the upstream stays rate limited, or waiting would overrun the deadline.
+    """
+    if not is_retryable(status_code):
+        return None
+    delay = parse_retry_after(headers) or backoff_delay(attempt, backoff)
+    if status_code == 429:
+        limiter.throttled(delay)
+        if attempt >= max_retries:
+            raise UpstreamBusy(limiter.name, delay)
+        # Every caller waits out the pause in acquire(), which sheds calls it would push past their deadline
+        return 0.0
+    if attempt >= max_retries:
+        return None
+    limiter.check_deadline(delay, status_code)
+    return delay
+
+def _llm_retry_delay(limiter, error, attempt):
+    return retry_delay(limiter, error.status_code, error.response.headers, attempt, LLM_MAX_RETRIES, LLM_RETRY_BACKOFF)
+
+async def create_completion(client, request_args, tokens, stage_name="llm"):
+    """
+    Make a chat completion through the model endpoint's limiter, retrying 429/5xx.
+
+    :param client: AsyncOpenAI client.
+    :param request_args: Arguments for chat.completions.create.
+    :param tokens: Estimated tokens the call uses (prompt plus max_tokens).
+    :param stage_name: Pipeline stage to time the call as, or None.
+    :return: The completion (or stream, if request_args ask for one).
+    :raises UpstreamBusy: If the endpoint stays rate limited past the request's deadline.
+    """
+    import openai  # Already loaded by the client
+
+    limiter = get_limiter("llm")
+    attempt = 0
+    while True:
+        await limiter.acquire(tokens)
+        try:
+            with stage(stage_name) if stage_name else contextlib.nullcontext():
+                response = await client.chat.completions.create(**request_args)
+        except openai.APIStatusError as e:
+            delay = await limiter.run(_llm_retry_delay, limiter, e, attempt) if is_retryable(e.status_code) else None
+            if delay is None:
+                raise
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+        used = _used_tokens(response)
+        if used is not None:
+            await limiter.run(limiter.settle, tokens, used)
+        return response
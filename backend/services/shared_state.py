@@ -0,0 +1,231 @@
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Where state shared between requests lives: "memory" (this process only) or "sqlite"
+# (a file every worker process on the host opens, for multi-worker deployments)
+STATE_BACKEND = os.environ.get("STATE_BACKEND", "memory").lower()
+
+# SQLite file used by the "sqlite" backend
+STATE_DB_PATH = os.environ.get("STATE_DB_PATH", os.path.join(tempfile.gettempdir(), "summarizer-state.sqlite3"))
+
+# Writes between sweeps of expired entries from the SQLite file
+STATE_PURGE_EVERY = int(os.environ.get("STATE_PURGE_EVERY", 500))
+
+class MemoryState:
+    """
+    Shared state kept in this process's memory.
+
+    Values live in namespaces and may expire. record() gives atomic
+    read-modify-write access to one value; leases let one caller at a time
+    own a piece of work.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self._values = {}  # (namespace, key) -> (expires_at or None, value)
+        self._lock = threading.RLock()
+
+    def get(self, namespace, key):
+        """Return the value stored under key, or None if missing or expired."""
+        with self._lock:
+            entry = self._values.get((namespace, key))
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] < time.time():
+                del self._values[(namespace, key)]
+                return None
+            return entry[1]
+
+    def set(self, namespace, key, value, ttl=None):
+        """Store a JSON-serializable value or bytes, expiring after ttl seconds if given."""
+        with self._lock:
+            self._values[(namespace, key)] = (time.time() + ttl if ttl else None, value)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._values.pop((namespace, key), None)
+
+    @contextlib.contextmanager
+    def record(self, namespace, key):
+        """Hold a dict stored under key exclusively; changes made to it are saved on exit."""
+        with self._lock:
+            value = self.get(namespace, key)
+            if value is None:
+                value = {}
+                self.set(namespace, key, value)
+            yield value
+
+    def acquire_lease(self, namespace, key, owner, ttl):
+        """
+        Take the lease on key for ttl seconds unless someone else holds it.
+
+        :return: Tuple of (acquired, current holder).
+        """
+        with self._lock:
+            holder = self.get(namespace, key)
+            if holder is None or holder == owner:
+                self.set(namespace, key, owner, ttl)
+                return True, owner
+            return False, holder
+
+    def release_lease(self, namespace, key, owner):
+        with self._lock:
+            if self.get(namespace, key) == owner:
+                self.delete(namespace, key)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Call func, a function using this backend, from async code.
+
+        In memory every operation is quick and is called directly; backends
+        doing I/O override this to keep it off the event loop.
+        """
+        return func(*args, **kwargs)
+
+class SQLiteDatabase:
+    """
+    A SQLite file that threads and processes on one host use at the same time.
+
+    Opened in WAL mode, so readers never wait for the writer; writes are
+    short transactions that wait up to 10 seconds for another process's lock.
+
+    :param path: Path of the database file.
+    :param schema: Statements creating the tables and indexes, run if they do not exist yet.
+    """
+
+    def __init__(self, path, schema=()):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in schema:
+                self._conn.execute(statement)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction, holding the database lock throughout."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+class SQLiteState(SQLiteDatabase, MemoryState):
+    """
+    Shared state in a SQLite file, visible to every process that opens it.
+
+    Intended for worker processes on one host. Each operation is a short
+    transaction; record() and leases take the database's write lock so
+    they are atomic across processes.
+
+    :param path: Path of the database file.
+    """
+
+    shared = True
+
+    def __init__(self, path):
+        super().__init__(path, schema=[
+            "CREATE TABLE IF NOT EXISTS state (namespace TEXT, key TEXT, expires_at REAL, "
+            "is_json INTEGER, value BLOB, PRIMARY KEY (namespace, key))"
+        ])
+        self._writes = 0
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return 0, value
+        return 1, json.dumps(value)
+
+    @staticmethod
+    def _decode(is_json, value):
+        return json.loads(value) if is_json else bytes(value)
+
+    def _get(self, conn, namespace, key):
+        row = conn.execute(
+            "SELECT is_json, value FROM state WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return self._decode(*row) if row is not None else None
+
+    def _set(self, conn, namespace, key, value, ttl):
+        conn.execute(
+            "INSERT OR REPLACE INTO state (namespace, key, expires_at, is_json, value) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, time.time() + ttl if ttl else None, *self._encode(value)),
+        )
+        self._writes += 1
+        if self._writes % STATE_PURGE_EVERY == 0:
+            conn.execute("DELETE FROM state WHERE expires_at < ?", (time.time(),))
+
+    def get(self, namespace, key):
+        with self._lock:
+            return self._get(self._conn, namespace, key)
+
+    def set(self, namespace, key, value, ttl=None):
+        with self._transaction() as conn:
+            self._set(conn, namespace, key, value, ttl)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    @contextlib.contextmanager
+    def record(self, namespace, key):
+        with self._transaction() as conn:
+            value = self._get(conn, namespace, key) or {}
+            yield value
+            self._set(conn, namespace, key, value, None)
+
+    def acquire_lease(self, namespace, key, owner, ttl):
+        with self._transaction() as conn:
+            holder = self._get(conn, namespace, key)
+            if holder is None or holder == owner:
+                self._set(conn, namespace, key, owner, ttl)
+                return True, owner
+            return False, holder
+
+    def release_lease(self, namespace, key, owner):
+        with self._transaction() as conn:
+            if self._get(conn, namespace, key) == owner:
+                conn.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    async def run(self, func, *args, **kwargs):
+        # Each operation may wait up to the busy timeout for another process's write lock
+        return await run_blocking(func, *args, **kwargs)
+
+_state = None
+_state_lock = threading.Lock()
+
+def get_shared_state():
+    """
+    Return the process's shared state backend, configured from the environment.
+
+    Opened lazily, so a preloading server can fork workers before any file is open.
+
+    :return: A SQLiteState if STATE_BACKEND is "sqlite", else a MemoryState.
+    """
+    global _state
+    with _state_lock:
+        if _state is None:
+            if STATE_BACKEND == "sqlite":
+                _state = SQLiteState(STATE_DB_PATH)
+            else:
+                if STATE_BACKEND != "memory":
+                    logger.warning(f"Unknown STATE_BACKEND {STATE_BACKEND!r}; keeping state in memory")
+                _state = MemoryState()
+    return _state
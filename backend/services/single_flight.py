@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import os
+import re
+import uuid
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .metrics import Counter, register
+from .shared_state import get_shared_state
+
+# With shared state, seconds a worker may hold a computation before others take it
+# over (covers a worker that died mid-computation), and how long its result is kept
+SINGLE_FLIGHT_LEASE = float(os.environ.get("SINGLE_FLIGHT_LEASE", 120))
+SINGLE_FLIGHT_RESULT_TTL = float(os.environ.get("SINGLE_FLIGHT_RESULT_TTL", 60))
+
+# Longest pause between checks for another worker's result
+SINGLE_FLIGHT_MAX_POLL = float(os.environ.get("SINGLE_FLIGHT_MAX_POLL", 0.25))
+
+COALESCED_REQUESTS = register(Counter(
+    "summarize_coalesced_total", "Requests that shared an identical in-flight computation instead of starting their own.",
+))
+
+# Query parameters that only track where a link was shared and never change the page
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|igshid)$', re.IGNORECASE)
+
+def normalize_url(url):
+    """
+    Canonical form of a URL for deduplication.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters and sorts the remaining query. The path is kept
+    as is, since servers may treat it case- or slash-sensitively.
+
+    :param url: URL as submitted.
+    :return: Normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _TRACKING_PARAMS.match(k)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+def normalize_text(text):
+    """Collapse whitespace so texts differing only in spacing share a key."""
+    return " ".join(text.split())
+
+def flight_key(*parts):
+    """Hash the parts identifying a computation into a key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, bytes):
+            part = repr(part).encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+class _Flight:
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one computation.
+
+    The first caller starts the computation as a task; callers arriving while
+    it runs wait on the same task and all get its result or its exception.
+    A caller that is cancelled stops waiting without affecting the others;
+    the computation itself is only cancelled once every caller has gone.
+
+    When worker processes share state, a lease in the shared backend extends
+    this across workers: the worker holding it computes and publishes the
+    (JSON-serializable) result, and the others poll for it. If the holder
+    fails, its lease is released without a result and a waiting worker runs
+    the computation itself, so every worker reports its own error.
+    """
+
+    def __init__(self, state=None):
+        self._flights = {}
+        self._state = state
+
+    async def do(self, key, func):
+        """
+        Run func() once for all concurrent callers with the same key.
+
+        :param key: Identity of the computation.
+        :param func: Zero-argument callable returning an awaitable.
+        :return: The computation's result.
+        """
+        # Tasks belong to one event loop, so flights are never shared across loops
+        flight_id = (asyncio.get_running_loop(), key)
+        flight = self._flights.get(flight_id)
+        if flight is None:
+            state = self._state or get_shared_state()
+            work = self._across_workers(state, key, func) if state.shared else func()
+            flight = self._flights[flight_id] = _Flight(asyncio.ensure_future(work))
+            flight.task.add_done_callback(lambda _: self._forget(flight_id, flight))
+        else:
+            COALESCED_REQUESTS.inc()
+
+        flight.waiters += 1
+        try:
+            # shield() keeps one caller's cancellation from cancelling the shared task
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody wants the result any more: stop the upstream work
+                self._forget(flight_id, flight)
+                flight.task.cancel()
+
+    async def _across_workers(self, state, key, func):
+        """Run func() in whichever worker takes the shared lease first; the others get its result."""
+        owner = uuid.uuid4().hex
+        while True:
+            acquired, holder = await state.run(state.acquire_lease, "flight", key, owner, SINGLE_FLIGHT_LEASE)
+            if acquired:
+                try:
+                    result = await func()
+                    await state.run(state.set, "flight_result", key, {"owner": owner, "result": result},
+                                    ttl=SINGLE_FLIGHT_RESULT_TTL)
+                    return result
+                finally:
+                    await state.run(state.release_lease, "flight", key, owner)
+
+            # Another worker is computing it; only its own result counts, not an older one
+            delay = 0.01
+            while True:
+                published = await state.run(state.get, "flight_result", key)
+                if published is not None and published["owner"] == holder:
+                    COALESCED_REQUESTS.inc()
+                    return published["result"]
+                if await state.run(state.get, "flight", key) != holder:
+                    break  # Released or expired without a result that we saw
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, SINGLE_FLIGHT_MAX_POLL)
+            published = await state.run(state.get, "flight_result", key)
+            if published is not None and published["owner"] == holder:
+                COALESCED_REQUESTS.inc()
+                return published["result"]
+
+    def _forget(self, flight_id, flight):
+        if self._flights.get(flight_id) is flight:
+            del self._flights[flight_id]
+
+    def in_flight(self):
+        """Number of computations currently running."""
+        return len(self._flights)
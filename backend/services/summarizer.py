@@ -1,12 +1,49 @@
 # File: backend/services/summarizer.py
 import os
+import asyncio
 import base64
+import hashlib
+import io
+import logging
 import re
+import time
 from pathlib import Path
-from openai import OpenAI
 
 # Import the text-to-speech function
-from .tts_service import text_to_speech_telugu
+from .tts_service import text_to_speech_telugu_async
+from .tts_chunker import SENTENCE_END
+from .executor import run_blocking
+from .clients import get_clients, run_sync
+from .metrics import stage, record_llm_usage
+from .cache import MemoryCache, get_summary_cache, make_cache_key
+from .map_reduce import condense_async, count_tokens, estimate_request_tokens, MAP_REDUCE_THRESHOLD_TOKENS
+from .rate_limit import create_completion
+from .ocr import ocr_image_async, route_timer
+
+logger = logging.getLogger(__name__)
+
+# Model used for every summary, translation and map-reduce call
+MODEL_NAME = "gpt-4o"
+
+# Characters of finished sentences to collect before starting TTS for a group.
+# The first group is sent as soon as one sentence is complete to minimise time to first audio.
+STREAM_TTS_GROUP_CHARS = int(os.environ.get("STREAM_TTS_GROUP_CHARS", 300))
+
+# Bump whenever the prompts change so cached summaries from older prompts are not reused
+PROMPT_VERSION = "1"
+
+# Effective resolution of the vision model: images are fitted into a square of
+# IMAGE_MAX_SIDE pixels, then scaled so their shorter side is at most IMAGE_SHORT_SIDE.
+# Anything larger is downscaled by the API anyway, so sending it only costs upload time.
+IMAGE_MAX_SIDE = int(os.environ.get("IMAGE_MAX_SIDE", 2048))
+IMAGE_SHORT_SIDE = int(os.environ.get("IMAGE_SHORT_SIDE", 768))
+
+# Format and quality of re-encoded images ("jpeg", "webp" or "png")
+IMAGE_ENCODE_FORMAT = os.environ.get("IMAGE_ENCODE_FORMAT", "jpeg").lower()
+IMAGE_QUALITY = int(os.environ.get("IMAGE_QUALITY", 85))
+
+# Memory budget for preprocessed image data URLs, keyed by the hash of the original bytes
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
 
 def get_image_data_url(image_path, image_format):
     """
@@ -18,27 +55,115 @@ def get_image_data_url(image_path, image_format):
     """
     try:
         with open(image_path, "rb") as image_file:
-            image_data = image_file.read()
-            base64_encoded = base64.b64encode(image_data).decode('utf-8')
-            return f"data:image/{image_format};base64,{base64_encoded}"
+            return image_bytes_to_data_url(image_file.read(), image_format)
     except Exception as e:
         return f"Error: Could not read image file: {e}"
 
+def image_bytes_to_data_url(image_data, image_format):
+    """
+    Convert raw image bytes to a data URL.
+    
+    :param image_data: Bytes of the image
+    :param image_format: Format of the image (jpg, png, etc.)
+    :return: Data URL of the image
+    """
+    base64_encoded = base64.b64encode(image_data).decode('utf-8')
+    return f"data:image/{image_format};base64,{base64_encoded}"
+
+def _target_size(width, height):
+    """Size an image is scaled to for the vision model, never upscaling."""
+    scale = min(1.0, IMAGE_MAX_SIDE / max(width, height))
+    short_side = min(width, height) * scale
+    if short_side > IMAGE_SHORT_SIDE:
+        scale *= IMAGE_SHORT_SIDE / short_side
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def preprocess_image(image_data, image_format):
+    """
+    Prepare an image for the vision model (blocking).
+    
+    Applies the EXIF orientation, downscales to the model's effective
+    resolution and re-encodes as IMAGE_ENCODE_FORMAT. Upright images that
+    are already small enough, or that re-encoding would not shrink, are
+    passed through unchanged.
+    
+    :param image_data: Raw bytes of the image
+    :param image_format: Format of the image (jpg, png, etc.)
+    :return: Tuple of (image bytes, format)
+    """
+    from PIL import ExifTags, Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(image_data))
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+        target = _target_size(*image.size)
+        if target == image.size and orientation == 1:
+            return image_data, image_format
+        # Let the JPEG decoder scale down by a power of two while decoding, which is much faster
+        image.draft("RGB", target)
+        image = ImageOps.exif_transpose(image)
+        if orientation in (5, 6, 7, 8):
+            target = target[::-1]
+        image = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        
+        encode_format = IMAGE_ENCODE_FORMAT
+        if encode_format == "jpeg" and image.mode != "RGB":
+            # JPEG has no alpha channel: flatten transparent images onto white
+            if "A" in image.getbands() or "transparency" in image.info:
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format=encode_format.upper(), quality=IMAGE_QUALITY, optimize=encode_format == "png")
+        if orientation == 1 and buffer.tell() >= len(image_data):
+            # Already compact (e.g. a messaging app's JPEG); the API scales it down itself
+            return image_data, image_format
+        return buffer.getvalue(), encode_format
+    except Exception as e:
+        logger.warning(f"Could not preprocess image, sending it as is: {e}")
+        return image_data, image_format
+
+_image_cache = MemoryCache(max_bytes=IMAGE_CACHE_MAX_BYTES)
+
+def prepare_image_data_url(image_data, image_format):
+    """
+    Preprocess an image and convert it to a data URL, reusing earlier results for the same bytes (blocking).
+    
+    :param image_data: Raw bytes of the image
+    :param image_format: Format of the image (jpg, png, etc.)
+    :return: Data URL of the preprocessed image
+    """
+    key = hashlib.sha256(image_data).hexdigest()
+    data_url = _image_cache.get(key)
+    if data_url is None:
+        data_url = image_bytes_to_data_url(*preprocess_image(image_data, image_format))
+        _image_cache.set(key, data_url, size=len(data_url))
+    return data_url
+
+def read_image(image_path):
+    """Read an image file's bytes (blocking)."""
+    with open(image_path, "rb") as image_file:
+        return image_file.read()
+
 # Map language codes to full language names for better API understanding
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'hi': 'Hindi',
+    'te': 'Telugu',
+    'ta': 'Tamil',
+    'bn': 'Bengali',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'pa': 'Punjabi'
+}
+
 def get_language_name(language_code):
-    language_map = {
-        'en': 'English',
-        'hi': 'Hindi',
-        'te': 'Telugu',
-        'ta': 'Tamil',
-        'bn': 'Bengali',
-        'mr': 'Marathi',
-        'gu': 'Gujarati',
-        'kn': 'Kannada',
-        'ml': 'Malayalam',
-        'pa': 'Punjabi'
-    }
-    return language_map.get(language_code, 'English')
+    return LANGUAGE_NAMES.get(language_code, 'English')
 
 def clean_text_for_tts(text):
     """
@@ -62,37 +187,19 @@ def clean_text_for_tts(text):
     
     return cleaned.strip()
 
-def extract_and_summarize_image(image_path: str, language: str = "te") -> dict:
-    """
-    Extract text from an image, summarize it, and generate TTS.
-    
-    :param image_path: Path to the image file.
-    :param language: Language code for the summary (default: "te").
-    :return: Dictionary with summary and audio
-    """
-    # Get the token from environment variables
-    token = os.environ.get("GITHUB_TOKEN")
-    if not token:
-        raise ValueError("GITHUB_TOKEN environment variable not set.")
-    
-    # Define endpoint and model name
-    endpoint = "https://models.inference.ai.azure.com"
-    model_name = "gpt-4o"
-    
-    # Determine image format from file extension
-    image_format = Path(image_path).suffix.lower().strip('.')
+def _get_image_format(image_path):
+    """Determine image format from file extension."""
+    return normalize_image_format(Path(image_path).suffix)
+
+def normalize_image_format(image_format):
+    """Map a file extension or format name to one usable in a data URL."""
+    image_format = (image_format or '').lower().strip('.')
     if image_format not in ['jpg', 'jpeg', 'png', 'gif']:
         image_format = 'jpeg'  # Default to jpeg if unknown format
-    
-    # Convert image to data URL
-    image_data_url = get_image_data_url(image_path, image_format)
-    
-    # Create an OpenAI client instance
-    client = OpenAI(
-        base_url=endpoint,
-        api_key=token,
-    )
-    
+    return image_format
+
+def _image_request(image_data_url, language):
+    """Build the chat completion arguments for summarizing an image."""
     # Get full language name for clearer instruction to the model
     language_name = get_language_name(language)
     
@@ -108,7 +215,7 @@ def extract_and_summarize_image(image_path: str, language: str = "te") -> dict:
     )
     
     # Send the image to the model with a prompt to extract and summarize text in one call
-    response = client.chat.completions.create(
+    return dict(
         messages=[
             {
                 "role": "system",
@@ -125,50 +232,11 @@ def extract_and_summarize_image(image_path: str, language: str = "te") -> dict:
         temperature=0.3,  # Lower temperature for more consistent output
         top_p=1.0,
         max_tokens=1500,
-        model=model_name
+        model=MODEL_NAME
     )
-    
-    # Extract summary from the response
-    summary = response.choices[0].message.content
-    
-    # Generate text-to-speech for the summary
-    try:
-        # Clean the text before sending to TTS service
-        cleaned_summary = clean_text_for_tts(summary)
-        audio_base64 = text_to_speech_telugu(cleaned_summary, language=language)
-    except Exception as e:
-        audio_base64 = []  # Return empty array on error
-        print(f"TTS generation failed: {e}")
-    
-    return {
-        "summary": summary,
-        "audio": audio_base64
-    }
 
-def azure_chatgpt_summarization(text: str, language: str = "te") -> dict:
-    """
-    Uses the GitHub-Azure ChatGPT model to summarize the input text.
-    Generates TTS for the summary.
-    
-    :param text: The text to summarize.
-    :param language: Language code for the summary (default: "te").
-    :return: Dictionary with summary and audio
-    """
-    # Get the token from environment variables
-    token = os.environ.get("GITHUB_TOKEN")
-    if not token:
-        raise ValueError("GITHUB_TOKEN environment variable not set.")
-    
-    # Define endpoint and model name
-    endpoint = "https://models.inference.ai.azure.com"
-    model_name = "gpt-4o"
-    
-    # Create an OpenAI client instance
-    client = OpenAI(
-        base_url=endpoint,
-        api_key=token,
-    )
-    
+def _text_request(text, language):
+    """Build the chat completion arguments for summarizing text."""
     # Get full language name for clearer instruction to the model
     language_name = get_language_name(language)
     
@@ -184,7 +252,7 @@ def azure_chatgpt_summarization(text: str, language: str = "te") -> dict:
     )
     
     # Build the messages for a summarization prompt with improved formatting instructions
-    response = client.chat.completions.create(
+    return dict(
         messages=[
             {
                 "role": "system",
@@ -198,22 +266,460 @@ def azure_chatgpt_summarization(text: str, language: str = "te") -> dict:
         temperature=0.7,
         top_p=1.0,
         max_tokens=1000,
-        model=model_name
+        model=MODEL_NAME
+    )
+
+def _translate_request(summary, language):
+    """Build the chat completion arguments for rewriting a finished summary in another language."""
+    language_name = get_language_name(language)
+    system_prompt = (
+        "You are a helpful assistant that translates summaries faithfully and naturally. "
+        "Keep every fact, name and number, and keep the structure of the summary. "
+        "IMPORTANT: Your translation MUST be between 500-1400 characters to ensure proper text-to-speech functionality. "
+        "Use clean formatting without asterisks or markdown symbols. "
+        f"You must respond in {language_name} language only."
+    )
+    return dict(
+        messages=[
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": f"Translate this summary into {language_name} language only:\n\n{summary}",
+            }
+        ],
+        temperature=0.3,
+        top_p=1.0,
+        max_tokens=1000,
+        model=MODEL_NAME
     )
+
+def cache_lookup(content, language, kind, use_cache):
+    """
+    Look up a finished result in the summary cache.
     
-    # Extract summary from the response
-    summary = response.choices[0].message.content
+    :param content: Extracted text or image bytes.
+    :param language: Language code of the summary.
+    :param kind: "text" or "image".
+    :param use_cache: When False the cache is skipped entirely.
+    :return: Tuple of (cache key or None, cached result or None).
+    """
+    if not use_cache:
+        return None, None
+    key = make_cache_key(content, language, MODEL_NAME, PROMPT_VERSION, kind=kind)
+    return key, get_summary_cache().get(key)
+
+def cache_store(key, result):
+    """Store a finished result, skipping results whose TTS failed so they get retried."""
+    if key is not None and result["audio"]:
+        get_summary_cache().set(key, result)
+
+async def cache_lookup_async(content, language, kind, use_cache):
+    """cache_lookup for async callers: hashing the content and reading the disk tier both block."""
+    if not use_cache:
+        return None, None
+    return await run_blocking(cache_lookup, content, language, kind, use_cache)
+
+async def cache_store_async(key, result):
+    """cache_store for async callers: serializing the result and writing the disk tier both block."""
+    if key is not None and result["audio"]:
+        await run_blocking(cache_store, key, result)
+
+async def _complete(client, request_args, stage_name="llm"):
+    """Make a model call through the endpoint's rate limiter, timed as the given stage."""
+    response = await create_completion(client, request_args, estimate_request_tokens(request_args), stage_name=stage_name)
+    record_llm_usage(response)
+    return response
+
+def _log_chunk_stats(chunk_stats):
+    for stats in chunk_stats:
+        logger.info(f"Map-reduce chunk {stats['index']}: {stats['input_tokens']} in / "
+                    f"{stats['output_tokens']} out tokens, {stats['seconds']:.2f}s")
+
+async def _condense(client, text):
+    """Condense long inputs with map-reduce so the final prompt fits the context window."""
+    condensed, chunk_stats = await condense_async(client, MODEL_NAME, text)
+    _log_chunk_stats(chunk_stats)
+    return condensed, chunk_stats
+
+async def _condense_standalone(text):
+    return await _condense(get_clients().openai, text)
+
+async def generate_audio_async(summary, language):
+    """
+    Generate TTS for a summary without blocking the event loop.
     
-    # Generate text-to-speech for the summary
+    :param summary: Summary text.
+    :param language: Language code for the speech.
+    :return: List of base64 audio chunks, empty on failure.
+    """
     try:
-        # Clean the text before sending to TTS service
-        cleaned_summary = clean_text_for_tts(summary)
-        audio_base64 = text_to_speech_telugu(cleaned_summary, language=language)
+        with stage("clean_text"):
+            cleaned_summary = clean_text_for_tts(summary)
+        return await text_to_speech_telugu_async(cleaned_summary, language=language)
     except Exception as e:
-        audio_base64 = []  # Return empty array on error
-        print(f"TTS generation failed: {e}")
+        logger.warning(f"TTS generation failed: {e}")
+        return []
+
+async def summarize_image_async(image_data: bytes, image_format: str, language: str) -> str:
+    """
+    Run only the model step for an image (no cache, no TTS).
+    
+    Text-heavy images that local OCR reads confidently are summarized from
+    their text with the cheaper text model call; others go to the vision model.
     
-    return {
+    :param image_data: Raw bytes of the image.
+    :param image_format: Format of the image (jpg, png, etc.).
+    :param language: Language code for the summary.
+    :return: Summary text.
+    """
+    start = time.perf_counter()
+    ocr = await ocr_image_async(image_data)
+    ocr_seconds = time.perf_counter() - start
+    if route_timer.route(ocr):
+        summary, _ = await summarize_text_async(ocr.text, language)
+        route_timer.text_path(time.perf_counter() - start)
+        return summary
+    
+    with stage("encode"):
+        image_data_url = await run_blocking(prepare_image_data_url, image_data, image_format)
+    response = await _complete(get_clients().openai, _image_request(image_data_url, language))
+    route_timer.vision_call(time.perf_counter() - start, ocr_seconds)
+    return response.choices[0].message.content
+
+async def summarize_text_async(text: str, language: str):
+    """
+    Run only the model step for text (no cache, no TTS), condensing long inputs first.
+    
+    :param text: The text to summarize.
+    :param language: Language code for the summary.
+    :return: Tuple of (summary text, map-reduce chunk stats).
+    """
+    client = get_clients().openai
+    # Long documents are condensed chunk by chunk before the final summary
+    text, chunk_stats = await _condense(client, text)
+    response = await _complete(client, _text_request(text, language))
+    return response.choices[0].message.content, chunk_stats
+
+def extract_and_summarize_image(image_path: str, language: str = "te", use_cache: bool = True) -> dict:
+    """
+    Extract text from an image, summarize it, and generate TTS.
+    
+    Runs extract_and_summarize_image_async on a new event loop, so it
+    cannot be called from a running one.
+    
+    :param image_path: Path to the image file.
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary with summary and audio
+    """
+    return run_sync(extract_and_summarize_image_async(image_path, language, use_cache))
+
+async def extract_and_summarize_image_async(image_path: str, language: str = "te", use_cache: bool = True) -> dict:
+    """
+    Summarize an image file and generate TTS without blocking the event loop.
+    
+    The image is read and encoded on the blocking executor; the model and TTS
+    calls are awaited so the event loop keeps serving other requests.
+    
+    :param image_path: Path to the image file.
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary with summary and audio
+    """
+    image_data = await run_blocking(read_image, image_path)
+    return await extract_and_summarize_image_bytes_async(image_data, _get_image_format(image_path), language, use_cache)
+
+async def extract_and_summarize_image_bytes_async(image_data: bytes, image_format: str = "jpeg", language: str = "te", use_cache: bool = True) -> dict:
+    """
+    Summarize an image held in memory, so uploads never need to touch disk.
+    
+    :param image_data: Raw bytes of the image.
+    :param image_format: Format of the image (jpg, png, etc.).
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary with summary and audio
+    """
+    key, cached = await cache_lookup_async(image_data, language, "image", use_cache)
+    if cached is not None:
+        return cached
+    summary = await summarize_image_async(image_data, image_format, language)
+    
+    result = {
         "summary": summary,
-        "audio": audio_base64
-    }
\ No newline at end of file
+        "audio": await generate_audio_async(summary, language)
+    }
+    await cache_store_async(key, result)
+    return result
+
+def azure_chatgpt_summarization(text: str, language: str = "te", use_cache: bool = True) -> dict:
+    """
+    Uses the GitHub-Azure ChatGPT model to summarize the input text.
+    Generates TTS for the summary.
+    
+    Runs azure_chatgpt_summarization_async on a new event loop, so it
+    cannot be called from a running one.
+    
+    :param text: The text to summarize.
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary with summary and audio
+    """
+    return run_sync(azure_chatgpt_summarization_async(text, language, use_cache))
+
+async def azure_chatgpt_summarization_async(text: str, language: str = "te", use_cache: bool = True) -> dict:
+    """
+    Summarize text and generate TTS without blocking the event loop.
+    
+    :param text: The text to summarize.
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary with summary and audio
+    """
+    key, cached = await cache_lookup_async(text, language, "text", use_cache)
+    if cached is not None:
+        return cached
+    
+    summary, chunk_stats = await summarize_text_async(text, language)
+    
+    result = {
+        "summary": summary,
+        "audio": await generate_audio_async(summary, language)
+    }
+    if chunk_stats:
+        result["chunk_stats"] = chunk_stats
+    await cache_store_async(key, result)
+    return result
+
+def _pivot_language(languages):
+    """Language to summarize the source in before translating: English if wanted, as the model's strongest."""
+    return "en" if "en" in languages else languages[0]
+
+async def _fan_out(content, kind, languages, use_cache, summarize_pivot):
+    """
+    Produce summaries of one source in several languages from a single pass over it.
+    
+    The source is summarized once, in a pivot language (or an already cached
+    summary is used as the pivot); every other language is a small
+    translation call on that summary. Translations and TTS for all languages
+    run concurrently.
+    
+    :param content: Extracted text or image bytes, for the cache key.
+    :param kind: "text" or "image".
+    :param languages: Language codes, without duplicates.
+    :param use_cache: Reuse and store results in the summary cache.
+    :param summarize_pivot: Coroutine function taking a language and returning (summary, chunk stats).
+    :return: Dictionary mapping each language to its result (summary and audio).
+    """
+    results, keys = {}, {}
+    for language in languages:
+        keys[language], cached = await cache_lookup_async(content, language, kind, use_cache)
+        if cached is not None:
+            results[language] = cached
+    missing = [language for language in languages if language not in results]
+    if not missing:
+        return results
+
+    async def finish(language, summary, chunk_stats=None):
+        result = {
+            "summary": summary,
+            "audio": await generate_audio_async(summary, language)
+        }
+        if chunk_stats:
+            result["chunk_stats"] = chunk_stats
+        await cache_store_async(keys[language], result)
+        results[language] = result
+
+    async def translate(language, pivot):
+        response = await _complete(get_clients().openai, _translate_request(pivot, language), stage_name="llm_translate")
+        await finish(language, response.choices[0].message.content)
+
+    if results:
+        # A summary already cached in another language saves reading the source again
+        pivot = results[_pivot_language(list(results))]["summary"]
+        work = []
+    else:
+        pivot_language = _pivot_language(missing)
+        pivot, chunk_stats = await summarize_pivot(pivot_language)
+        missing.remove(pivot_language)
+        work = [finish(pivot_language, pivot, chunk_stats)]
+    await asyncio.gather(*work, *(translate(language, pivot) for language in missing))
+    return {language: results[language] for language in languages}
+
+async def summarize_languages_async(text: str, languages: list, use_cache: bool = True) -> dict:
+    """
+    Summarize text in several languages, reading and condensing it only once.
+    
+    :param text: The text to summarize.
+    :param languages: Language codes for the summaries.
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary mapping each language code to a dictionary with summary and audio
+    """
+    return await _fan_out(text, "text", languages, use_cache,
+                          lambda language: summarize_text_async(text, language))
+
+async def summarize_image_languages_async(image_data: bytes, image_format: str, languages: list, use_cache: bool = True) -> dict:
+    """
+    Summarize an image in several languages, reading it only once.
+    
+    :param image_data: Raw bytes of the image.
+    :param image_format: Format of the image (jpg, png, etc.).
+    :param languages: Language codes for the summaries.
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Dictionary mapping each language code to a dictionary with summary and audio
+    """
+    async def summarize_pivot(language):
+        return await summarize_image_async(image_data, image_format, language), None
+
+    return await _fan_out(image_data, "image", languages, use_cache, summarize_pivot)
+
+def split_complete_sentences(buffer):
+    """
+    Split a growing piece of text at its last sentence boundary.
+    
+    :param buffer: Text received so far.
+    :return: Tuple of (complete sentences, unfinished remainder).
+    """
+    cut = 0
+    for match in SENTENCE_END.finditer(buffer):
+        cut = match.end()
+    return buffer[:cut], buffer[cut:]
+
+async def _stream_summary(request_args, language, key):
+    """
+    Stream a chat completion and synthesize speech sentence group by sentence group.
+    
+    Yields ("token", {"text": ...}) events as the model produces them and
+    ("audio", {"index": ..., "audio": [...]}) events, in order, as soon as each
+    group's TTS finishes, followed by a final ("done", {"summary": ...}) event.
+    A group whose TTS fails yields ("audio_error", {"index": ..., "detail": ...})
+    instead; the result is then not cached, as its audio has a gap.
+    """
+    events = asyncio.Queue()
+    tts_queue = asyncio.Queue()
+    tts_tasks = []
+    
+    async def start_tts(group):
+        cleaned = clean_text_for_tts(group)
+        if cleaned:
+            task = asyncio.create_task(text_to_speech_telugu_async(cleaned, language=language))
+            tts_tasks.append(task)
+            await tts_queue.put(task)
+    
+    async def produce():
+        try:
+            pending = ""
+            summary_parts = []
+            with stage("llm"):
+                stream = await create_completion(
+                    get_clients().openai, dict(request_args, stream=True), estimate_request_tokens(request_args), stage_name=None
+                )
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    summary_parts.append(delta)
+                    await events.put(("token", {"text": delta}))
+                    
+                    pending += delta
+                    complete, remainder = split_complete_sentences(pending)
+                    threshold = STREAM_TTS_GROUP_CHARS if tts_tasks else 1
+                    if complete and len(complete) >= threshold:
+                        await start_tts(complete)
+                        pending = remainder
+            if pending.strip():
+                await start_tts(pending)
+            await events.put(("summary", "".join(summary_parts)))
+        except Exception as e:
+            await events.put(("error", e))
+        finally:
+            await tts_queue.put(None)
+    
+    async def emit_audio():
+        # Wait for TTS groups strictly in order so the client can append chunks as they arrive
+        index = 0
+        while (task := await tts_queue.get()) is not None:
+            try:
+                await events.put(("audio", {"index": index, "audio": await task}))
+            except Exception as e:
+                logger.warning(f"TTS generation failed for stream group {index}: {e}")
+                await events.put(("audio_error", {"index": index, "detail": f"TTS generation failed: {e}"}))
+            index += 1
+        await events.put(("end", None))
+    
+    workers = [asyncio.create_task(produce()), asyncio.create_task(emit_audio())]
+    summary = None
+    all_audio = []
+    audio_failed = False
+    try:
+        while True:
+            event, data = await events.get()
+            if event == "end":
+                break
+            if event == "error":
+                raise data
+            if event == "summary":
+                summary = data
+                continue
+            if event == "audio":
+                all_audio.extend(data["audio"])
+            elif event == "audio_error":
+                audio_failed = True
+            yield event, data
+        # Audio missing a group would be served to every later request for the same input
+        if not audio_failed:
+            await cache_store_async(key, {"summary": summary, "audio": all_audio})
+        yield "done", {"summary": summary}
+    finally:
+        # Stop upstream work if the client went away mid-stream
+        for task in [*workers, *tts_tasks]:
+            task.cancel()
+
+async def _replay_cached(cached):
+    """Replay a cached result as stream events."""
+    yield "token", {"text": cached["summary"]}
+    yield "audio", {"index": 0, "audio": cached["audio"]}
+    yield "done", {"summary": cached["summary"]}
+
+async def stream_summarization_async(text: str, language: str = "te", use_cache: bool = True):
+    """
+    Streaming variant of azure_chatgpt_summarization.
+    
+    :param text: The text to summarize.
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Async iterator of (event, data) tuples; see _stream_summary.
+    """
+    key, cached = await cache_lookup_async(text, language, "text", use_cache)
+    if cached is not None:
+        return _replay_cached(cached)
+    return _stream_text_summary(text, language, key)
+
+async def _stream_text_summary(text, language, key):
+    """Condense long text first, then stream the final summary."""
+    if count_tokens(text) > MAP_REDUCE_THRESHOLD_TOKENS:
+        text, _ = await _condense_standalone(text)
+    async for event, data in _stream_summary(_text_request(text, language), language, key):
+        yield event, data
+
+async def stream_image_summary_async(image_path: str, language: str = "te", use_cache: bool = True):
+    """
+    Streaming variant of extract_and_summarize_image.
+    
+    :param image_path: Path to the image file.
+    :param language: Language code for the summary (default: "te").
+    :param use_cache: Reuse and store results in the summary cache (default: True).
+    :return: Async iterator of (event, data) tuples; see _stream_summary.
+    """
+    image_data = await run_blocking(read_image, image_path)
+    key, cached = await cache_lookup_async(image_data, language, "image", use_cache)
+    if cached is not None:
+        return _replay_cached(cached)
+    ocr = await ocr_image_async(image_data)
+    if route_timer.route(ocr):
+        return _stream_text_summary(ocr.text, language, key)
+    with stage("encode"):
+        image_data_url = await run_blocking(prepare_image_data_url, image_data, _get_image_format(image_path))
+    return _stream_summary(_image_request(image_data_url, language), language, key)
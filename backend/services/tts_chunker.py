@@ -0,0 +1,168 @@
+import re
+import unicodedata
+
+try:
+    import regex  # Optional: full Unicode extended grapheme clusters when installed
+except ImportError:
+    regex = None
+
+# Sentence terminators (Latin and Indic danda) with any closing quotes or brackets, followed by whitespace,
+# or a line break. A terminator at the very end of the text is left for the caller: it may still be growing.
+SENTENCE_END = re.compile(r'[.!?।॥]+["\'”’)\]]*(?=\s)|\n')
+
+_ZWJ = "‍"
+_ZWNJ = "‌"
+
+# Canonical combining class of viramas (halant), which join consonants into conjuncts
+_VIRAMA_CLASS = 9
+
+def split_sentences(text):
+    """
+    Split normalized text into sentences.
+
+    :param text: Text with single spaces between words.
+    :return: List of sentences without surrounding spaces.
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+def _extends_cluster(previous, char):
+    """Whether char continues the grapheme cluster ending in previous (approximation without regex)."""
+    if char in (_ZWJ, _ZWNJ) or previous == _ZWJ:
+        return True
+    if unicodedata.category(char) in ("Mn", "Mc", "Me"):
+        return True
+    # Indic conjuncts: a virama followed by a consonant stays in one cluster
+    return unicodedata.combining(previous) == _VIRAMA_CLASS and unicodedata.category(char) == "Lo"
+
+def split_graphemes(text):
+    """
+    Split text into user-perceived characters (grapheme clusters).
+
+    Uses the regex module's \\X when installed, otherwise keeps base characters
+    together with their combining marks, joiners and virama conjuncts.
+
+    :param text: Text to split.
+    :return: List of grapheme clusters.
+    """
+    if regex is not None:
+        return regex.findall(r"\X", text)
+    clusters = []
+    for char in text:
+        if clusters and _extends_cluster(clusters[-1][-1], char):
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+    return clusters
+
+# Preference for cutting after a piece: sentence end, clause end, word end, inside a word
+_SENTENCE, _CLAUSE, _WORD, _INSIDE_WORD = 3, 2, 1, 0
+
+_CLAUSE_END = (",", ";", ":", "—")
+
+def _units(text, max_chars):
+    """
+    Break text into words, and words longer than max_chars into grapheme clusters.
+
+    :return: List of (piece, separator, rank) tuples, where separator goes
+             between the piece and the previous one when both land in the same
+             chunk, and rank is how good a place the end of the piece is to cut.
+    """
+    units = []
+    for sentence in split_sentences(text):
+        words = sentence.split(" ")
+        for index, word in enumerate(words):
+            if index == len(words) - 1:
+                rank = _SENTENCE
+            elif word.endswith(_CLAUSE_END):
+                rank = _CLAUSE
+            else:
+                rank = _WORD
+            if len(word) <= max_chars:
+                units.append((word, " ", rank))
+                continue
+            # Too long for any chunk: let it break between any two grapheme clusters
+            graphemes = split_graphemes(word)
+            units.append((graphemes[0], " ", _INSIDE_WORD))
+            units.extend((grapheme, "", _INSIDE_WORD) for grapheme in graphemes[1:])
+            units[-1] = (units[-1][0], units[-1][1], rank)
+    return units
+
+def chunk_text(text, max_chars):
+    """
+    Split text into the fewest chunks of at most max_chars characters.
+
+    Chunks only break between words (or between grapheme clusters inside a
+    single word longer than a chunk), so no cluster is ever split. Among the
+    cut points that still give the fewest chunks, each chunk ends at the last
+    sentence end it can, else the last clause end, else the last word.
+
+    Runs in linear time: greedy filling gives the fewest chunks for every
+    suffix of the text, which is computed right to left, and each chunk then
+    only looks back over its own pieces.
+
+    :param text: Normalized text (single spaces, no line breaks).
+    :param max_chars: Largest allowed chunk, in characters.
+    :return: List of chunks, in order.
+    """
+    units = _units(text, max_chars)
+    count = len(units)
+    offsets = [0]
+    for piece, separator, _ in units:
+        offsets.append(offsets[-1] + len(separator) + len(piece))
+    
+    def span(start, end):
+        # Characters in a chunk of units[start:end], without the first separator
+        return offsets[end] - offsets[start] - len(units[start][1])
+    
+    # furthest[i]: end of the longest chunk starting at unit i
+    furthest = [0] * count
+    end = 0
+    for start in range(count):
+        end = max(end, start + 1)
+        while end < count and span(start, end + 1) <= max_chars:
+            end += 1
+        furthest[start] = end
+    
+    # fewest[i]: fewest chunks needed for units[i:]
+    fewest = [0] * (count + 1)
+    for start in range(count - 1, -1, -1):
+        fewest[start] = 1 + fewest[furthest[start]]
+    
+    chunks = []
+    start = 0
+    while start < count:
+        # fewest never increases with the start, so the ends keeping the count minimal form a range ending at furthest
+        best, best_rank = furthest[start], -1
+        end = furthest[start]
+        while end > start and fewest[end] == fewest[start] - 1:
+            rank = _SENTENCE + 1 if end == count else units[end - 1][2]
+            if rank > best_rank:
+                best, best_rank = end, rank
+            end -= 1
+        parts = [units[start][0]]
+        for piece, separator, _ in units[start + 1:best]:
+            parts.append(separator)
+            parts.append(piece)
+        chunks.append("".join(parts))
+        start = best
+    return chunks
+
+def batch_chunks(chunks, batch_size):
+    """
+    Group chunks into batches of up to batch_size, filling every batch but the last.
+
+    :param chunks: List of text chunks.
+    :param batch_size: Most chunks per batch.
+    :return: List of batches.
+    """
+    return [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
@@ -1,12 +1,128 @@
+import asyncio
+import logging
 import os
 import re
-from dotenv import load_dotenv
-import requests
+
+from .clients import get_clients, run_sync
+from .config import get_settings
+from .metrics import stage, TTS_CHARACTERS
+from .rate_limit import get_limiter, is_retryable, retry_delay
+from .tts_chunker import chunk_text, batch_chunks
+
+logger = logging.getLogger(__name__)
+
+# Sarvam TTS endpoint (overridable so the service can be pointed at a local stub)
+SARVAM_TTS_URL = get_settings().sarvam_tts_url
+
+# Max characters per chunk (API limit)
+MAX_CHUNK_CHARS = 500
+
+# Maximum chunks per API call for Sarvam API
+BATCH_SIZE = 3
+
+# Number of batches sent to the API at the same time
+MAX_PARALLEL_BATCHES = int(os.environ.get("TTS_MAX_PARALLEL_BATCHES", 4))
+
+# Retries per batch on 429/5xx responses, waiting for Retry-After or an exponential backoff starting at RETRY_BACKOFF seconds
+MAX_RETRIES = int(os.environ.get("TTS_MAX_RETRIES", 3))
+RETRY_BACKOFF = float(os.environ.get("TTS_RETRY_BACKOFF", 0.5))
+
+# Allowed target languages for the Sarvam API
+ALLOWED_LANGUAGES = {
+    'en': 'English',
+    'hi': 'Hindi',
+    'te': 'Telugu',
+    'ta': 'Tamil',
+    'bn': 'Bengali',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'pa': 'Punjabi'
+}
+
+def _prepare_batches(text, language):
+    """
+    Clean the text, split it into API-sized chunks and group them into batches.
+    
+    :param text: Text to convert to speech.
+    :param language: Two-letter language code.
+    :return: List of batches, each a list of up to BATCH_SIZE text chunks.
+    """
+    # Final cleanup of any remaining special characters
+    # Remove all special formatting chars that could cause issues with TTS
+    text = re.sub(r'[*_~`#]', '', text)
+    # Collapse line breaks and runs of whitespace into single spaces so words on separate lines stay apart
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    
+    # Pack whole sentences into as few MAX_CHUNK_CHARS chunks as possible
+    inputs = chunk_text(text, MAX_CHUNK_CHARS)
+    
+    # Validate the language parameter against allowed options
+    if language not in ALLOWED_LANGUAGES:
+        raise ValueError(f"Language '{language}' is not supported. Allowed languages: {list(ALLOWED_LANGUAGES.keys())}")
+    
+    TTS_CHARACTERS.inc(len(text))
+    
+    # Process in batches of BATCH_SIZE chunks per API call (max allowed by Sarvam API)
+    return batch_chunks(inputs, BATCH_SIZE)
+
+def _build_request(batch_inputs, speaker, pitch, pace, loudness, sample_rate, language):
+    """Build the payload and headers for a single Sarvam TTS batch request."""
+    # Construct target_language_code using the provided language code (e.g., "te-IN")
+    payload = {
+        "speaker": speaker,
+        "pitch": pitch,
+        "pace": pace,
+        "loudness": loudness,
+        "speech_sample_rate": sample_rate,
+        "enable_preprocessing": True,
+        "target_language_code": f"{language}-IN",
+        "model": "bulbul:v2",
+        "inputs": batch_inputs,
+    }
+    headers = {
+        "api-subscription-key": get_settings().sarvam_api_key,
+        "Content-Type": "application/json"
+    }
+    return payload, headers
+
+def _extract_audios(response_data):
+    """Pull the list of base64 audio chunks out of a Sarvam TTS response."""
+    # The API returns an array of audio chunks in the "audios" field
+    if "audios" in response_data and isinstance(response_data["audios"], list):
+        return response_data["audios"]
+    logger.warning(f"Unexpected TTS API response format: {response_data}")
+    return []
+
+def _retry_delay(limiter, response, attempt):
+    return retry_delay(limiter, response.status_code, response.headers, attempt, MAX_RETRIES, RETRY_BACKOFF)
+
+def _batch_characters(payload):
+    return sum(len(text) for text in payload["inputs"])
+
+async def _post_batch_async(client, payload, headers):
+    """Send one TTS batch through the rate limiter, retrying on 429/5xx, and return its audio chunks."""
+    limiter = get_limiter("tts")
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire(_batch_characters(payload))
+        with stage("tts_batch"):
+            response = await client.post(SARVAM_TTS_URL, json=payload, headers=headers)
+        delay = await limiter.run(_retry_delay, limiter, response, attempt) if is_retryable(response.status_code) else None
+        if delay is not None:
+            await asyncio.sleep(delay)
+            continue
+        response.raise_for_status()
+        return _extract_audios(response.json())
 
 def text_to_speech_telugu(text, speaker="manisha", pitch=0, pace=1, loudness=1, sample_rate=22050, language="te"):
     """
     Convert Telugu (or other supported language) text to speech using Sarvam TTS API.
     
+    Runs text_to_speech_telugu_async on a new event loop, so it cannot be
+    called from a running one.
+    
     Args:
         text (str): Text to convert to speech.
         speaker (str, optional): Voice speaker name. Defaults to "manisha".
@@ -30,89 +146,30 @@ def text_to_speech_telugu(text, speaker="manisha", pitch=0, pace=1, loudness=1,
     Returns:
         list: Array of Base64 encoded audio strings for all chunks
     """
-    # Load environment variables
-    load_dotenv()
-    
-    # Get API key from environment variables
-    api_key = os.getenv("api-subscription-key")
-    
-    # Final cleanup of any remaining special characters
-    # Remove all special formatting chars that could cause issues with TTS
-    text = re.sub(r'[*_~`#\r\n\t\f\v]', '', text)
-    # Replace multiple spaces with a single space
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    
-    # Max characters per chunk (API limit)
-    max_chunk_chars = 500
-    
-    # Split text into chunks of max_chunk_chars characters
-    inputs = []
-    for i in range(0, len(text), max_chunk_chars):
-        chunk = text[i:i + max_chunk_chars]
-        inputs.append(chunk)
-    
-    # Validate the language parameter against allowed options
-    allowed_languages = {
-        'en': 'English',
-        'hi': 'Hindi',
-        'te': 'Telugu',
-        'ta': 'Tamil',
-        'bn': 'Bengali',
-        'mr': 'Marathi',
-        'gu': 'Gujarati',
-        'kn': 'Kannada',
-        'ml': 'Malayalam',
-        'pa': 'Punjabi'
-    }
-    if language not in allowed_languages:
-        raise ValueError(f"Language '{language}' is not supported. Allowed languages: {list(allowed_languages.keys())}")
-    
-    # Construct target_language_code using the provided language code (e.g., "te-IN")
-    target_language_code = f"{language}-IN"
+    return run_sync(text_to_speech_telugu_async(text, speaker, pitch, pace, loudness, sample_rate, language))
+
+async def text_to_speech_telugu_async(text, speaker="manisha", pitch=0, pace=1, loudness=1, sample_rate=22050, language="te"):
+    """
+    Async variant of text_to_speech_telugu that does not block the event loop.
     
-    # Process in batches of 3 chunks per API call (max allowed by Sarvam API)
-    all_audio_chunks = []
-    batch_size = 3  # Maximum chunks per API call for Sarvam API
+    Takes the same arguments and returns the same list of Base64 encoded
+    audio strings as text_to_speech_telugu. Batches are sent concurrently,
+    at most MAX_PARALLEL_BATCHES at a time.
+    """
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_BATCHES)
     
-    for i in range(0, len(inputs), batch_size):
-        batch_inputs = inputs[i:i + batch_size]
-        
-        # API endpoint
-        url = "https://api.sarvam.ai/text-to-speech"
-        
-        # Payload configuration
-        payload = {
-            "speaker": speaker,
-            "pitch": pitch,
-            "pace": pace,
-            "loudness": loudness,
-            "speech_sample_rate": sample_rate,
-            "enable_preprocessing": True,
-            "target_language_code": target_language_code,
-            "model": "bulbul:v2",
-            "inputs": batch_inputs,
-        }
-        
-        # Headers
-        headers = {
-            "api-subscription-key": api_key,
-            "Content-Type": "application/json"
-        }
-        
-        # Make API request
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()  # Raise an error for non-200 responses
-        
-        # Parse response and add audio chunks to our collection
-        response_data = response.json()
-        
-        # The API returns an array of audio chunks in the "audios" field
-        if "audios" in response_data and isinstance(response_data["audios"], list):
-            all_audio_chunks.extend(response_data["audios"])
-        else:
-            print(f"Warning: Unexpected API response format: {response_data}")
+    async def send(client, batch_inputs):
+        payload, headers = _build_request(batch_inputs, speaker, pitch, pace, loudness, sample_rate, language)
+        async with semaphore:
+            return await _post_batch_async(client, payload, headers)
     
-    # Always return the array of audio chunks, even if there's only one
-    # This ensures consistent handling in the frontend
-    return all_audio_chunks
\ No newline at end of file
+    client = get_clients().http
+    tasks = [asyncio.create_task(send(client, batch)) for batch in _prepare_batches(text, language)]
+    try:
+        # gather() returns results in submission order, so chunks stay in text order
+        results = await asyncio.gather(*tasks)
+    finally:
+        # One failed batch fails the whole text (as does cancellation): stop spending quota on the rest
+        for task in tasks:
+            task.cancel()
+    return [audio for audios in results for audio in audios]
@@ -0,0 +1,68 @@
+import logging
+import os
+import time
+
+from .article_scraper import available_engines
+from .audio import get_audio_store
+from .cache import get_summary_cache
+from .clients import get_clients
+from .executor import run_blocking
+from .map_reduce import count_tokens
+from .ocr import ocr_available
+from .rate_limit import get_limiter
+
+logger = logging.getLogger(__name__)
+
+# Warm-up at application startup: "off", "background" (serve at once and warm up alongside)
+# or "blocking" (finish warming up before the first request is accepted)
+STARTUP_WARMUP = os.environ.get("STARTUP_WARMUP", "background").lower()
+
+def _import_libraries():
+    """Import the libraries the request paths load on first use."""
+    import fitz  # noqa: F401
+    import openai  # noqa: F401
+    from PIL import Image  # noqa: F401
+    from bs4 import BeautifulSoup  # noqa: F401
+
+    available_engines()
+    ocr_available()
+
+def _prime_caches():
+    """Open the summary cache, audio store and shared state, and load the tokenizer."""
+    get_summary_cache()
+    get_audio_store()
+    get_limiter("llm")
+    get_limiter("tts")
+    count_tokens("warm-up")
+
+async def warm_up():
+    """
+    Do the one-off work the first requests would otherwise pay for.
+
+    Imports the heavy libraries, opens the summary cache and shared state,
+    loads the tokenizer and opens connections to the model endpoint and the
+    TTS host. A failing step is logged and skipped; warm-up never stops the
+    application from starting.
+
+    :return: Dict of step name to seconds taken.
+    """
+    timings = {}
+
+    async def step(name, coro_func):
+        start = time.perf_counter()
+        try:
+            await coro_func()
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e}")
+        timings[name] = time.perf_counter() - start
+
+    async def preconnect():
+        for url, error in (await get_clients().preconnect()).items():
+            if error is not None:
+                logger.warning(f"Warm-up could not connect to {url}: {error!r}")
+
+    await step("imports", lambda: run_blocking(_import_libraries))
+    await step("caches", lambda: run_blocking(_prime_caches))
+    await step("connections", preconnect)
+    logger.info("Warm-up done: " + ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items()))
+    return timings
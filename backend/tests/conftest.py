@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The services are imported as top-level packages, as the API does with backend/ on its path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
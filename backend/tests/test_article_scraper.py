@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from services import article_scraper
+from services.article_scraper import Article, ArticleFetchError, available_engines, extract_article
+
+PARAGRAPH = "This sentence is long enough to count as a paragraph of the article. "
+
+PAGE = f"""<html><head><title>Headline</title></head><body>
+<nav><a href="/">Home</a></nav>
+<div class="content"><p>{PARAGRAPH * 3}</p><p>{PARAGRAPH * 2}</p></div>
+<div class="comments"><p>{PARAGRAPH} A reader's comment.</p></div>
+<div id="sidebar"><p>{PARAGRAPH} Sidebar promotion.</p></div>
+</body></html>"""
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_boilerplate_containers_are_dropped(engine):
+    article = extract_article(PAGE, engine=engine)
+    assert article.title == "Headline"
+    assert "comment" not in article.text and "Sidebar" not in article.text
+    assert article.text.count(PARAGRAPH.strip()) == 5
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_container_holding_most_of_the_text_is_kept(engine):
+    page = f'<html><body><div class="share"><p>{PARAGRAPH * 5}</p></div><p>{PARAGRAPH}</p></body></html>'
+    assert extract_article(page, engine=engine).text.count(PARAGRAPH.strip()) >= 5
+
+@pytest.mark.parametrize("engine", available_engines())
+def test_deeply_nested_pages_are_extracted(engine):
+    depth = 200  # Within every parser's nesting limit
+    page = "<html><body>" + '<div class="x">' * depth + f"<p>{PARAGRAPH}</p>" + "</div>" * depth + "</body></html>"
+    assert extract_article(page, engine=engine).text == PARAGRAPH.strip()
+
+def extract(monkeypatch, fetch):
+    monkeypatch.setattr(article_scraper, "fetch_article_async", fetch)
+    return asyncio.run(article_scraper.extract_text_from_url_async("https://example.com/a"))
+
+def test_fetch_failures_raise_article_fetch_error(monkeypatch):
+    async def not_found(url):
+        raise ArticleFetchError("Error fetching the article: 404")
+
+    with pytest.raises(ArticleFetchError, match="404"):
+        extract(monkeypatch, not_found)
+
+def test_parse_failures_raise_article_fetch_error(monkeypatch):
+    async def unparsable(url):
+        raise ValueError("Document is empty")
+
+    with pytest.raises(ArticleFetchError, match="Document is empty"):
+        extract(monkeypatch, unparsable)
+
+def test_pages_without_text_raise_article_fetch_error(monkeypatch):
+    async def empty(url):
+        return Article(title="", text="", html_bytes=10, text_bytes=0, parser="html.parser")
+
+    with pytest.raises(ArticleFetchError):
+        extract(monkeypatch, empty)
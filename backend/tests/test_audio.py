@@ -0,0 +1,61 @@
+import asyncio
+import base64
+import io
+import wave
+
+import pytest
+
+from services import audio
+from services.audio import parse_byte_range
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-", (10, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=990-5000", (990, 999)),
+    (None, None),
+    ("items=0-10", None),
+    ("bytes=0-10,20-30", None),
+    ("bytes=abc-", None),
+    # last-byte-pos before first-byte-pos is invalid, so the header is ignored rather than answered with 416
+    ("bytes=5-3", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 1000) == expected
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+def test_unsatisfiable_ranges_raise(header):
+    with pytest.raises(ValueError):
+        parse_byte_range(header, 1000)
+
+def wav_chunk(frames):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(22050)
+        wav.writeframes(b"\x01\x00" * frames)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(audio, "_audio_store", audio.MemoryCache(max_bytes=1024 * 1024))
+    monkeypatch.setattr(audio, "AUDIO_FORMAT", "wav")
+
+def test_published_audio_is_merged_once_per_content(store):
+    chunks = [wav_chunk(100), wav_chunk(50)]
+
+    async def main():
+        return await audio.publish_audio(chunks), await audio.publish_audio(list(chunks))
+
+    first, second = asyncio.run(main())
+    assert first == second == audio.audio_id(chunks)
+    data, media_type = asyncio.run(audio.get_audio(first))
+    assert media_type == "audio/wav"
+    with wave.open(io.BytesIO(data)) as merged:
+        assert merged.getnframes() == 150
+
+def test_unmergeable_audio_is_not_published(store):
+    assert asyncio.run(audio.publish_audio([base64.b64encode(b"not a wav file").decode("ascii")])) is None
+    assert asyncio.run(audio.publish_audio([])) is None
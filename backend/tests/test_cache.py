@@ -0,0 +1,21 @@
+import time
+
+from services.cache import MemoryCache, SQLiteCache, TieredCache
+
+def test_disk_hits_keep_their_remaining_lifetime_in_memory(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=0.2)
+    disk.set("key", {"summary": "text"})
+    cache = TieredCache(MemoryCache(max_bytes=1024, ttl=60), disk)
+    assert cache.get("key") == {"summary": "text"}
+    time.sleep(0.3)
+    # The promoted copy expires with the disk row rather than a fresh memory TTL
+    assert cache.memory.get("key") is None
+    assert cache.get("key") is None
+
+def test_memory_entries_default_to_the_cache_ttl():
+    cache = MemoryCache(max_bytes=1024, ttl=0.05)
+    cache.set("short", 1)
+    cache.set("pinned", 2, expires_at=time.time() + 60)
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.get("pinned") == 2
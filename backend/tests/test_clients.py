@@ -0,0 +1,39 @@
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from services import clients
+from services.clients import ClientRegistry
+
+@pytest.fixture
+def registry():
+    settings = types.SimpleNamespace(http_pool_size=2, read_timeout=5.0, connect_timeout=1.0, http2=False)
+    return ClientRegistry(settings)
+
+def test_clients_from_a_finished_loop_are_closed_by_the_next_one(registry):
+    async def use():
+        return registry.http
+
+    stale = asyncio.run(use())
+
+    async def next_loop():
+        current = registry.http
+        await asyncio.sleep(0)  # Lets the scheduled close run
+        return current
+
+    current = asyncio.run(next_loop())
+    assert current is not stale
+    assert stale.is_closed and not current.is_closed
+
+def test_sync_callers_close_the_clients_they_opened(registry, monkeypatch):
+    monkeypatch.setattr(clients, "get_clients", lambda: registry)
+
+    async def use():
+        return registry.http
+
+    http = clients.run_sync(use())
+    assert http.is_closed
+    assert registry._http is None
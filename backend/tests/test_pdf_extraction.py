@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from services import pdf_extraction
+from services.pdf_extraction import extract_text_from_pdf
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for number in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {number + 1} text")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+@pytest.fixture(scope="module")
+def workers():
+    yield
+    pdf_extraction.shutdown_pdf_workers()
+
+def test_serial_extraction_respects_range_and_budget():
+    data = make_pdf(5)
+    text = extract_text_from_pdf(data, max_chars=None, parallel=False)
+    assert [line for line in text.splitlines() if line] == [f"Page {n} text" for n in range(1, 6)]
+    assert extract_text_from_pdf(data, max_chars=None, page_range=(1, 3)).split() == "Page 2 text Page 3 text".split()
+    assert len(extract_text_from_pdf(data, max_chars=10)) == 10
+    assert extract_text_from_pdf(memoryview(data), max_chars=None, parallel=False) == text
+
+def test_parallel_extraction_matches_serial_and_removes_its_temporary_file(workers, monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_extraction, "PDF_PAGES_PER_TASK", 2)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    data = make_pdf(7)
+    assert extract_text_from_pdf(bytearray(data), max_chars=None, parallel=True) == \
+        extract_text_from_pdf(data, max_chars=None, parallel=False)
+    assert os.listdir(tmp_path) == []
+
+def test_parallel_extraction_reads_paths_in_place(workers, monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_extraction, "PDF_PAGES_PER_TASK", 2)
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(make_pdf(5))
+    assert extract_text_from_pdf(str(path), max_chars=None, parallel=True) == \
+        extract_text_from_pdf(str(path), max_chars=None, parallel=False)
+
+def test_unreadable_pdf_returns_an_error():
+    assert extract_text_from_pdf(b"not a pdf").startswith("Error extracting PDF text")
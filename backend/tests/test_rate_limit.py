@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+
+from services.rate_limit import (
+    TokenBucket, UpstreamBusy, UpstreamLimiter, parse_retry_after, retry_delay, set_deadline,
+)
+from services.shared_state import SQLiteState
+
+def acquire(limiter):
+    asyncio.run(limiter.acquire())
+
+@pytest.fixture(autouse=True)
+def no_deadline():
+    set_deadline(None)
+    yield
+    set_deadline(None)
+
+def test_bucket_goes_into_debt_and_refills():
+    bucket = TokenBucket(per_minute=60, burst_seconds=2)  # 1 per second, holding 2
+    now = bucket._updated
+    assert bucket.reserve(2, now) == 0.0
+    assert bucket.reserve(1, now) == pytest.approx(1.0)
+    assert bucket.reserve(1, now + 1.0) == pytest.approx(1.0)
+    bucket.refund(1)
+    assert bucket.reserve(0, now + 1.0) == 0.0
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(per_minute=0)
+    assert bucket.reserve(10 ** 9, time.monotonic()) == 0.0
+
+def test_parse_retry_after():
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+def test_acquire_waits_for_capacity():
+    limiter = UpstreamLimiter("test", requests_per_minute=600, max_queue=10)  # 10 per second, burst of 60
+    limiter.requests.load([0.0, time.monotonic()])
+
+    async def main():
+        start = time.perf_counter()
+        await limiter.acquire()
+        return time.perf_counter() - start
+
+    assert 0.05 <= asyncio.run(main()) < 1.0
+
+def test_calls_past_the_deadline_are_shed_and_refunded():
+    limiter = UpstreamLimiter("test", requests_per_minute=60, max_queue=10)
+    limiter.requests.load([0.0, time.monotonic()])
+    set_deadline(0.5)
+    with pytest.raises(UpstreamBusy) as busy:
+        acquire(limiter)
+    assert busy.value.retry_after == pytest.approx(1.0, abs=0.1)
+    assert "rate limit" in str(busy.value)
+    # The shed call gave its reservation back
+    assert limiter.requests.reserve(0, time.monotonic()) == pytest.approx(0.0, abs=0.1)
+
+def test_full_queue_sheds_at_once():
+    limiter = UpstreamLimiter("test", requests_per_minute=60, max_queue=0)
+    limiter.requests.load([0.0, time.monotonic()])
+    with pytest.raises(UpstreamBusy):
+        acquire(limiter)
+
+def test_429_pauses_every_caller():
+    limiter = UpstreamLimiter("test")
+    assert retry_delay(limiter, 429, {"retry-after": "2"}, attempt=0, max_retries=3, backoff=0.1) == 0.0
+    set_deadline(1.0)
+    with pytest.raises(UpstreamBusy):
+        acquire(limiter)
+
+def test_retry_policy():
+    limiter = UpstreamLimiter("test")
+    assert retry_delay(limiter, 400, {}, attempt=0, max_retries=3, backoff=0.1) is None
+    assert retry_delay(limiter, 503, {"retry-after": "0.2"}, attempt=0, max_retries=3, backoff=0.1) == 0.2
+    assert retry_delay(limiter, 503, {}, attempt=3, max_retries=3, backoff=0.1) is None
+    with pytest.raises(UpstreamBusy):
+        retry_delay(limiter, 429, {"retry-after": "1"}, attempt=3, max_retries=3, backoff=0.1)
+
+def test_5xx_past_the_deadline_reports_its_status():
+    limiter = UpstreamLimiter("test")
+    set_deadline(0.5)
+    with pytest.raises(UpstreamBusy) as busy:
+        retry_delay(limiter, 503, {"retry-after": "5"}, attempt=0, max_retries=3, backoff=0.1)
+    assert busy.value.status_code == 503
+    assert "HTTP 503" in str(busy.value) and "rate limit" not in str(busy.value)
+
+def test_shared_buckets_hold_the_quota_across_workers(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    # Two limiters on one file stand in for two worker processes
+    first = UpstreamLimiter("llm", requests_per_minute=60, state=SQLiteState(path))
+    second = UpstreamLimiter("llm", requests_per_minute=60, state=SQLiteState(path))
+    burst = int(first.requests.capacity)
+    set_deadline(0.5)
+    admitted = 0
+    for limiter in [first, second] * burst:
+        try:
+            acquire(limiter)
+            admitted += 1
+        except UpstreamBusy:
+            pass
+    assert admitted == burst
+
+def test_shared_pause_reaches_other_workers(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first = UpstreamLimiter("tts", state=SQLiteState(path))
+    second = UpstreamLimiter("tts", state=SQLiteState(path))
+    first.throttled(5)
+    set_deadline(1.0)
+    with pytest.raises(UpstreamBusy):
+        acquire(second)
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.shared_state import MemoryState, SQLiteState
+
+@pytest.fixture(params=["memory", "sqlite"])
+def state(request, tmp_path):
+    return MemoryState() if request.param == "memory" else SQLiteState(str(tmp_path / "state.sqlite3"))
+
+def test_values_round_trip_by_namespace(state):
+    state.set("a", "key", {"n": 1})
+    state.set("b", "key", b"\x00bytes")
+    assert state.get("a", "key") == {"n": 1}
+    assert state.get("b", "key") == b"\x00bytes"
+    assert state.get("c", "key") is None
+    state.delete("a", "key")
+    assert state.get("a", "key") is None
+
+def test_values_expire(state):
+    state.set("ns", "short", 1, ttl=0.05)
+    state.set("ns", "long", 2, ttl=60)
+    time.sleep(0.1)
+    assert state.get("ns", "short") is None
+    assert state.get("ns", "long") == 2
+
+def test_record_saves_changes(state):
+    with state.record("ns", "counter") as record:
+        record["hits"] = record.get("hits", 0) + 1
+    with state.record("ns", "counter") as record:
+        record["hits"] += 1
+    assert state.get("ns", "counter") == {"hits": 2}
+
+def test_record_is_atomic_across_threads(state):
+    def add():
+        for _ in range(50):
+            with state.record("ns", "counter") as record:
+                record["hits"] = record.get("hits", 0) + 1
+
+    threads = [threading.Thread(target=add) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert state.get("ns", "counter") == {"hits": 200}
+
+def test_leases_have_one_holder_until_released_or_expired(state):
+    assert state.acquire_lease("lease", "job", "a", ttl=60) == (True, "a")
+    assert state.acquire_lease("lease", "job", "b", ttl=60) == (False, "a")
+    # The holder may renew; others cannot release it
+    assert state.acquire_lease("lease", "job", "a", ttl=0.05) == (True, "a")
+    state.release_lease("lease", "job", "b")
+    assert state.get("lease", "job") == "a"
+    time.sleep(0.1)
+    assert state.acquire_lease("lease", "job", "b", ttl=60) == (True, "b")
+    state.release_lease("lease", "job", "b")
+    assert state.get("lease", "job") is None
+
+def test_sqlite_state_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first, second = SQLiteState(path), SQLiteState(path)
+    assert first.acquire_lease("lease", "job", "first", ttl=60) == (True, "first")
+    assert second.acquire_lease("lease", "job", "second", ttl=60) == (False, "first")
+    first.set("ns", "key", [1, 2])
+    assert second.get("ns", "key") == [1, 2]
+
+def test_run_calls_sqlite_operations_off_the_event_loop(tmp_path):
+    state = SQLiteState(str(tmp_path / "state.sqlite3"))
+    loop_thread = threading.get_ident()
+
+    def operation():
+        state.set("ns", "key", "value")
+        return threading.get_ident()
+
+    async def main():
+        return await state.run(operation), await MemoryState().run(threading.get_ident)
+
+    sqlite_thread, memory_thread = asyncio.run(main())
+    assert sqlite_thread != loop_thread
+    assert memory_thread == loop_thread
+    assert state.get("ns", "key") == "value"
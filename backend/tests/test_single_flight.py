@@ -0,0 +1,112 @@
+import asyncio
+
+from services.shared_state import MemoryState, SQLiteState
+from services.single_flight import SingleFlight, flight_key, normalize_text, normalize_url
+
+def test_normalize_url_drops_tracking_and_fragments():
+    assert normalize_url("HTTPS://Example.COM:443/a/B?utm_source=x&b=2&a=1#top") == "https://example.com/a/B?a=1&b=2"
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+def test_keys_ignore_spacing_but_not_content():
+    assert flight_key(normalize_text("a  b\n c"), "te") == flight_key(normalize_text("a b c"), "te")
+    assert flight_key("a", "te") != flight_key("a", "hi")
+    assert flight_key("ab", "c") != flight_key("a", "bc")
+
+def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight(state=MemoryState())
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"summary": "done"}
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", compute) for _ in range(20)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert results == [{"summary": "done"}] * 20
+    assert flights.in_flight() == 0
+
+def test_failure_reaches_every_waiter():
+    flights = SingleFlight(state=MemoryState())
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", fail) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_work_is_cancelled_only_when_every_waiter_is_gone():
+    flights = SingleFlight(state=MemoryState())
+
+    async def main():
+        done = asyncio.Event()
+
+        async def compute():
+            await asyncio.sleep(0.1)
+            done.set()
+            return 1
+
+        first = asyncio.create_task(flights.do("key", compute))
+        second = asyncio.create_task(flights.do("key", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == 1
+        assert done.is_set()
+
+        done.clear()
+        waiters = [asyncio.create_task(flights.do("other", compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.sleep(0.15)
+        assert not done.is_set()
+
+    asyncio.run(main())
+
+def test_workers_sharing_state_compute_once(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    # Separate SingleFlight instances and connections stand in for worker processes
+    workers = [SingleFlight(state=SQLiteState(path)) for _ in range(3)]
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"summary": "shared"}
+
+    async def main():
+        return await asyncio.gather(*(worker.do("key", compute) for worker in workers for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert results == [{"summary": "shared"}] * 9
+
+def test_a_failed_worker_leaves_the_work_to_the_others(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first, second = SingleFlight(state=SQLiteState(path)), SingleFlight(state=SQLiteState(path))
+    attempts = []
+
+    async def compute():
+        attempts.append(None)
+        await asyncio.sleep(0.05)
+        if len(attempts) == 1:
+            raise ValueError("first worker failed")
+        return "second worker's result"
+
+    async def main():
+        return await asyncio.gather(first.do("key", compute), second.do("key", compute), return_exceptions=True)
+
+    results = asyncio.run(main())
+    # Either worker may take the lease first
+    assert sum(isinstance(result, ValueError) for result in results) == 1
+    assert "second worker's result" in results
+    assert len(attempts) == 2
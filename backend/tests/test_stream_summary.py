@@ -0,0 +1,64 @@
+import asyncio
+import types
+
+import pytest
+
+from services import summarizer
+from services.cache import MemoryCache
+
+class FakeStream:
+    def __init__(self, parts):
+        self.parts = parts
+
+    async def __aiter__(self):
+        for part in self.parts:
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=part))])
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = MemoryCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(summarizer, "get_summary_cache", lambda: cache)
+    monkeypatch.setattr(summarizer, "get_clients", lambda: types.SimpleNamespace(openai=None))
+
+    async def create_completion(client, request_args, tokens, stage_name=None):
+        # Three sentence groups: the first sentence alone, then two of STREAM_TTS_GROUP_CHARS each
+        long = "x" * summarizer.STREAM_TTS_GROUP_CHARS
+        return FakeStream(["First sentence. ", f"Second {long}. ", f"Third {long}."])
+
+    monkeypatch.setattr(summarizer, "create_completion", create_completion)
+    return cache
+
+def stream(text):
+    async def main():
+        events = await summarizer.stream_summarization_async(text, "te")
+        return [(event, data) async for event, data in events if event != "token"]
+    return asyncio.run(main())
+
+def test_groups_stream_in_order_and_are_cached(cache, monkeypatch):
+    async def tts(text, language):
+        return [text[:5]]
+
+    monkeypatch.setattr(summarizer, "text_to_speech_telugu_async", tts)
+    events = stream("some text")
+    assert [(event, data.get("index")) for event, data in events] == [("audio", 0), ("audio", 1), ("audio", 2), ("done", None)]
+    _, cached = asyncio.run(summarizer.cache_lookup_async("some text", "te", "text", True))
+    assert cached["audio"] == ["First", "Secon", "Third"]
+
+def test_failed_group_is_reported_and_not_cached(cache, monkeypatch):
+    async def tts(text, language):
+        if text.startswith("Second"):
+            raise RuntimeError("TTS upstream failed")
+        return [text[:5]]
+
+    monkeypatch.setattr(summarizer, "text_to_speech_telugu_async", tts)
+    events = stream("some text")
+    assert [(event, data.get("index")) for event, data in events] == [("audio", 0), ("audio_error", 1), ("audio", 2), ("done", None)]
+    assert "TTS upstream failed" in events[1][1]["detail"]
+    # A later non-streaming request must not get the audio with its middle missing
+    _, cached = asyncio.run(summarizer.cache_lookup_async("some text", "te", "text", True))
+    assert cached is None
+
+def test_sentences_are_complete_once_followed_by_whitespace():
+    assert summarizer.split_complete_sentences('He said "stop." Then') == ('He said "stop."', " Then")
+    assert summarizer.split_complete_sentences("ఇది వాక్యం। Next 3.") == ("ఇది వాక్యం।", " Next 3.")
+    assert summarizer.split_complete_sentences("- first point\n- second") == ("- first point\n", "- second")
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from services.tts_chunker import batch_chunks, chunk_text, split_graphemes, split_sentences
+
+def test_split_sentences_keeps_terminators_and_closing_quotes():
+    text = 'He said "stop." Then he left! ఇది ఒక వాక్యం। Tail without end'
+    assert split_sentences(text) == ['He said "stop."', "Then he left!", "ఇది ఒక వాక్యం।", "Tail without end"]
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("Just one sentence.", 500) == ["Just one sentence."]
+
+def test_packs_sentences_into_the_fewest_chunks():
+    text = "Short one. Another short one. A third sentence here."
+    assert chunk_text(text, 30) == ["Short one. Another short one.", "A third sentence here."]
+
+def test_prefers_sentence_then_clause_ends_among_minimal_cuts():
+    chunks = chunk_text("One two three. Four five, six seven eight nine ten.", 20)
+    assert chunks == ["One two three.", "Four five, six seven", "eight nine ten."]
+
+def test_breaks_between_words_when_no_sentence_end_fits():
+    assert chunk_text("aaaa bbbb cccc dddd", 9) == ["aaaa bbbb", "cccc dddd"]
+
+def test_long_word_breaks_only_between_grapheme_clusters():
+    word = "క్ష" * 10  # Each conjunct is one cluster of three code points
+    chunks = chunk_text(word, 7)
+    assert "".join(chunks) == word
+    for chunk in chunks:
+        assert len(chunk) <= 7
+        assert split_graphemes(chunk) == ["క్ష"] * (len(chunk) // 3)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_text_keeps_invariants(seed):
+    rng = random.Random(seed)
+    words = ["the", "summary", "report,", "café", "వాక్యం", "प्रश्न", "a" * 40]
+    sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 30))) + "." for _ in range(rng.randint(1, 20))]
+    text = " ".join(sentences)
+    max_chars = rng.randint(41, 120)  # Every word fits; longer words are tested above
+
+    chunks = chunk_text(text, max_chars)
+
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+    # No word shorter than a chunk is ever split, so the chunks rejoin with single spaces
+    assert " ".join(chunks) == text
+    # Greedy filling gives the lower bound on the number of chunks
+    greedy, current = 0, 0
+    for word in text.split(" "):
+        if current and current + 1 + len(word) <= max_chars:
+            current += 1 + len(word)
+        else:
+            greedy, current = greedy + 1, len(word)
+    assert len(chunks) == greedy
+
+def test_batches_fill_all_but_the_last():
+    chunks = [f"chunk {i}" for i in range(7)]
+    assert batch_chunks(chunks, 3) == [chunks[0:3], chunks[3:6], chunks[6:7]]
+    assert batch_chunks([], 3) == []
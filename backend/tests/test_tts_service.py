@@ -0,0 +1,34 @@
+import asyncio
+import types
+
+import pytest
+
+from services import tts_service
+
+@pytest.fixture
+def batches(monkeypatch):
+    started, finished = [], []
+
+    async def post(client, payload, headers):
+        index = payload["inputs"][0]
+        started.append(index)
+        if index == 0:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("TTS upstream failed")
+        await asyncio.sleep(1)
+        finished.append(index)
+        return [str(index)]
+
+    monkeypatch.setattr(tts_service, "MAX_PARALLEL_BATCHES", 2)
+    monkeypatch.setattr(tts_service, "_prepare_batches", lambda text, language: [[index] for index in range(4)])
+    monkeypatch.setattr(tts_service, "_post_batch_async", post)
+    monkeypatch.setattr(tts_service, "get_clients", lambda: types.SimpleNamespace(http=None))
+    return started, finished
+
+def test_a_failed_batch_cancels_the_rest(batches):
+    started, finished = batches
+    with pytest.raises(RuntimeError, match="TTS upstream failed"):
+        tts_service.text_to_speech_telugu("text")
+    # The batches still running were cancelled and the last one never reached the API
+    assert 3 not in started
+    assert finished == []
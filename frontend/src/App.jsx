@@ -182,6 +182,7 @@ function App() {
         text: formatSummary(response.data.summary),
         sender: 'bot',
         timestamp: new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
+        audioUrl: response.data.audio_url ? `${API_BASE_URL}${response.data.audio_url}` : null,
         audio: response.data.audio
       };
       
@@ -51,7 +51,7 @@ const combineAudioChunks = (audioArray) => {
   }
 };
 
-const AudioPlayer = ({ audioBase64, language, autoplay = true }) => {
+const AudioPlayer = ({ audioUrl, audioBase64, language, autoplay = true }) => {
   const [isPlaying, setIsPlaying] = useState(false);
   const [duration, setDuration] = useState(0);
   const [currentTime, setCurrentTime] = useState(0);
@@ -75,16 +75,19 @@ const AudioPlayer = ({ audioBase64, language, autoplay = true }) => {
     // Reset previous state
     setError(null);
     
-    if (!audioBase64) {
+    if (!audioUrl && !audioBase64) {
       setError('No audio data available');
       return;
     }
 
-    // Determine the source URL: if audioBase64 is an array, combine chunks
+    // Determine the source URL: prefer the server's merged audio, which the
+    // browser streams with range requests; otherwise combine base64 chunks
     let src = '';
     
     try {
-      if (Array.isArray(audioBase64)) {
+      if (audioUrl) {
+        src = audioUrl;
+      } else if (Array.isArray(audioBase64)) {
         console.log(`Processing ${audioBase64.length} audio chunks`);
         if (audioBase64.length === 0) {
           setError('No audio data available');
@@ -165,7 +168,7 @@ const AudioPlayer = ({ audioBase64, language, autoplay = true }) => {
       console.error('Audio initialization error:', err);
       setError('Audio initialization failed');
     }
-  }, [audioBase64, autoplay]);
+  }, [audioUrl, audioBase64, autoplay]);
 
   const togglePlay = () => {
     if (!audioRef.current) return;
@@ -205,7 +208,7 @@ const AudioPlayer = ({ audioBase64, language, autoplay = true }) => {
     );
   }
 
-  if (!audioBase64) return null;
+  if (!audioUrl && !audioBase64) return null;
 
   return (
     <div className="w-full md:w-2/3 lg:w-1/3 bg-gray-100 rounded-lg p-2 mt-2 flex items-center space-x-2 z-10 relative shadow">
@@ -30,9 +30,10 @@ const MessageList = ({ messages, isLoading, className = "flex-1" }) => {
               }}
             />
             {/* Render AudioPlayer directly if bot message has audio */}
-            {message.sender === "bot" && message.audio && (
+            {message.sender === "bot" && (message.audioUrl || message.audio) && (
               <div className="mt-2">
                 <AudioPlayer
+                  audioUrl={message.audioUrl}
                   audioBase64={message.audio}
                   language={message.language || "te"}
                 />